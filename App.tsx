@@ -8,6 +8,7 @@ import AdminDashboard from './components/AdminDashboard';
 import { auth } from './firebase';
 import { User, onAuthStateChanged, signOut } from 'firebase/auth';
 import { Toaster } from './components/ui/toaster';
+import { getAdminSession, clearAdminSession } from './services/authService';
 
 type AppView = 'home' | 'userLogin' | 'adminLogin';
 type AdminViewMode = 'admin' | 'client';
@@ -15,7 +16,8 @@ type AdminViewMode = 'admin' | 'client';
 const App: React.FC = () => {
     const [view, setView] = useState<AppView>('home');
     const [currentUser, setCurrentUser] = useState<User | null>(null);
-    const [isAdmin, setIsAdmin] = useState(false);
+    // Restaurar sessão admin persistida (sobrevive a reload da página)
+    const [isAdmin, setIsAdmin] = useState(() => getAdminSession() !== null);
     const [adminViewMode, setAdminViewMode] = useState<AdminViewMode>('admin');
     const [isLoading, setIsLoading] = useState(true);
 
@@ -53,6 +55,7 @@ const App: React.FC = () => {
     };
     
     const handleLogout = () => {
+        clearAdminSession();
         signOut(auth).then(() => {
             setIsAdmin(false);
             setAdminViewMode('admin');
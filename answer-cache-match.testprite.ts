@@ -0,0 +1,35 @@
+// TestPrite test file for the Gemini answer cache query matching
+// Run with: npx testprite run answer-cache-match.testprite.ts
+
+import { test, expect } from 'testprite';
+import { queryFingerprint, querySimilarity } from './services/textSearch';
+
+const MIN_SIMILARITY = 0.8; // ANSWER_CACHE_MIN_SIMILARITY em services/geminiService.ts
+
+test('Answer cache - key keeps every word, folded and with collapsed spaces', () => {
+  expect(queryFingerprint('  Onde está   MEU pedido? ').key).toBe('onde esta meu pedido?');
+  // Stopwords não são descartadas na chave
+  expect(queryFingerprint('o pedido chegou').key).toBe('o pedido chegou');
+});
+
+test('Answer cache - near duplicate without numbers still matches', () => {
+  const similarity = querySimilarity(
+    queryFingerprint('como faço para trocar o tamanho do produto'),
+    queryFingerprint('como faco pra trocar o tamanho do produto')
+  );
+  expect(similarity).toBeGreaterThan(MIN_SIMILARITY);
+});
+
+test('Answer cache - queries that differ only by a number never match', () => {
+  const a = queryFingerprint('qual o status do meu pedido 123456789');
+  const b = queryFingerprint('qual o status do meu pedido 123456780');
+
+  // Pelo texto seriam quase iguais...
+  const textOnly = querySimilarity({ ...a, numbers: '' }, { ...b, numbers: '' });
+  expect(textOnly).toBeGreaterThan(MIN_SIMILARITY);
+  // ...mas o número do pedido é diferente
+  expect(querySimilarity(a, b)).toBe(0);
+
+  expect(querySimilarity(queryFingerprint('entrega prevista para 10/11'), queryFingerprint('entrega prevista para 11/11'))).toBe(0);
+  expect(querySimilarity(queryFingerprint('reembolso de R$ 150,00'), queryFingerprint('reembolso de R$ 180,00'))).toBe(0);
+});
@@ -1,7 +1,7 @@
 // Fix: Implement the AdminDashboard component.
-import React, { useState, useEffect, useCallback } from 'react';
-import { Ticket } from '../types';
-import { supportService } from '../services/supportService';
+import React, { useState, useEffect, useMemo, useRef } from 'react';
+import { Ticket, TicketStatus } from '../types';
+import { supportService, TicketPage, TicketPageCursor, TicketQueryFilters } from '../services/supportService';
 import { TicketForm } from './TicketForm';
 import { TicketDetailModal } from './TicketDetailModal';
 import { AdminTraining } from './AdminTraining';
@@ -10,7 +10,10 @@ import { AdminFAQ } from './AdminFAQ';
 import { AdminKnowledgeBase } from './AdminKnowledgeBase';
 import { BrainIcon, LogoutIcon, MessageIcon } from './Icons'; // MessageIcon added
 import { SystemStatus } from './SystemStatus';
+import { TicketStatsPanel } from './TicketStatsPanel';
 import { Chatbot } from './Chatbot'; // New import for testing
+import { subjectLabels } from './SupportTicketFormAdvanced';
+import { Input } from './ui/input';
 import { Button } from './ui/button';
 import { Card, CardContent } from './ui/card';
 import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogDescription } from './ui/dialog';
@@ -32,19 +35,97 @@ const AdminDashboard: React.FC<AdminDashboardProps> = ({ onLogout, onSwitchToCli
     const [isFormModalOpen, setIsFormModalOpen] = useState(false);
     const [isDetailModalOpen, setIsDetailModalOpen] = useState(false);
     const [showArchived, setShowArchived] = useState(false);
-    
-    const loadTickets = useCallback(async () => {
-        setIsLoading(true);
-        const fetchedTickets = await supportService.getTickets(view === 'arquivados' || showArchived);
-        setTickets(fetchedTickets);
-        setIsLoading(false);
-    }, [view, showArchived]);
+    const [statusFilter, setStatusFilter] = useState<TicketStatus | 'ativos'>('ativos');
+    const [subjectFilter, setSubjectFilter] = useState('');
+    const [dateFrom, setDateFrom] = useState('');
+    const [dateTo, setDateTo] = useState('');
+    const [pagePosition, setPagePosition] = useState<{ key: string; index: number; cursor: TicketPageCursor | null }>({ key: '', index: 0, cursor: null });
+    const [currentPage, setCurrentPage] = useState<TicketPage | null>(null);
+    // Mudanças feitas neste painel e ainda não confirmadas pelo Firestore ('hidden' = sai da lista)
+    const [optimisticUpdates, setOptimisticUpdates] = useState<Record<string, Partial<Ticket> | 'hidden'>>({});
+    // Última versão de cada página por combinação de filtros: ao voltar/avançar aparece na hora,
+    // enquanto o onSnapshot da página é reaberto
+    const pageCacheRef = useRef(new Map<string, TicketPage[]>());
+
+    const filters = useMemo<TicketQueryFilters>(() => {
+        if (view === 'arquivados') return { status: 'arquivado' };
+        return {
+            status: statusFilter === 'ativos' && showArchived ? 'todos' : statusFilter,
+            subject: subjectFilter || undefined,
+            createdFrom: dateFrom ? new Date(`${dateFrom}T00:00:00`).getTime() : undefined,
+            createdTo: dateTo ? new Date(`${dateTo}T23:59:59.999`).getTime() : undefined,
+        };
+    }, [view, statusFilter, showArchived, subjectFilter, dateFrom, dateTo]);
+    const filterKey = JSON.stringify(filters);
+    // Filtros mudaram: volta para a primeira página
+    const pageIndex = pagePosition.key === filterKey ? pagePosition.index : 0;
+    const pageCursor = pagePosition.key === filterKey ? pagePosition.cursor : null;
 
+    // Página atual ao vivo: novos chamados, respostas e mudanças de status aparecem sem recarregar
     useEffect(() => {
-        if (view === 'tickets' || view === 'arquivados') {
-            loadTickets();
+        if (view !== 'tickets' && view !== 'arquivados') return;
+
+        const cached = pageCacheRef.current.get(filterKey)?.[pageIndex];
+        if (cached) {
+            setCurrentPage(cached);
+            setTickets(cached.tickets);
+        }
+        setIsLoading(!cached);
+
+        return supportService.subscribeToTicketsPage(
+            filters,
+            pageCursor,
+            (page) => {
+                const pages = pageCacheRef.current.get(filterKey) || [];
+                pages[pageIndex] = page;
+                pageCacheRef.current.set(filterKey, pages);
+                setCurrentPage(page);
+                setTickets(page.tickets);
+                setIsLoading(false);
+            },
+            () => setIsLoading(false)
+        );
+    }, [view, filters, filterKey, pageIndex, pageCursor]);
+
+    const handleNextPage = () => {
+        if (currentPage?.nextCursor) {
+            setPagePosition({ key: filterKey, index: pageIndex + 1, cursor: currentPage.nextCursor });
+        }
+    };
+
+    const handlePrevPage = () => {
+        if (pageIndex === 0) return;
+        const cursor = pageIndex - 1 === 0 ? null : currentPage?.prevCursor || null;
+        setPagePosition({ key: filterKey, index: pageIndex - 1, cursor });
+    };
+
+    // Aplica a mudança na tela imediatamente; o snapshot do Firestore traz a versão definitiva
+    // e, se a gravação falhar, a lista volta ao estado do servidor
+    const runOptimistic = async (ticketId: string, update: Partial<Ticket> | 'hidden', mutation: () => Promise<void>) => {
+        setOptimisticUpdates(prev => ({ ...prev, [ticketId]: update }));
+        try {
+            await mutation();
+        } finally {
+            setOptimisticUpdates(prev => {
+                const { [ticketId]: _, ...rest } = prev;
+                return rest;
+            });
         }
-    }, [view, loadTickets]);
+    };
+
+    const matchesStatusFilter = (ticket: Ticket) => {
+        const status = filters.status || 'ativos';
+        if (status === 'todos') return true;
+        return status === 'ativos' ? ticket.status !== 'arquivado' : ticket.status === status;
+    };
+
+    const visibleTickets = tickets.flatMap(ticket => {
+        const update = optimisticUpdates[ticket.id];
+        if (!update) return [ticket];
+        if (update === 'hidden') return [];
+        const updated = { ...ticket, ...update };
+        return matchesStatusFilter(updated) ? [updated] : [];
+    });
     
     const handleEditTicket = (ticket: Ticket) => {
         setSelectedTicket(ticket);
@@ -61,26 +142,25 @@ const AdminDashboard: React.FC<AdminDashboardProps> = ({ onLogout, onSwitchToCli
         setIsDetailModalOpen(true);
     };
 
+    // A lista é atualizada pelo onSnapshot da página; não é preciso recarregar
     const handleFormSubmit = () => {
         setIsFormModalOpen(false);
         setSelectedTicket(null);
-        loadTickets();
     };
 
     const handleModalUpdate = () => {
         setIsDetailModalOpen(false);
         setSelectedTicket(null);
-        loadTickets();
     };
 
     const handleArchiveToggle = async (ticket: Ticket) => {
         try {
             if (ticket.status === 'arquivado') {
-                await supportService.unarchiveTicket(ticket.id);
+                // O status restaurado só é conhecido no servidor: na lista de arquivados o ticket apenas some
+                await runOptimistic(ticket.id, filters.status === 'arquivado' ? 'hidden' : {}, () => supportService.unarchiveTicket(ticket.id));
             } else {
-                await supportService.archiveTicket(ticket.id);
+                await runOptimistic(ticket.id, { status: 'arquivado' }, () => supportService.archiveTicket(ticket.id));
             }
-            loadTickets();
         } catch (error) {
             console.error('Erro ao arquivar/reativar ticket:', error);
         }
@@ -109,10 +189,8 @@ const AdminDashboard: React.FC<AdminDashboardProps> = ({ onLogout, onSwitchToCli
     const renderMainContent = () => {
         switch(view) {
             case 'tickets':
-                // Filtrar tickets baseado no toggle
-                const displayedTickets = showArchived 
-                    ? tickets 
-                    : tickets.filter(t => t.status !== 'arquivado');
+                // Filtros já aplicados na consulta ao Firestore
+                const displayedTickets = visibleTickets;
                 
                 return (
                      <div>
@@ -137,6 +215,47 @@ const AdminDashboard: React.FC<AdminDashboardProps> = ({ onLogout, onSwitchToCli
                             </div>
                         </div>
 
+                        <TicketStatsPanel />
+
+                        <div className="flex flex-wrap items-end gap-3 mb-4">
+                            <label className="form-control">
+                                <div className="label"><span className="label-text text-sm">Status</span></div>
+                                <select
+                                    className="select select-bordered select-sm"
+                                    value={statusFilter}
+                                    onChange={(e) => setStatusFilter(e.target.value as TicketStatus | 'ativos')}
+                                >
+                                    <option value="ativos">Todos os ativos</option>
+                                    <option value="aberto">Aberto</option>
+                                    <option value="em_andamento">Em Andamento</option>
+                                    <option value="resolvido">Resolvido</option>
+                                    <option value="fechado">Fechado</option>
+                                    <option value="arquivado">Arquivado</option>
+                                </select>
+                            </label>
+                            <label className="form-control">
+                                <div className="label"><span className="label-text text-sm">Assunto</span></div>
+                                <select
+                                    className="select select-bordered select-sm"
+                                    value={subjectFilter}
+                                    onChange={(e) => setSubjectFilter(e.target.value)}
+                                >
+                                    <option value="">Todos os assuntos</option>
+                                    {Object.values(subjectLabels).map(label => (
+                                        <option key={label} value={label}>{label}</option>
+                                    ))}
+                                </select>
+                            </label>
+                            <label className="form-control">
+                                <div className="label"><span className="label-text text-sm">De</span></div>
+                                <Input type="date" value={dateFrom} onChange={(e) => setDateFrom(e.target.value)} className="h-8" />
+                            </label>
+                            <label className="form-control">
+                                <div className="label"><span className="label-text text-sm">Até</span></div>
+                                <Input type="date" value={dateTo} onChange={(e) => setDateTo(e.target.value)} className="h-8" />
+                            </label>
+                        </div>
+
                         {isLoading ? (
                             <Card className="p-12 text-center">
                                 <CardContent>
@@ -224,10 +343,23 @@ const AdminDashboard: React.FC<AdminDashboardProps> = ({ onLogout, onSwitchToCli
                                 </table>
                             </Card>
                         )}
+                        {!isLoading && (pageIndex > 0 || currentPage?.nextCursor) && (
+                            <div className="flex justify-between items-center mt-4">
+                                <span className="text-sm text-gray-600">Página {pageIndex + 1}</span>
+                                <div className="flex gap-2">
+                                    <Button onClick={handlePrevPage} size="sm" variant="outline" disabled={pageIndex === 0}>
+                                        Anterior
+                                    </Button>
+                                    <Button onClick={handleNextPage} size="sm" variant="outline" disabled={!currentPage?.nextCursor}>
+                                        Próxima
+                                    </Button>
+                                </div>
+                            </div>
+                        )}
                     </div>
                 );
             case 'arquivados':
-                const archivedTickets = tickets.filter(t => t.status === 'arquivado');
+                const archivedTickets = visibleTickets.filter(t => t.status === 'arquivado');
                 return (
                      <div>
                         <div className="flex justify-between items-center mb-6">
@@ -315,6 +447,19 @@ const AdminDashboard: React.FC<AdminDashboardProps> = ({ onLogout, onSwitchToCli
                                 </table>
                             </Card>
                         )}
+                        {!isLoading && (pageIndex > 0 || currentPage?.nextCursor) && (
+                            <div className="flex justify-between items-center mt-4">
+                                <span className="text-sm text-gray-600">Página {pageIndex + 1}</span>
+                                <div className="flex gap-2">
+                                    <Button onClick={handlePrevPage} size="sm" variant="outline" disabled={pageIndex === 0}>
+                                        Anterior
+                                    </Button>
+                                    <Button onClick={handleNextPage} size="sm" variant="outline" disabled={!currentPage?.nextCursor}>
+                                        Próxima
+                                    </Button>
+                                </div>
+                            </div>
+                        )}
                     </div>
                 );
             case 'training':
@@ -52,16 +52,23 @@ export const AdminFAQ: React.FC = () => {
 
   useEffect(() => {
     loadFAQEntries();
+    // Edições feitas aqui ou por outro admin chegam pela sincronização do FAQ, sem recarregar a página
+    return faqService.subscribeToFAQ(() => loadFAQEntries(false));
   }, [selectedCategory]);
 
-  const loadFAQEntries = async () => {
-    setIsLoading(true);
+  const loadFAQEntries = async (showLoading = true) => {
+    if (showLoading) setIsLoading(true);
     try {
-      const entries = await faqService.getAllFAQEntries();
+      const [entries, counters] = await Promise.all([
+        faqService.getAllFAQEntries(),
+        faqService.getFAQCounterTotals(),
+      ]);
       const filtered = selectedCategory === 'todos'
         ? entries
         : entries.filter(e => e.category === selectedCategory);
-      setFaqEntries(filtered.sort((a, b) => a.order - b.order));
+      // Views/útil ficam em shards: exibir o total agregado de cada entrada
+      const withCounters = filtered.map(e => (e.id && counters[e.id] ? { ...e, ...counters[e.id] } : e));
+      setFaqEntries(withCounters.sort((a, b) => a.order - b.order));
     } catch (error) {
       console.error('Error loading FAQ entries:', error);
     } finally {
@@ -43,10 +43,12 @@ export const AdminKnowledgeBase: React.FC = () => {
   useEffect(() => {
     loadEntries();
     loadSuggestions();
+    // Edições feitas aqui ou por outro admin chegam pela sincronização da base, sem recarregar a página
+    return knowledgeBaseService.subscribeToKnowledgeBase(() => loadEntries(false));
   }, [selectedFilter, selectedCategory]);
 
-  const loadEntries = async () => {
-    setIsLoading(true);
+  const loadEntries = async (showLoading = true) => {
+    if (showLoading) setIsLoading(true);
     try {
       const filters: { verified?: boolean; category?: string } = {};
       if (selectedFilter === 'verified') filters.verified = true;
@@ -4,6 +4,7 @@ import { Card, CardContent, CardDescription, CardHeader, CardTitle } from './ui/
 import { Button } from './ui/button';
 import { Input } from './ui/input';
 import { Label } from './ui/label';
+import { saveAdminSession } from '../services/authService';
 
 interface AdminLoginProps {
     onLoginSuccess: () => void;
@@ -22,6 +23,7 @@ export const AdminLogin: React.FC<AdminLoginProps> = ({ onLoginSuccess }) => {
 
         setTimeout(() => {
             if (email === 'admin@yoobe.co' && password === '123456') {
+                saveAdminSession(email);
                 onLoginSuccess();
             } else {
                 setError('Credenciais inválidas.');
@@ -16,6 +16,7 @@ export const AdminOrders: React.FC = () => {
   const [orderId, setOrderId] = useState('');
   const [orders, setOrders] = useState<CubboOrder[]>([]);
   const [isLoading, setIsLoading] = useState(false);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [selectedOrder, setSelectedOrder] = useState<CubboOrder | null>(null);
   const [isOrderModalOpen, setIsOrderModalOpen] = useState(false);
@@ -77,15 +78,26 @@ export const AdminOrders: React.FC = () => {
           return;
         }
 
-        const foundOrders = await supportService.findOrdersByCustomer({
-          email: email || null,
-          phone: phone || null
-        });
+        // Renderizar a primeira página assim que chegar; as demais entram na lista conforme carregam
+        let foundOrders: CubboOrder[] = [];
+        try {
+          for await (const page of supportService.streamOrdersByCustomer({
+            email: email || null,
+            phone: phone || null
+          })) {
+            foundOrders = supportService.mergeOrders(foundOrders, page.orders);
+            setOrders(foundOrders);
+            if (page.page === 1) {
+              setIsLoading(false);
+              setIsLoadingMore(true);
+            }
+          }
+        } finally {
+          setIsLoadingMore(false);
+        }
 
         if (foundOrders.length === 0) {
           setError('Nenhum pedido encontrado para este cliente.');
-        } else {
-          setOrders(foundOrders);
         }
       } else {
         if (!orderId.trim()) {
@@ -235,13 +247,13 @@ export const AdminOrders: React.FC = () => {
             <Button 
               variant="outline"
               onClick={handleClear} 
-              disabled={isLoading}
+              disabled={isLoading || isLoadingMore}
             >
               Limpar
             </Button>
             <Button 
               onClick={handleSearch}
-              disabled={isLoading}
+              disabled={isLoading || isLoadingMore}
             >
               {isLoading ? (
                 <>
@@ -263,6 +275,12 @@ export const AdminOrders: React.FC = () => {
             <h3 className="text-xl font-semibold">
               {orders.length === 1 ? '1 pedido encontrado' : `${orders.length} pedidos encontrados`}
             </h3>
+            {isLoadingMore && (
+              <span className="text-sm text-muted-foreground">
+                <span className="loading loading-spinner loading-xs mr-2"></span>
+                Carregando mais pedidos...
+              </span>
+            )}
           </div>
 
           <div className="space-y-4">
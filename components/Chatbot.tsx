@@ -1,17 +1,19 @@
 // Fix: Implement the Chatbot component.
 import React, { useState, useRef, useEffect } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
-import { Message, MessageSender, ConversationMessage } from '../types';
-import { getGeminiResponse, searchIntelligentFAQ } from '../services/geminiService';
+import { Message, MessageSender, ConversationMessage, CubboOrder } from '../types';
+import { streamGeminiResponse, searchIntelligentFAQ, createConversationContext, recordToolResults } from '../services/geminiService';
 import { supportService } from '../services/supportService';
 import { conversationService } from '../services/conversationService';
+import { routeIntent } from '../services/intentRouter';
+import { createToolScheduler } from '../services/toolScheduler';
 import { MessageIcon, CloseIcon, SendIcon, UserIcon, BotIcon } from './Icons';
 import { ExchangeForm } from './ExchangeForm';
 import { SupportTicketFormAdvanced } from './SupportTicketFormAdvanced';
 import { OrderList } from './OrderList';
 import { EmailRequestModal } from './EmailRequestModal';
 import { ConversationFeedback } from './ConversationFeedback';
-import { GenerateContentResponse } from '@google/genai';
+import { FunctionCall } from '@google/genai';
 import { Button } from './ui/button';
 import { Input } from './ui/input';
 import { Card } from './ui/card';
@@ -37,6 +39,8 @@ export const Chatbot: React.FC<ChatbotProps> = ({ user, onTicketCreated, inline
     const [conversationHistory, setConversationHistory] = useState<any[]>([]);
     const [showFeedback, setShowFeedback] = useState(false);
     const messagesEndRef = useRef<null | HTMLDivElement>(null);
+    // Resumo acumulado e fatos fixos da conversa enviados ao Gemini (prompt de tamanho estável)
+    const conversationContextRef = useRef(createConversationContext());
 
     const scrollToBottom = () => {
         messagesEndRef.current?.scrollIntoView({ behavior: "smooth" });
@@ -155,54 +159,55 @@ export const Chatbot: React.FC<ChatbotProps> = ({ user, onTicketCreated, inline
         }
     };
     
-    const renderComponentInChat = (component: React.ReactNode) => {
+    const renderComponentInChat = (component: React.ReactNode, id: string = Date.now().toString()) => {
         const newComponentMessage: Message = {
-            id: Date.now().toString(),
+            id,
             text: '',
             sender: MessageSender.SYSTEM,
             component: component,
         };
         setMessages(prev => [...prev, newComponentMessage]);
+        return id;
+    };
+
+    // Substitui o componente de uma mensagem já renderizada (ex.: lista de pedidos crescendo por página)
+    const updateComponentInChat = (id: string, component: React.ReactNode) => {
+        setMessages(prev => prev.map(m => m.id === id ? { ...m, component } : m));
     };
     
-    const handleFunctionCall = async (response: GenerateContentResponse) => {
-        const functionCalls = response.functionCalls;
-        let orderFound = false;
-        let ticketOpened = false;
-        
-        if (!functionCalls || functionCalls.length === 0) {
-            if (response.text) {
-                addMessage(response.text, MessageSender.BOT);
-            }
-            // Incrementar tentativas se não encontrou solução
-            if (!orderFound && !ticketOpened) {
-                setAttemptsWithoutResolution(prev => prev + 1);
-            }
-            return;
-        }
+    // Resultado de um turno do chat: se alguma função encontrou pedido ou abriu chamado
+    type TurnOutcome = { orderFound: boolean; ticketOpened: boolean };
 
+    // Executa as function calls pedidas pelo Gemini (chamada assim que cada uma aparece no stream)
+    const runFunctionCalls = async (functionCalls: FunctionCall[], outcome: TurnOutcome) => {
         for (const call of functionCalls) {
             switch (call.name) {
                 case 'findCustomerOrders':
                     try {
-                        const orders = await supportService.findOrdersByCustomer({
+                        // Mostrar a primeira página assim que chegar e ir completando a lista com as demais
+                        let orders: CubboOrder[] = [];
+                        let orderListId: string | null = null;
+                        for await (const page of supportService.streamOrdersByCustomer({
                             email: user.email || null,
                             phone: user.phone || null
-                        });
+                        })) {
+                            orders = supportService.mergeOrders(orders, page.orders);
+                            if (orders.length === 0) continue;
+
+                            if (!orderListId) {
+                                addMessage(orders.length === 1 ? `Encontrei 1 pedido seu:` : `Encontrei ${orders.length} pedidos seus:`, MessageSender.BOT);
+                                orderListId = renderComponentInChat(<OrderList orders={orders} />, `order-list-${Date.now()}`);
+                            } else {
+                                updateComponentInChat(orderListId, <OrderList orders={orders} />);
+                            }
+                        }
                         
                         if (orders.length === 0) {
                             addMessage("Não encontrei nenhum pedido associado ao seu email ou telefone. Verifique se os dados estão corretos ou entre em contato conosco.", MessageSender.BOT);
                             setAttemptsWithoutResolution(prev => prev + 1);
                         } else {
-                            orderFound = true;
+                            outcome.orderFound = true;
                             setAttemptsWithoutResolution(0); // Reset ao encontrar pedidos
-                            const ordersText = orders.length === 1 
-                                ? `Encontrei 1 pedido seu:` 
-                                : `Encontrei ${orders.length} pedidos seus:`;
-                            addMessage(ordersText, MessageSender.BOT);
-                            
-                            // Renderizar componente com lista de pedidos
-                            renderComponentInChat(<OrderList orders={orders} />);
                             
                             // Adicionar mensagem com resumo
                             const summary = orders.map(order => {
@@ -259,7 +264,7 @@ export const Chatbot: React.FC<ChatbotProps> = ({ user, onTicketCreated, inline
                     }
                     
                     // Pedido encontrado - resetar tentativas
-                    orderFound = true;
+                    outcome.orderFound = true;
                     setAttemptsWithoutResolution(0);
                     
                     // Adicionar orderNumber aos mencionados
@@ -293,7 +298,7 @@ export const Chatbot: React.FC<ChatbotProps> = ({ user, onTicketCreated, inline
                     );
                     break;
                 case 'openSupportTicket':
-                    ticketOpened = true;
+                    outcome.ticketOpened = true;
                     setAttemptsWithoutResolution(0); // Reset ao abrir chamado
                     const orderNumberFromCall = (call.args.orderNumber as string | undefined);
                     const subjectFromCall = (call.args.subject as string | undefined) || 'outro';
@@ -358,13 +363,24 @@ export const Chatbot: React.FC<ChatbotProps> = ({ user, onTicketCreated, inline
                     break;
                 case 'escalateToHuman':
                      addMessage("Entendi. Um de nossos atendentes entrará em contato com você por e-mail em breve para dar continuidade ao seu atendimento.", MessageSender.BOT);
-                    ticketOpened = true;
+                    outcome.ticketOpened = true;
                     break;
                 default:
                     addMessage("Desculpe, não consegui processar essa ação.", MessageSender.BOT);
                     setAttemptsWithoutResolution(prev => prev + 1);
             }
         }
+    };
+
+    // Encerramento do turno, depois do stream e de todas as function calls
+    const finishTurn = (outcome: TurnOutcome, hadFunctionCalls: boolean) => {
+        const { orderFound, ticketOpened } = outcome;
+
+        if (!hadFunctionCalls) {
+            // Incrementar tentativas se não encontrou solução
+            setAttemptsWithoutResolution(prev => prev + 1);
+            return;
+        }
         
         // Salvar conversa após processar função (não bloquear resposta)
         saveConversation(orderFound || ticketOpened).catch(err => {
@@ -435,6 +451,18 @@ export const Chatbot: React.FC<ChatbotProps> = ({ user, onTicketCreated, inline
         setInput('');
         setIsLoading(true);
 
+        // Intenção clara (código de pedido, pedido de chamado, pergunta geral do FAQ):
+        // executa direto a função certa, sem esperar o Gemini decidir
+        const route = routeIntent(userMessage);
+        if (route.call) {
+            console.log(`[Chatbot] Roteado sem Gemini: ${route.intent} (${route.reason})`);
+            const routedOutcome: TurnOutcome = { orderFound: false, ticketOpened: false };
+            setIsLoading(false);
+            await runFunctionCalls([route.call], routedOutcome);
+            finishTurn(routedOutcome, true);
+            return;
+        }
+
         // Criar contexto enriquecido com histórico
         const enrichedMessages = [...messages, { 
             id: Date.now().toString(), 
@@ -454,14 +482,45 @@ export const Chatbot: React.FC<ChatbotProps> = ({ user, onTicketCreated, inline
             contextInfo += `\n[Tentativas sem resolução: ${attemptsWithoutResolution}]`;
         }
         
-        const response = await getGeminiResponse(
-            enrichedMessages, 
-            userMessage + contextInfo
-        );
+        // Resposta em streaming: o texto aparece conforme chega e cada function call
+        // começa a ser executada assim que é detectada, sem esperar o fim do stream.
+        // Consultas independentes (ex.: dois pedidos) rodam em paralelo pelo scheduler.
+        const outcome: TurnOutcome = { orderFound: false, ticketOpened: false };
+        let streamingMessageId: string | null = null;
+        const scheduler = createToolScheduler();
+
+        const facts = {
+            customerName: user.name,
+            customerEmail: user.email,
+            orderNumbers: Array.from(new Set([...mentionedOrderNumbers, ...extractedOrders])),
+        };
+
+        const result = await streamGeminiResponse(enrichedMessages, userMessage + contextInfo, {
+            onText: (textSoFar) => {
+                setIsLoading(false);
+                if (!streamingMessageId) {
+                    const id = `bot-stream-${Date.now()}`;
+                    streamingMessageId = id;
+                    setMessages(prev => [...prev, { id, text: textSoFar, sender: MessageSender.BOT }]);
+                } else {
+                    const id = streamingMessageId;
+                    setMessages(prev => prev.map(m => m.id === id ? { ...m, text: textSoFar } : m));
+                }
+            },
+            onFunctionCall: (call) => {
+                setIsLoading(false);
+                scheduler.schedule(call, () => runFunctionCalls([call], outcome));
+            },
+        }, conversationContextRef.current, facts);
         setIsLoading(false);
 
-        if (response) {
-            await handleFunctionCall(response);
+        if (result) {
+            const toolResults = await scheduler.drain();
+            recordToolResults(conversationContextRef.current, toolResults);
+            toolResults
+                .filter(r => r.status === 'timeout')
+                .forEach(r => addMessage(`A consulta (${r.name}) está demorando mais que o esperado. Se o resultado não aparecer, tente novamente em instantes.`, MessageSender.BOT));
+            finishTurn(outcome, toolResults.length > 0);
         } else {
             addMessage('Desculpe, ocorreu um erro. Por favor, tente novamente.', MessageSender.BOT);
             setAttemptsWithoutResolution(prev => prev + 1);
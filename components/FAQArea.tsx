@@ -43,6 +43,8 @@ export const FAQArea: React.FC<FAQAreaProps> = ({ onOpenTicket }) => {
 
   useEffect(() => {
     loadFAQEntries();
+    // O FAQ é sincronizado em tempo real: recarregar a lista (da memória) a cada mudança
+    return faqService.subscribeToFAQ(loadFAQEntries);
   }, [selectedCategory]);
 
   const loadFAQEntries = async () => {
@@ -1,13 +1,10 @@
 import React, { useState } from 'react';
-import { faqService } from '../services/faqService';
-import { knowledgeBaseService } from '../services/knowledgeBaseService';
 import { FAQEntry } from '../types';
 import { Card, CardContent, CardHeader, CardTitle } from './ui/card';
 import { Button } from './ui/button';
 import { Input } from './ui/input';
 import { Badge } from './ui/badge';
-import { getGeminiResponse } from '../services/geminiService';
-import { Message, MessageSender } from '../types';
+import { getSearchAnswer } from '../services/geminiService';
 import { motion } from 'framer-motion';
 
 interface IntelligentFAQSearchProps {
@@ -21,8 +18,8 @@ export const IntelligentFAQSearch: React.FC<IntelligentFAQSearchProps> = ({ onOp
   const [geminiAnswer, setGeminiAnswer] = useState<string | null>(null);
   const [suggestedQuestions, setSuggestedQuestions] = useState<string[]>([]);
 
-  const handleSearch = async () => {
-    if (!query.trim()) return;
+  const handleSearch = async (searchQuery: string = query) => {
+    if (!searchQuery.trim()) return;
 
     setIsSearching(true);
     setFaqResults([]);
@@ -30,50 +27,17 @@ export const IntelligentFAQSearch: React.FC<IntelligentFAQSearchProps> = ({ onOp
     setSuggestedQuestions([]);
 
     try {
-      // 1. Buscar no FAQ primeiro
-      const faqResults = await faqService.searchFAQ(query);
-      setFaqResults(faqResults);
+      // FAQ e base de conhecimento em paralelo + uma única chamada ao Gemini (resposta e sugestões).
+      // Perguntas curtas com resultado no FAQ usam a primeira resposta do FAQ, sem Gemini.
+      const result = await getSearchAnswer(searchQuery, 'whenNeeded');
+      setFaqResults(result.faqResults);
 
-      // 2. Buscar na base de conhecimento
-      const kbResult = await knowledgeBaseService.searchKnowledgeBase(query, false);
-      
-      // 3. Se não encontrou resultados suficientes ou quer resposta mais inteligente, usar Gemini
-      if (faqResults.length === 0 || query.length > 10) {
-        // Usar Gemini para buscar e sintetizar resposta
-        const geminiMessages: Message[] = [
-          {
-            id: '1',
-            text: `Baseado no seguinte contexto do FAQ e base de conhecimento, responda a pergunta do usuário de forma clara e útil:\n\nFAQ encontrado:\n${faqResults.map(e => `Q: ${e.question}\nA: ${e.answer}`).join('\n\n')}\n\nBase de conhecimento:\n${kbResult.answer}\n\nPergunta do usuário: ${query}`,
-            sender: MessageSender.USER,
-          },
-        ];
-
-        const geminiResponse = await getGeminiResponse(geminiMessages, query);
-        
-        if (geminiResponse && geminiResponse.text) {
-          setGeminiAnswer(geminiResponse.text);
-          
-          // Gerar perguntas sugeridas usando Gemini
-          const suggestionPrompt = `Baseado na pergunta "${query}", sugira 3 perguntas relacionadas que o usuário pode ter interesse. Retorne apenas as perguntas, uma por linha.`;
-          const suggestionResponse = await getGeminiResponse(
-            [{ id: '1', text: suggestionPrompt, sender: MessageSender.USER }],
-            suggestionPrompt
-          );
-          
-          if (suggestionResponse && suggestionResponse.text) {
-            const suggestions = suggestionResponse.text
-              .split('\n')
-              .map(s => s.trim())
-              .filter(s => s.length > 0 && !s.match(/^\d+[\.\)]/))
-              .slice(0, 3);
-            setSuggestedQuestions(suggestions);
-          }
-        }
-      } else {
+      if (result.source === 'gemini') {
+        setGeminiAnswer(result.answer);
+        setSuggestedQuestions(result.suggestedQuestions);
+      } else if (result.faqResults.length > 0) {
         // Se encontrou no FAQ, usar primeira resposta como resposta principal
-        if (faqResults.length > 0) {
-          setGeminiAnswer(`Baseado nas informações do nosso FAQ:\n\n${faqResults[0].answer}`);
-        }
+        setGeminiAnswer(`Baseado nas informações do nosso FAQ:\n\n${result.faqResults[0].answer}`);
       }
     } catch (error) {
       console.error('Error in intelligent search:', error);
@@ -108,7 +72,7 @@ export const IntelligentFAQSearch: React.FC<IntelligentFAQSearchProps> = ({ onOp
             onKeyPress={handleKeyPress}
             className="flex-1"
           />
-          <Button onClick={handleSearch} disabled={isSearching || !query.trim()}>
+          <Button onClick={() => handleSearch()} disabled={isSearching || !query.trim()}>
             {isSearching ? 'Buscando...' : 'Buscar'}
           </Button>
         </div>
@@ -190,7 +154,7 @@ export const IntelligentFAQSearch: React.FC<IntelligentFAQSearchProps> = ({ onOp
                   size="sm"
                   onClick={() => {
                     setQuery(question);
-                    handleSearch();
+                    handleSearch(question);
                   }}
                   className="text-xs"
                 >
@@ -26,7 +26,7 @@ interface SupportTicketFormAdvancedProps {
   onClose: () => void;
 }
 
-const subjectLabels: Record<TicketSubject, string> = {
+export const subjectLabels: Record<TicketSubject, string> = {
   cancelamento: 'Cancelamento de Pedido',
   reembolso: 'Reembolso',
   troca: 'Troca de Produto',
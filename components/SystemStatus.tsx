@@ -1,6 +1,8 @@
 import React, { useState, useEffect, useCallback } from 'react';
 import { ApiConfig } from '../types';
 import { supportService } from '../services/supportService';
+import { getAnswerCacheStats, getChatLatencyStats } from '../services/geminiService';
+import { getRoutingStats } from '../services/intentRouter';
 import { auth } from '../firebase';
 
 const StatusCard: React.FC<{ title: string; status: 'ok' | 'error' | 'loading'; message: string; children?: React.ReactNode }> = ({ title, status, message, children }) => {
@@ -24,6 +26,9 @@ export const SystemStatus: React.FC = () => {
     const [isLoading, setIsLoading] = useState(true);
     const [isTesting, setIsTesting] = useState(false);
     const [testError, setTestError] = useState<string | null>(null); // State for detailed error message
+    const [answerCacheStats, setAnswerCacheStats] = useState(getAnswerCacheStats());
+    const [chatLatencyStats, setChatLatencyStats] = useState(getChatLatencyStats());
+    const [routingStats, setRoutingStats] = useState(getRoutingStats());
 
     const loadCubboConfig = useCallback(async () => {
         setIsLoading(true);
@@ -37,6 +42,16 @@ export const SystemStatus: React.FC = () => {
         loadCubboConfig();
     }, [loadCubboConfig]);
 
+    // Estatísticas do cache de respostas, da latência e do roteamento do chat vivem em memória: atualizar periodicamente
+    useEffect(() => {
+        const interval = setInterval(() => {
+            setAnswerCacheStats(getAnswerCacheStats());
+            setChatLatencyStats(getChatLatencyStats());
+            setRoutingStats(getRoutingStats());
+        }, 5000);
+        return () => clearInterval(interval);
+    }, []);
+
     const handleTestConnection = async () => {
         if (!cubboConfig) return;
         setIsTesting(true);
@@ -53,6 +68,9 @@ export const SystemStatus: React.FC = () => {
         setIsTesting(false);
     };
 
+    const formatMs = (ms: number | null) => (ms === null ? '-' : `${ms}ms`);
+    const routingReasons = Object.entries(routingStats.reasons).sort((a, b) => b[1] - a[1]);
+
     return (
         <div className="animate-fade-in">
             <h2 className="text-2xl font-bold text-gray-800 mb-4">Status do Sistema</h2>
@@ -102,6 +120,59 @@ export const SystemStatus: React.FC = () => {
                 ) : (
                     <StatusCard title="API da Cubbo" status="error" message="Configuração da API da Cubbo não encontrada no banco de dados." />
                 )}
+
+                <StatusCard
+                    title="Cache de Respostas (Gemini)"
+                    status="ok"
+                    message="Perguntas repetidas ou quase iguais são respondidas sem nova geração no Gemini. Números desta sessão do navegador."
+                >
+                    <div className="mt-4 grid grid-cols-2 gap-2 text-sm">
+                        <p><strong>Taxa de acerto:</strong> {(answerCacheStats.hitRate * 100).toFixed(1)}%</p>
+                        <p><strong>Consultas:</strong> {answerCacheStats.lookups}</p>
+                        <p><strong>Acertos exatos:</strong> {answerCacheStats.exactHits}</p>
+                        <p><strong>Acertos por similaridade:</strong> {answerCacheStats.nearHits}</p>
+                        <p><strong>Latência economizada:</strong> {(answerCacheStats.savedMs / 1000).toFixed(1)}s</p>
+                        <p><strong>Respostas em cache:</strong> {answerCacheStats.entries}</p>
+                        <p className="col-span-2 text-xs text-gray-500">Invalidações por mudança no FAQ/base de conhecimento: {answerCacheStats.invalidations}</p>
+                    </div>
+                </StatusCard>
+
+                <StatusCard
+                    title="Latência do Chat (Gemini)"
+                    status="ok"
+                    message={`Tempo de resposta dos últimos ${chatLatencyStats.turns} turnos do chat nesta sessão do navegador.`}
+                >
+                    <div className="mt-4 grid grid-cols-2 gap-2 text-sm">
+                        <p><strong>1º trecho (p50):</strong> {formatMs(chatLatencyStats.ttftP50)}</p>
+                        <p><strong>1º trecho (p95):</strong> {formatMs(chatLatencyStats.ttftP95)}</p>
+                        <p><strong>Resposta completa (p50):</strong> {formatMs(chatLatencyStats.totalP50)}</p>
+                        <p><strong>Resposta completa (p95):</strong> {formatMs(chatLatencyStats.totalP95)}</p>
+                        <p className="col-span-2 text-xs text-gray-500">Prompt típico (p50): {chatLatencyStats.promptTokensP50 !== null ? `~${chatLatencyStats.promptTokensP50} tokens` : '-'}</p>
+                    </div>
+                </StatusCard>
+
+                <StatusCard
+                    title="Roteamento de Intenções (Chat)"
+                    status="ok"
+                    message="Mensagens com intenção clara vão direto para a ferramenta certa, sem passar pelo Gemini. Números desta sessão do navegador."
+                >
+                    <div className="mt-4 grid grid-cols-2 gap-2 text-sm">
+                        <p><strong>Roteadas direto:</strong> {(routingStats.routedRate * 100).toFixed(1)}% de {routingStats.total}</p>
+                        <p><strong>Enviadas ao Gemini:</strong> {routingStats.gemini}</p>
+                        <p><strong>Rastreio de pedido:</strong> {routingStats.routed.trackOrder}</p>
+                        <p><strong>Abertura de chamado:</strong> {routingStats.routed.openSupportTicket}</p>
+                        <p><strong>Busca no FAQ:</strong> {routingStats.routed.searchFAQ}</p>
+                        <p><strong>Tempo médio de decisão:</strong> {routingStats.avgDecisionMs.toFixed(2)}ms</p>
+                        <div className="col-span-2 text-xs text-gray-500">
+                            <p className="font-semibold">Motivos:</p>
+                            {routingReasons.length === 0 ? (
+                                <p>Nenhuma mensagem roteada ainda.</p>
+                            ) : (
+                                routingReasons.map(([reason, count]) => <p key={reason}>{reason}: {count}</p>)
+                            )}
+                        </div>
+                    </div>
+                </StatusCard>
             </div>
         </div>
     );
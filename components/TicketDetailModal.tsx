@@ -1,8 +1,9 @@
 // Fix: Implement the TicketDetailModal component.
 import React, { useState, useEffect } from 'react';
-import { Ticket, TicketStatus, CubboOrder } from '../types';
-import { supportService } from '../services/supportService';
+import { Ticket, TicketStatus, CubboOrder, TicketHistoryItem } from '../types';
+import { supportService, TicketHistoryPage } from '../services/supportService';
 import { knowledgeBaseService } from '../services/knowledgeBaseService';
+import { formatDuration } from '../services/ticketStatsService';
 import { UserIcon, BotIcon } from './Icons';
 import { OrderDetailModal } from './OrderDetailModal';
 
@@ -21,6 +22,30 @@ export const TicketDetailModal: React.FC<TicketDetailModalProps> = ({ ticket, is
     const [relatedOrder, setRelatedOrder] = useState<CubboOrder | null>(null);
     const [isLoadingOrder, setIsLoadingOrder] = useState(false);
     const [isOrderModalOpen, setIsOrderModalOpen] = useState(false);
+    const [historyItems, setHistoryItems] = useState<TicketHistoryItem[]>([]); // mais recentes primeiro
+    const [historyCursor, setHistoryCursor] = useState<TicketHistoryPage['nextCursor']>(null);
+    const [isLoadingHistory, setIsLoadingHistory] = useState(false);
+
+    // Histórico em páginas: abre com as interações mais recentes e busca as anteriores sob demanda
+    const loadHistoryPage = async (cursor: TicketHistoryPage['nextCursor']) => {
+        setIsLoadingHistory(true);
+        try {
+            const page = await supportService.getTicketHistoryPage(ticket.id, cursor);
+            setHistoryItems(prev => cursor ? [...prev, ...page.items] : page.items);
+            setHistoryCursor(page.nextCursor);
+        } catch (error) {
+            console.error('[TicketDetailModal] Erro ao carregar histórico:', error);
+        } finally {
+            setIsLoadingHistory(false);
+        }
+    };
+
+    useEffect(() => {
+        if (!isOpen) return;
+        setHistoryItems([]);
+        setHistoryCursor(null);
+        loadHistoryPage(null);
+    }, [isOpen, ticket.id]);
 
     useEffect(() => {
         // Reset state if ticket changes
@@ -121,6 +146,14 @@ export const TicketDetailModal: React.FC<TicketDetailModalProps> = ({ ticket, is
     
     if (!isOpen) return null;
 
+    // Ordem cronológica. O histórico legado (array no documento) é mais antigo que a subcoleção:
+    // só aparece depois que todas as páginas foram carregadas.
+    const allPagesLoaded = !historyCursor && !(isLoadingHistory && historyItems.length === 0);
+    const timeline = [...(allPagesLoaded ? ticket.history || [] : []), ...[...historyItems].reverse()];
+
+    // Tempo em cada status, a partir do resumo do ticket (vazio em tickets anteriores a esse controle)
+    const statusDurations = Object.entries(supportService.getStatusDurations(ticket)) as Array<[TicketStatus, number]>;
+
     const getStatusColor = (status: Ticket['status']) => {
         switch (status) {
             case 'aberto': return 'badge-info';
@@ -146,6 +179,12 @@ export const TicketDetailModal: React.FC<TicketDetailModalProps> = ({ ticket, is
                     <p><strong>Email:</strong> {ticket.email}</p>
                     <p><strong>Status:</strong> <span className={`badge ${getStatusColor(ticket.status)}`}>{ticket.status.replace('_', ' ')}</span></p>
                     <p><strong>Prioridade:</strong> <span className={`badge`}>{ticket.priority}</span></p>
+                    {statusDurations.length > 0 && (
+                        <p className="col-span-2">
+                            <strong>Tempo por status:</strong>{' '}
+                            {statusDurations.map(([status, ms]) => `${status.replace('_', ' ')}: ${formatDuration(ms)}`).join(' • ')}
+                        </p>
+                    )}
                 </div>
 
                 {/* Pedido Relacionado */}
@@ -189,9 +228,25 @@ export const TicketDetailModal: React.FC<TicketDetailModalProps> = ({ ticket, is
                      <p className="text-sm mb-4 p-3 bg-base-100 rounded-md whitespace-pre-wrap">{ticket.description}</p>
                     <hr className="my-2 border-base-300"/>
                     <p className="font-semibold mb-2 text-sm">Histórico de Interações:</p>
+                    {historyCursor && (
+                        <button
+                            type="button"
+                            className="btn btn-xs btn-ghost w-full mb-2"
+                            onClick={() => loadHistoryPage(historyCursor)}
+                            disabled={isLoadingHistory}
+                        >
+                            {isLoadingHistory ? <span className="loading loading-spinner loading-xs"></span> : 'Carregar interações anteriores'}
+                        </button>
+                    )}
+                    {isLoadingHistory && historyItems.length === 0 && (
+                        <div className="flex items-center gap-2 mb-2">
+                            <span className="loading loading-spinner loading-sm"></span>
+                            <span className="text-sm">Carregando histórico...</span>
+                        </div>
+                    )}
                     <div className="space-y-4">
-                        {(ticket.history || []).map((item, index) => (
-                            <div key={index} className={`chat ${item.author === 'admin' ? 'chat-start' : 'chat-end'}`}>
+                        {timeline.map((item, index) => (
+                            <div key={item.id || index} className={`chat ${item.author === 'admin' ? 'chat-start' : 'chat-end'}`}>
                                 <div className="chat-image avatar">
                                     <div className="w-8 rounded-full bg-primary text-primary-content flex items-center justify-center">
                                        {item.author === 'admin' ? <BotIcon className="w-5 h-5"/> : <UserIcon className="w-5 h-5"/>}
@@ -30,7 +30,7 @@ const subjectLabels: Record<TicketSubject, string> = {
   outro: 'Outro Assunto',
 };
 
-const emptyTicket: Omit<Ticket, 'id' | 'createdAt' | 'updatedAt' | 'history'> = {
+const emptyTicket: Omit<Ticket, 'id' | 'createdAt' | 'updatedAt' | 'history' | 'historySummary'> = {
     subject: '',
     description: '',
     priority: 'media',
@@ -53,7 +53,7 @@ export const TicketForm: React.FC<TicketFormProps> = ({ ticket, onSubmit }) => {
 
   useEffect(() => {
     if (isEditing && ticket) {
-      const { id, createdAt, updatedAt, history, ...editableData } = ticket;
+      const { id, createdAt, updatedAt, history, historySummary, ...editableData } = ticket;
       setFormData(editableData);
       // Tentar identificar o assunto do ticket existente
       const subjectKey = Object.keys(subjectLabels).find(
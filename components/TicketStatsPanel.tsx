@@ -0,0 +1,98 @@
+import React, { useState, useEffect } from 'react';
+import { TicketStats, TicketStatus } from '../types';
+import { ticketStatsService, emptyTicketStats, formatDuration, RESOLUTION_BUCKETS } from '../services/ticketStatsService';
+import { Card, CardContent } from './ui/card';
+import { Button } from './ui/button';
+
+const STATUS_LABELS: Array<[TicketStatus, string]> = [
+    ['aberto', 'Abertos'],
+    ['em_andamento', 'Em andamento'],
+    ['resolvido', 'Resolvidos'],
+    ['fechado', 'Fechados'],
+    ['arquivado', 'Arquivados'],
+];
+
+// Resumo dos chamados a partir do documento stats/tickets (ao vivo, sem varrer a coleção)
+export const TicketStatsPanel: React.FC = () => {
+    const [stats, setStats] = useState<TicketStats>(emptyTicketStats());
+    const [isBackfilling, setIsBackfilling] = useState(false);
+
+    useEffect(() => ticketStatsService.subscribeToStats(setStats), []);
+
+    const handleBackfill = async () => {
+        if (!window.confirm('Recalcular as estatísticas lendo todos os chamados? Pode levar alguns segundos.')) return;
+        setIsBackfilling(true);
+        try {
+            await ticketStatsService.backfill();
+        } catch (error) {
+            console.error('[TicketStatsPanel] Erro no backfill:', error);
+            alert('Não foi possível recalcular as estatísticas.');
+        } finally {
+            setIsBackfilling(false);
+        }
+    };
+
+    const topSubjects = Object.entries(stats.bySubject)
+        .filter(([, count]) => count > 0)
+        .sort((a, b) => b[1] - a[1])
+        .slice(0, 5);
+    const averageResolution = stats.resolution.count ? stats.resolution.totalMs / stats.resolution.count : 0;
+    const largestBucket = Math.max(1, ...RESOLUTION_BUCKETS.map(bucket => stats.resolution.histogram[bucket.key] || 0));
+
+    return (
+        <Card className="mb-6">
+            <CardContent className="p-4">
+                <div className="flex justify-between items-center mb-3">
+                    <p className="font-semibold text-sm">
+                        Visão geral • {stats.total} chamados
+                        {stats.updatedAt && (
+                            <span className="text-xs text-gray-500 font-normal"> (atualizado em {new Date(stats.updatedAt).toLocaleString('pt-BR')})</span>
+                        )}
+                    </p>
+                    <Button variant="outline" size="sm" onClick={handleBackfill} disabled={isBackfilling}>
+                        {isBackfilling ? <span className="loading loading-spinner loading-xs"></span> : 'Recalcular'}
+                    </Button>
+                </div>
+
+                <div className="grid grid-cols-1 md:grid-cols-3 gap-4 text-sm">
+                    <div>
+                        <p className="font-medium mb-1">Por status</p>
+                        {STATUS_LABELS.map(([status, label]) => (
+                            <p key={status} className="flex justify-between">
+                                <span>{label}</span>
+                                <span className="font-semibold">{stats.byStatus[status] || 0}</span>
+                            </p>
+                        ))}
+                    </div>
+                    <div>
+                        <p className="font-medium mb-1">Principais assuntos</p>
+                        {topSubjects.length === 0 && <p className="text-gray-500">Sem dados</p>}
+                        {topSubjects.map(([subject, count]) => (
+                            <p key={subject} className="flex justify-between gap-2">
+                                <span className="truncate">{subject}</span>
+                                <span className="font-semibold">{count}</span>
+                            </p>
+                        ))}
+                    </div>
+                    <div>
+                        <p className="font-medium mb-1">
+                            Tempo até resolução{stats.resolution.count > 0 && ` • média ${formatDuration(averageResolution)}`}
+                        </p>
+                        {RESOLUTION_BUCKETS.map(bucket => {
+                            const count = stats.resolution.histogram[bucket.key] || 0;
+                            return (
+                                <div key={bucket.key} className="flex items-center gap-2">
+                                    <span className="w-24 shrink-0 text-xs">{bucket.label}</span>
+                                    <div className="flex-1 bg-base-200 rounded h-2">
+                                        <div className="bg-primary h-2 rounded" style={{ width: `${(count / largestBucket) * 100}%` }}></div>
+                                    </div>
+                                    <span className="w-6 text-right text-xs">{count}</span>
+                                </div>
+                            );
+                        })}
+                    </div>
+                </div>
+            </CardContent>
+        </Card>
+    );
+};
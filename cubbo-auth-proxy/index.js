@@ -2,9 +2,12 @@
 // Deploy this code to Google Cloud Run.
 // Make sure to set the environment variables CUBBO_CLIENT_ID and CUBBO_CLIENT_SECRET in your Cloud Run service configuration.
 
+const crypto = require('crypto');
 const express = require('express');
 const fetch = require('node-fetch');
 const cors = require('cors');
+const { httpsAgent, getPoolMetrics } = require('./http-agent');
+const orderIndex = require('./order-index');
 
 const app = express();
 
@@ -45,6 +48,144 @@ app.use(cors(corsOptions));
 // Handle preflight requests explicitly
 app.options('*', cors(corsOptions));
 
+// --- Cache do token OAuth da Cubbo ---
+// O token vale por horas (expires_in), mas antes era pedido à Cubbo a cada chamada.
+// Agora fica em memória por client_id até perto de expirar:
+// - dentro da margem de renovação, o token atual é servido e um novo é buscado em segundo plano;
+// - requisições simultâneas sem token válido compartilham uma única chamada à Cubbo (single-flight).
+const CUBBO_AUTH_URL = 'https://api.cubbo.com/v1/auth/token';
+const TOKEN_REFRESH_MARGIN_MS = (parseInt(process.env.CUBBO_TOKEN_REFRESH_MARGIN_SECONDS, 10) || 300) * 1000;
+const DEFAULT_TOKEN_TTL_SECONDS = 3600;
+
+const tokenCache = new Map();     // client_id -> { data, expiresAt, refreshAt }
+const pendingTokens = new Map();  // client_id -> Promise da chamada em andamento
+const tokenMetrics = { hits: 0, misses: 0, refreshes: 0, coalesced: 0, errors: 0, invalidations: 0 };
+
+class CubboAuthError extends Error {
+    constructor(message, status, details) {
+        super(message);
+        this.status = status;
+        this.details = details;
+    }
+}
+
+async function requestCubboToken(clientId, clientSecret) {
+    const body = new URLSearchParams();
+    body.append('grant_type', 'client_credentials');
+    body.append('client_id', clientId);
+    body.append('client_secret', clientSecret);
+
+    const cubboResponse = await fetch(CUBBO_AUTH_URL, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/x-www-form-urlencoded'
+        },
+        body: body,
+        agent: httpsAgent
+    });
+
+    // Get response text first to handle non-JSON responses
+    const responseText = await cubboResponse.text();
+    let data;
+    try {
+        data = JSON.parse(responseText);
+    } catch (parseError) {
+        console.error('Resposta da API Cubbo não é JSON válido:', responseText);
+        console.error('Status:', cubboResponse.status);
+        throw new CubboAuthError(
+            'Resposta inválida da API Cubbo.',
+            cubboResponse.status || 500,
+            `Status: ${cubboResponse.status}, Resposta: ${responseText.substring(0, 200)}`
+        );
+    }
+
+    if (!cubboResponse.ok) {
+        console.error('Erro ao obter token da Cubbo:', data);
+        throw new CubboAuthError('Falha na autenticação com a API da Cubbo.', cubboResponse.status, data);
+    }
+
+    return data;
+}
+
+function fetchToken(clientId, clientSecret) {
+    const pending = pendingTokens.get(clientId);
+    if (pending) {
+        tokenMetrics.coalesced++;
+        return pending;
+    }
+
+    const request = requestCubboToken(clientId, clientSecret)
+        .then((data) => {
+            const ttlMs = (Number(data.expires_in) > 0 ? Number(data.expires_in) : DEFAULT_TOKEN_TTL_SECONDS) * 1000;
+            const now = Date.now();
+            const entry = {
+                data,
+                expiresAt: now + ttlMs,
+                // Tokens curtos: renovar na metade da vida em vez de usar a margem inteira
+                refreshAt: now + ttlMs - Math.min(TOKEN_REFRESH_MARGIN_MS, ttlMs / 2)
+            };
+            tokenCache.set(clientId, entry);
+            return entry;
+        })
+        .catch((error) => {
+            tokenMetrics.errors++;
+            throw error;
+        })
+        .finally(() => {
+            pendingTokens.delete(clientId);
+        });
+
+    pendingTokens.set(clientId, request);
+    return request;
+}
+
+// Retorna { entry, cacheStatus } com o token válido para as credenciais configuradas
+async function getTokenEntry() {
+    const { CUBBO_CLIENT_ID, CUBBO_CLIENT_SECRET } = process.env;
+
+    if (!CUBBO_CLIENT_ID || !CUBBO_CLIENT_SECRET) {
+        throw new Error('Variáveis de ambiente CUBBO_CLIENT_ID ou CUBBO_CLIENT_SECRET não estão definidas.');
+    }
+
+    const now = Date.now();
+    const cached = tokenCache.get(CUBBO_CLIENT_ID);
+    if (cached && now < cached.expiresAt) {
+        tokenMetrics.hits++;
+        if (now >= cached.refreshAt && !pendingTokens.has(CUBBO_CLIENT_ID)) {
+            tokenMetrics.refreshes++;
+            fetchToken(CUBBO_CLIENT_ID, CUBBO_CLIENT_SECRET).catch((error) => {
+                console.error('[Token Cache] Falha ao renovar token antecipadamente:', error.message);
+            });
+        }
+        return { entry: cached, cacheStatus: 'HIT' };
+    }
+
+    tokenMetrics.misses++;
+    const entry = await fetchToken(CUBBO_CLIENT_ID, CUBBO_CLIENT_SECRET);
+    return { entry, cacheStatus: 'MISS' };
+}
+
+// Descarta o token em cache (ex.: a Cubbo respondeu 401 com ele)
+function invalidateToken(token) {
+    const { CUBBO_CLIENT_ID } = process.env;
+    const cached = tokenCache.get(CUBBO_CLIENT_ID);
+    if (cached && (cached.data.access_token || cached.data.token) === token) {
+        tokenCache.delete(CUBBO_CLIENT_ID);
+        tokenMetrics.invalidations++;
+    }
+}
+
+function getTokenCacheMetrics() {
+    const lookups = tokenMetrics.hits + tokenMetrics.misses;
+    const cached = tokenCache.get(process.env.CUBBO_CLIENT_ID);
+    return {
+        ...tokenMetrics,
+        hitRate: lookups ? Number((tokenMetrics.hits / lookups).toFixed(3)) : 0,
+        cachedClients: tokenCache.size,
+        expiresInSeconds: cached ? Math.max(0, Math.floor((cached.expiresAt - Date.now()) / 1000)) : null
+    };
+}
+
 app.post('/', async (req, res) => {
     const { CUBBO_CLIENT_ID, CUBBO_CLIENT_SECRET } = process.env;
 
@@ -57,167 +198,565 @@ app.post('/', async (req, res) => {
         return res.status(500).json({ error: 'Configuração do servidor incompleta. Variáveis de ambiente faltando.' });
     }
 
-    // Cubbo's OAuth endpoint
-    const CUBBO_AUTH_URL = 'https://api.cubbo.com/v1/auth/token';
-
-    const body = new URLSearchParams();
-    body.append('grant_type', 'client_credentials');
-    body.append('client_id', CUBBO_CLIENT_ID);
-    body.append('client_secret', CUBBO_CLIENT_SECRET);
-    
     try {
-        const cubboResponse = await fetch(CUBBO_AUTH_URL, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/x-www-form-urlencoded'
-            },
-            body: body
-        });
-        
-        // Get response text first to handle non-JSON responses
-        const responseText = await cubboResponse.text();
-        let data;
-        
-        try {
-            data = JSON.parse(responseText);
-        } catch (parseError) {
-            // If response is not JSON, log the raw response
-            console.error('Resposta da API Cubbo não é JSON válido:', responseText);
-            console.error('Status:', cubboResponse.status);
-            res.header('Access-Control-Allow-Origin', req.headers.origin || '*');
-            res.header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS');
-            res.header('Access-Control-Allow-Headers', 'Content-Type, Authorization');
-            return res.status(cubboResponse.status || 500).json({
-                error: 'Resposta inválida da API Cubbo.',
-                details: `Status: ${cubboResponse.status}, Resposta: ${responseText.substring(0, 200)}`
-            });
-        }
+        const { entry, cacheStatus } = await getTokenEntry();
 
-        if (!cubboResponse.ok) {
-            console.error('Erro ao obter token da Cubbo:', data);
-            // Set CORS headers explicitly
-            res.header('Access-Control-Allow-Origin', req.headers.origin || '*');
-            res.header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS');
-            res.header('Access-Control-Allow-Headers', 'Content-Type, Authorization');
-            // Forward the error from Cubbo to the frontend for better debugging
-            return res.status(cubboResponse.status).json({
-                error: 'Falha na autenticação com a API da Cubbo.',
-                details: data
-            });
-        }
-        
-        // Success: forward the token response to the frontend
+        // Success: forward the token response to the frontend, with the remaining lifetime
         // Set CORS headers explicitly
         res.header('Access-Control-Allow-Origin', req.headers.origin || '*');
         res.header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS');
         res.header('Access-Control-Allow-Headers', 'Content-Type, Authorization');
-        res.status(200).json(data);
+        res.header('X-Token-Cache', cacheStatus);
+        res.status(200).json({
+            ...entry.data,
+            expires_in: Math.max(0, Math.floor((entry.expiresAt - Date.now()) / 1000))
+        });
 
     } catch (error) {
-        console.error('Erro interno no proxy de autenticação:', error);
         // Set CORS headers explicitly even on error
         res.header('Access-Control-Allow-Origin', req.headers.origin || '*');
         res.header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS');
         res.header('Access-Control-Allow-Headers', 'Content-Type, Authorization');
+
+        if (error instanceof CubboAuthError) {
+            // Forward the error from Cubbo to the frontend for better debugging
+            return res.status(error.status).json({
+                error: error.message,
+                details: error.details
+            });
+        }
+
+        console.error('Erro interno no proxy de autenticação:', error);
         res.status(500).json({ error: 'Erro interno no servidor do proxy.' });
     }
 });
 
-// Helper function to get access token
+// Métricas do proxy (caches de token e de respostas, coalescência, índice de pedidos, pool de conexões)
+app.get('/metrics', (req, res) => {
+    res.json({
+        tokenCache: getTokenCacheMetrics(),
+        responseCache: getResponseCacheMetrics(),
+        requestCoalescing: getCoalescingMetrics(),
+        orderIndex: { ...orderIndex.getStats(), backfill: backfillState },
+        connectionPool: getPoolMetrics()
+    });
+});
+
+// Helper function to get access token (served from the cache when possible)
 async function getAccessToken() {
-    const { CUBBO_CLIENT_ID, CUBBO_CLIENT_SECRET } = process.env;
+    const { entry } = await getTokenEntry();
+    return entry.data.access_token || entry.data.token;
+}
 
-    if (!CUBBO_CLIENT_ID || !CUBBO_CLIENT_SECRET) {
-        throw new Error('Variáveis de ambiente CUBBO_CLIENT_ID ou CUBBO_CLIENT_SECRET não estão definidas.');
+// --- Cache de respostas GET da API Cubbo ---
+// O chatbot consulta o mesmo pedido várias vezes na mesma conversa (trackOrder, getOrderDetails).
+// Respostas 2xx de GET ficam em um LRU limitado, com TTL por rota e stale-while-revalidate.
+// A chave é o caminho + a query string ordenada com os valores exatos (store_id, shipping_email,
+// order_number...): pedidos de um email nunca são servidos para outra chave de email.
+// Qualquer escrita (POST/PUT/PATCH/DELETE) limpa as entradas do mesmo recurso.
+const RESPONSE_CACHE_MAX_ENTRIES = parseInt(process.env.CUBBO_CACHE_MAX_ENTRIES, 10) || 500;
+const RESPONSE_CACHE_STALE_SECONDS = parseInt(process.env.CUBBO_CACHE_STALE_SECONDS, 10) || 60;
+
+// TTL (segundos) por rota; a primeira regra que combinar vale
+const RESPONSE_CACHE_ROUTES = [
+    { test: (path, params) => path === '/orders' && params.has('order_number'), ttl: parseInt(process.env.CUBBO_CACHE_ORDER_TTL_SECONDS, 10) || 30 },
+    { test: (path) => path.startsWith('/orders'), ttl: parseInt(process.env.CUBBO_CACHE_ORDERS_TTL_SECONDS, 10) || 15 },
+    { test: (path) => path.startsWith('/carrier-services/pickup-locations'), ttl: 300 }
+];
+
+const responseCache = new Map(); // chave -> { status, data, storedAt, expiresAt, staleUntil, revalidating }
+const responseCacheMetrics = { hits: 0, misses: 0, staleHits: 0, revalidations: 0, purged: 0, evictions: 0 };
+let responseCacheGeneration = 0; // incrementado a cada purge: respostas buscadas antes da escrita não entram no cache
+
+function getCacheRoute(apiPath, params) {
+    return RESPONSE_CACHE_ROUTES.find((route) => route.test(apiPath, params)) || null;
+}
+
+function getResponseCacheKey(apiPath, params) {
+    const sorted = new URLSearchParams(params);
+    sorted.sort();
+    return `${apiPath}?${sorted.toString()}`;
+}
+
+function readCachedResponse(key) {
+    const entry = responseCache.get(key);
+    if (!entry) return null;
+    if (Date.now() >= entry.staleUntil) {
+        responseCache.delete(key);
+        return null;
     }
+    // LRU: reinserir move a entrada para o fim (mais recente)
+    responseCache.delete(key);
+    responseCache.set(key, entry);
+    return entry;
+}
 
-    const CUBBO_AUTH_URL = 'https://api.cubbo.com/v1/auth/token';
-    const body = new URLSearchParams();
-    body.append('grant_type', 'client_credentials');
-    body.append('client_id', CUBBO_CLIENT_ID);
-    body.append('client_secret', CUBBO_CLIENT_SECRET);
-    
-    const cubboResponse = await fetch(CUBBO_AUTH_URL, {
-        method: 'POST',
-        headers: {
-            'Content-Type': 'application/x-www-form-urlencoded'
-        },
-        body: body
+function storeCachedResponse(key, route, status, data) {
+    const now = Date.now();
+    responseCache.delete(key);
+    responseCache.set(key, {
+        status,
+        data,
+        storedAt: now,
+        expiresAt: now + route.ttl * 1000,
+        staleUntil: now + (route.ttl + RESPONSE_CACHE_STALE_SECONDS) * 1000,
+        revalidating: false
     });
-    
-    if (!cubboResponse.ok) {
-        const errorText = await cubboResponse.text();
-        throw new Error(`Falha na autenticação: ${cubboResponse.status} - ${errorText}`);
+    while (responseCache.size > RESPONSE_CACHE_MAX_ENTRIES) {
+        responseCache.delete(responseCache.keys().next().value);
+        responseCacheMetrics.evictions++;
+    }
+}
+
+// Remove as entradas do recurso alterado (ex.: PATCH /orders/123 limpa /orders e /orders/123)
+function purgeCachedResponses(apiPath) {
+    const resource = `/${apiPath.split('/')[1] || ''}`;
+    responseCacheGeneration++;
+    for (const key of Array.from(responseCache.keys())) {
+        if (key.startsWith(`${resource}?`) || key.startsWith(`${resource}/`)) {
+            responseCache.delete(key);
+            responseCacheMetrics.purged++;
+        }
+    }
+}
+
+function getResponseCacheMetrics() {
+    const lookups = responseCacheMetrics.hits + responseCacheMetrics.staleHits + responseCacheMetrics.misses;
+    return {
+        ...responseCacheMetrics,
+        hitRate: lookups ? Number(((responseCacheMetrics.hits + responseCacheMetrics.staleHits) / lookups).toFixed(3)) : 0,
+        size: responseCache.size,
+        maxEntries: RESPONSE_CACHE_MAX_ENTRIES
+    };
+}
+
+// Pedidos contidos em uma resposta de /orders: lista paginada, { order } ou o próprio pedido
+function extractOrders(data) {
+    if (!data || typeof data !== 'object') return [];
+    if (Array.isArray(data)) return data;
+    if (Array.isArray(data.orders)) return data.orders;
+    if (Array.isArray(data.data)) return data.data;
+    if (data.order) return [data.order];
+    return data.order_number ? [data] : [];
+}
+
+// Envia a requisição à API Cubbo e devolve { status, data }
+async function forwardToCubbo(method, apiPath, queryString, body) {
+    const indexGeneration = orderIndex.getSnapshotGeneration();
+    let accessToken = await getAccessToken();
+
+    // Build the Cubbo API URL
+    const fullUrl = `https://api.cubbo.com/v1${apiPath}${queryString}`;
+
+    console.log(`[API Proxy] ${method} ${fullUrl}`);
+
+    // Prepare headers
+    const headers = {
+        'Authorization': `Bearer ${accessToken}`,
+        'Content-Type': 'application/json'
+    };
+
+    const options = {
+        method: method,
+        headers: headers,
+        agent: httpsAgent
+    };
+
+    // Include body for POST, PUT, PATCH requests
+    if (['POST', 'PUT', 'PATCH'].includes(method) && body) {
+        options.body = JSON.stringify(body);
+    }
+
+    let cubboResponse = await fetch(fullUrl, options);
+
+    // Token em cache revogado ou expirado antes do previsto: descartar e tentar uma vez com um novo
+    if (cubboResponse.status === 401) {
+        console.warn('[API Proxy] Cubbo retornou 401, renovando token e repetindo a requisição');
+        invalidateToken(accessToken);
+        accessToken = await getAccessToken();
+        options.headers = { ...headers, 'Authorization': `Bearer ${accessToken}` };
+        cubboResponse = await fetch(fullUrl, options);
+    }
+
+    // Get response data
+    const responseText = await cubboResponse.text();
+    let responseData;
+
+    try {
+        responseData = responseText ? JSON.parse(responseText) : {};
+    } catch (e) {
+        responseData = { raw: responseText };
+    }
+
+    // Todo pedido que passa pelo proxy alimenta o índice local de order_number
+    if (cubboResponse.ok && apiPath.startsWith('/orders')) {
+        const storeId = new URLSearchParams(queryString).get('store_id') || (body && body.store_id);
+        orderIndex.indexOrders(extractOrders(responseData), storeId, indexGeneration);
+    }
+
+    return { status: cubboResponse.status, data: responseData };
+}
+
+// --- Coalescência de GETs idênticos em andamento (single-flight) ---
+// AdminOrders, o chatbot e o formulário de chamado podem pedir o mesmo pedido ao mesmo tempo;
+// enquanto a primeira chamada não volta, as idênticas aguardam a mesma resposta da Cubbo.
+const inFlightRequests = new Map(); // chave -> Promise<{ status, data }>
+const coalescingMetrics = { upstreamRequests: 0, dedupHits: 0 };
+
+function coalesce(key, request) {
+    const pending = inFlightRequests.get(key);
+    if (pending) {
+        coalescingMetrics.dedupHits++;
+        return { promise: pending, coalesced: true };
+    }
+
+    coalescingMetrics.upstreamRequests++;
+    const promise = request().finally(() => {
+        // Uma escrita pode ter limpado o mapa e um GET novo já ter registrado a mesma chave
+        if (inFlightRequests.get(key) === promise) inFlightRequests.delete(key);
+    });
+    inFlightRequests.set(key, promise);
+    return { promise, coalesced: false };
+}
+
+function getCoalescingMetrics() {
+    const total = coalescingMetrics.upstreamRequests + coalescingMetrics.dedupHits;
+    return {
+        ...coalescingMetrics,
+        dedupRate: total ? Number((coalescingMetrics.dedupHits / total).toFixed(3)) : 0,
+        inFlight: inFlightRequests.size
+    };
+}
+
+// Busca na Cubbo e atualiza o cache (respostas 2xx apenas)
+async function fetchAndCache(key, route, apiPath, queryString) {
+    const generation = responseCacheGeneration;
+    const result = await forwardToCubbo('GET', apiPath, queryString);
+    if (result.status >= 200 && result.status < 300 && generation === responseCacheGeneration) {
+        storeCachedResponse(key, route, result.status, result.data);
+    }
+    return result;
+}
+
+function revalidateInBackground(key, entry, route, apiPath, queryString) {
+    if (entry.revalidating) return;
+    entry.revalidating = true;
+    responseCacheMetrics.revalidations++;
+    coalesce(key, () => fetchAndCache(key, route, apiPath, queryString)).promise
+        .catch((error) => console.error('[Response Cache] Falha ao revalidar', key, error.message))
+        .finally(() => {
+            entry.revalidating = false;
+        });
+}
+
+// GET na Cubbo passando pelo cache de respostas e pela coalescência.
+// Retorna { result: { status, data }, cacheStatus: 'HIT' | 'STALE' | 'MISS' | null, coalesced }
+async function cachedGet(apiPath, queryString) {
+    const params = new URLSearchParams(queryString);
+    const key = getResponseCacheKey(apiPath, params);
+    const route = getCacheRoute(apiPath, params);
+
+    if (!route) {
+        const { promise, coalesced } = coalesce(key, () => forwardToCubbo('GET', apiPath, queryString));
+        return { result: await promise, cacheStatus: null, coalesced };
+    }
+
+    const cached = readCachedResponse(key);
+    if (cached && Date.now() < cached.expiresAt) {
+        responseCacheMetrics.hits++;
+        return { result: cached, cacheStatus: 'HIT', coalesced: false };
+    }
+
+    if (cached) {
+        // Stale-while-revalidate: responde já com a cópia antiga e atualiza em segundo plano
+        responseCacheMetrics.staleHits++;
+        revalidateInBackground(key, cached, route, apiPath, queryString);
+        return { result: cached, cacheStatus: 'STALE', coalesced: false };
+    }
+
+    responseCacheMetrics.misses++;
+    const { promise, coalesced } = coalesce(key, () => fetchAndCache(key, route, apiPath, queryString));
+    return { result: await promise, cacheStatus: 'MISS', coalesced };
+}
+
+// --- Pedidos do cliente paginados e em streaming (NDJSON) ---
+// GET /orders/stream?store_id=...&shipping_email=... (ou customer_phone) busca a página 1,
+// depois as demais em paralelo (até ORDERS_STREAM_CONCURRENCY por vez) e escreve uma linha
+// JSON por página assim que ela chega: { page, orders }. A última linha é { done, total, pages, truncated }
+// ou { error, details } se uma página falhar no meio do caminho.
+const ORDERS_STREAM_PER_PAGE = 100;
+const ORDERS_STREAM_MAX_PAGES = parseInt(process.env.CUBBO_ORDERS_STREAM_MAX_PAGES, 10) || 20;
+const ORDERS_STREAM_CONCURRENCY = parseInt(process.env.CUBBO_ORDERS_STREAM_CONCURRENCY, 10) || 4;
+
+const clampInt = (value, fallback, max) => Math.min(Math.max(parseInt(value, 10) || fallback, 1), max);
+
+function getPageOrders(data) {
+    if (Array.isArray(data)) return data;
+    return data.orders || data.data || data.results || [];
+}
+
+// Total de páginas informado pela Cubbo, quando vier na resposta
+function getTotalPages(data) {
+    const meta = (data && (data.meta || data.pagination)) || data || {};
+    const totalPages = Number(meta.total_pages || meta.last_page || meta.pages);
+    return Number.isFinite(totalPages) && totalPages > 0 ? totalPages : null;
+}
+
+app.get('/orders/stream', async (req, res) => {
+    res.header('Access-Control-Allow-Origin', req.headers.origin || '*');
+    res.header('Access-Control-Allow-Methods', 'GET, OPTIONS');
+    res.header('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Requested-With');
+
+    const params = new URLSearchParams(req.url.includes('?') ? req.url.substring(req.url.indexOf('?')) : '');
+    if (!params.get('store_id')) {
+        return res.status(400).json({ error: 'O parâmetro store_id é obrigatório.' });
+    }
+
+    const perPage = clampInt(params.get('per_page'), ORDERS_STREAM_PER_PAGE, ORDERS_STREAM_PER_PAGE);
+    const maxPages = clampInt(params.get('max_pages'), ORDERS_STREAM_MAX_PAGES, ORDERS_STREAM_MAX_PAGES);
+    const concurrency = clampInt(params.get('concurrency'), ORDERS_STREAM_CONCURRENCY, ORDERS_STREAM_CONCURRENCY);
+    params.delete('max_pages');
+    params.delete('concurrency');
+    params.delete('page');
+    params.set('per_page', String(perPage));
+    if (!params.has('sort')) params.set('sort', 'desc');
+    if (!params.has('sort_by')) params.set('sort_by', 'created_at');
+
+    const fetchPage = async (page) => {
+        const pageParams = new URLSearchParams(params);
+        pageParams.set('page', String(page));
+        const { result } = await cachedGet('/orders', `?${pageParams.toString()}`);
+        if (result.status >= 400) {
+            const error = new Error(`Cubbo retornou status ${result.status} na página ${page}`);
+            error.status = result.status;
+            error.details = result.data;
+            throw error;
+        }
+        return result.data;
+    };
+
+    // A primeira página define o status HTTP: se falhar, responde o erro normalmente
+    let firstPage;
+    try {
+        firstPage = await fetchPage(1);
+    } catch (error) {
+        console.error('[Orders Stream] Erro na primeira página:', error.message);
+        return res.status(error.status || 500).json({
+            error: 'Erro ao processar requisição na API Cubbo.',
+            details: error.details || error.message
+        });
+    }
+
+    res.status(200);
+    res.header('Content-Type', 'application/x-ndjson; charset=utf-8');
+    res.header('Cache-Control', 'no-cache');
+    // Depois do fim da resposta (erro em outra página ou cliente desconectado) nada mais é escrito
+    const writeLine = (payload) => {
+        if (!res.writableEnded) res.write(`${JSON.stringify(payload)}\n`);
+    };
+
+    // Interrompe os workers: nenhuma página nova é pedida à Cubbo
+    let aborted = false;
+    res.on('close', () => {
+        aborted = true;
+    });
+
+    const firstOrders = getPageOrders(firstPage);
+    const knownTotalPages = getTotalPages(firstPage);
+    writeLine({ page: 1, orders: firstOrders, totalPages: knownTotalPages });
+
+    let total = firstOrders.length;
+    let pages = 1;
+    // Sem total informado, páginas são pedidas em lotes até uma vir incompleta
+    let exhausted = firstOrders.length < perPage;
+    const lastPage = Math.min(knownTotalPages || maxPages, maxPages);
+    let nextPage = 2;
+
+    const worker = async () => {
+        while (!exhausted && !aborted && nextPage <= lastPage) {
+            const page = nextPage++;
+            const orders = getPageOrders(await fetchPage(page));
+            pages = Math.max(pages, page);
+            if (orders.length < perPage) exhausted = true;
+            if (orders.length > 0 && !aborted) {
+                total += orders.length;
+                writeLine({ page, orders });
+            }
+        }
+    };
+
+    try {
+        await Promise.all(Array.from({ length: concurrency }, worker));
+        writeLine({ done: true, total, pages, truncated: !exhausted && lastPage === maxPages && (knownTotalPages || Infinity) > maxPages });
+    } catch (error) {
+        console.error('[Orders Stream] Erro ao buscar página:', error.message);
+        aborted = true;
+        writeLine({ error: 'Erro ao buscar página de pedidos na API Cubbo.', details: error.details || error.message });
+    }
+    res.end();
+});
+
+// --- Índice local de order_number (order-index.js) ---
+// Antes de ir à Cubbo, a busca por order_number consulta o índice:
+// - pedido da mesma loja visto há pouco (em qualquer resposta, inclusive páginas e backfill):
+//   responde com a cópia do índice no formato da Cubbo ({ orders: [pedido] }), sem chamada externa;
+// - pedido conhecido, mas sem cópia recente: um código digitado de outra forma ("lp12345", "#R123")
+//   é trocado pelo order_number exato, que a Cubbo encontra na primeira tentativa e que compartilha
+//   a mesma entrada do cache de respostas;
+// - pedido desconhecido: segue para o cache de respostas e a Cubbo como antes.
+function consultOrderIndex(apiPath, queryString, res) {
+    const params = new URLSearchParams(queryString);
+    const orderNumber = params.get('order_number');
+    if (apiPath !== '/orders' || !orderNumber) return { queryString, order: null };
+
+    const order = orderIndex.getFreshOrder(orderNumber, params.get('store_id'));
+    if (order) {
+        res.header('X-Order-Index', 'SERVED');
+        return { queryString, order };
+    }
+
+    const entry = orderIndex.lookup(orderNumber, params.get('store_id'));
+    res.header('X-Order-Index', entry ? 'HIT' : 'MISS');
+    if (!entry || entry.order_number === orderNumber) return { queryString, order: null };
+
+    params.set('order_number', entry.order_number);
+    return { queryString: `?${params.toString()}`, order: null };
+}
+
+// Endpoints administrativos do índice: exigem "Authorization: Bearer <ORDER_INDEX_ADMIN_TOKEN>".
+// Sem o token configurado, ficam desativados.
+function requireAdminToken(req, res, next) {
+    const expected = process.env.ORDER_INDEX_ADMIN_TOKEN;
+    if (!expected) {
+        return res.status(503).json({ error: 'Endpoint desativado: ORDER_INDEX_ADMIN_TOKEN não está definido.' });
+    }
+    const provided = (req.headers.authorization || '').replace(/^Bearer\s+/i, '');
+    const expectedBuffer = Buffer.from(expected);
+    const providedBuffer = Buffer.from(provided);
+    if (providedBuffer.length !== expectedBuffer.length || !crypto.timingSafeEqual(providedBuffer, expectedBuffer)) {
+        return res.status(401).json({ error: 'Token de administrador inválido.' });
     }
-    
-    const data = await cubboResponse.json();
-    return data.access_token || data.token;
+    next();
+}
+
+// GET /orders/lookup?order_number=...&store_id=... responde só com o índice (sem chamar a Cubbo):
+// { order_number, id, status, store_id, updated_at, indexed_at } ou 404 se o pedido nunca foi visto.
+// O email do pedido não é devolvido.
+app.get('/orders/lookup', requireAdminToken, (req, res) => {
+    const { order_number: orderNumber, store_id: storeId } = req.query;
+    if (!orderNumber) {
+        return res.status(400).json({ error: 'O parâmetro order_number é obrigatório.' });
+    }
+
+    const entry = orderIndex.lookup(orderNumber, storeId);
+    if (!entry) {
+        return res.status(404).json({ error: `Pedido "${orderNumber}" não está no índice.` });
+    }
+    const { shipping_email, ...publicEntry } = entry;
+    res.json(publicEntry);
+});
+
+// Backfill: percorre as páginas de /orders da loja (mais recentes primeiro) e indexa todos os pedidos.
+// Uma execução por vez; roda a cada ORDER_INDEX_BACKFILL_INTERVAL_MINUTES quando configurado.
+const ORDER_INDEX_BACKFILL_MAX_PAGES = parseInt(process.env.ORDER_INDEX_BACKFILL_MAX_PAGES, 10) || 50;
+const ORDER_INDEX_BACKFILL_INTERVAL_MINUTES = parseInt(process.env.ORDER_INDEX_BACKFILL_INTERVAL_MINUTES, 10) || 0;
+
+const backfillState = { running: false, storeId: null, pages: 0, orders: 0, startedAt: null, finishedAt: null, error: null };
+
+async function runOrderIndexBackfill(storeId) {
+    Object.assign(backfillState, { running: true, storeId, pages: 0, orders: 0, startedAt: new Date().toISOString(), finishedAt: null, error: null });
+    try {
+        for (let page = 1; page <= ORDER_INDEX_BACKFILL_MAX_PAGES; page++) {
+            const params = new URLSearchParams({
+                store_id: storeId,
+                per_page: String(ORDERS_STREAM_PER_PAGE),
+                page: String(page),
+                sort: 'desc',
+                sort_by: 'created_at'
+            });
+            // Direto na Cubbo, fora do cache de respostas: forwardToCubbo já indexa a página
+            const result = await forwardToCubbo('GET', '/orders', `?${params.toString()}`);
+            if (result.status >= 400) {
+                throw new Error(`Cubbo retornou status ${result.status} na página ${page}`);
+            }
+            const orders = getPageOrders(result.data);
+            backfillState.pages = page;
+            backfillState.orders += orders.length;
+            const totalPages = getTotalPages(result.data);
+            if (orders.length < ORDERS_STREAM_PER_PAGE || (totalPages && page >= totalPages)) break;
+        }
+        console.log(`[Order Index] Backfill da loja ${storeId}: ${backfillState.orders} pedidos em ${backfillState.pages} página(s)`);
+    } catch (error) {
+        backfillState.error = error.message;
+        console.error('[Order Index] Falha no backfill:', error.message);
+    } finally {
+        backfillState.running = false;
+        backfillState.finishedAt = new Date().toISOString();
+    }
+}
+
+// POST /orders/index/backfill?store_id=... (com o token de administrador) inicia o backfill em segundo plano e responde 202
+app.post('/orders/index/backfill', requireAdminToken, (req, res) => {
+    const storeId = req.query.store_id || (req.body && req.body.store_id) || process.env.CUBBO_STORE_ID;
+    if (!storeId) {
+        return res.status(400).json({ error: 'O parâmetro store_id é obrigatório.' });
+    }
+    if (backfillState.running) {
+        return res.status(409).json({ error: 'Já existe um backfill em andamento.', backfill: backfillState });
+    }
+
+    runOrderIndexBackfill(String(storeId));
+    res.status(202).json({ backfill: backfillState });
+});
+
+if (ORDER_INDEX_BACKFILL_INTERVAL_MINUTES > 0 && process.env.CUBBO_STORE_ID) {
+    setInterval(() => {
+        if (!backfillState.running) runOrderIndexBackfill(process.env.CUBBO_STORE_ID);
+    }, ORDER_INDEX_BACKFILL_INTERVAL_MINUTES * 60 * 1000).unref();
 }
 
 // Proxy endpoint for API calls
 // Usage: POST /api/orders/123 or GET /api/orders?customer_email=...
 app.all('/api/*', async (req, res) => {
+    // Set CORS headers (also on errors)
+    res.header('Access-Control-Allow-Origin', req.headers.origin || '*');
+    res.header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS, PUT, DELETE, PATCH');
+    res.header('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Requested-With');
+
     try {
         // Get the path after /api/
         const apiPath = req.path.replace('/api', '');
-        
-        // Get access token
-        const accessToken = await getAccessToken();
-        
-        // Build the Cubbo API URL
-        const cubboApiUrl = `https://api.cubbo.com/v1${apiPath}`;
-        
+
         // Get query string if present
         const queryString = req.url.includes('?') ? req.url.substring(req.url.indexOf('?')) : '';
-        const fullUrl = cubboApiUrl + queryString;
-        
-        console.log(`[API Proxy] ${req.method} ${fullUrl}`);
-        
-        // Prepare headers
-        const headers = {
-            'Authorization': `Bearer ${accessToken}`,
-            'Content-Type': 'application/json'
-        };
-        
-        // Forward the request to Cubbo API
-        const options = {
-            method: req.method,
-            headers: headers
-        };
-        
-        // Include body for POST, PUT, PATCH requests
-        if (['POST', 'PUT', 'PATCH'].includes(req.method) && req.body) {
-            options.body = JSON.stringify(req.body);
+
+        if (req.method === 'GET') {
+            const indexed = consultOrderIndex(apiPath, queryString, res);
+            if (indexed.order) {
+                return res.status(200).json({ orders: [indexed.order] });
+            }
+
+            const { result, cacheStatus, coalesced } = await cachedGet(apiPath, indexed.queryString);
+            if (cacheStatus) res.header('X-Cache', cacheStatus);
+            if (coalesced) res.header('X-Coalesced', 'true');
+            return res.status(result.status).json(result.data);
         }
-        
-        const cubboResponse = await fetch(fullUrl, options);
-        
-        // Get response data
-        const responseText = await cubboResponse.text();
-        let responseData;
-        
-        try {
-            responseData = responseText ? JSON.parse(responseText) : {};
-        } catch (e) {
-            responseData = { raw: responseText };
+
+        const result = await forwardToCubbo(req.method, apiPath, queryString, req.body);
+
+        if (result.status < 400) {
+            purgeCachedResponses(apiPath);
+            if (apiPath.startsWith('/orders')) orderIndex.clearSnapshots();
+            // GETs que começaram antes da escrita não devem ser reaproveitados por novas requisições
+            inFlightRequests.clear();
         }
-        
-        // Set CORS headers
-        res.header('Access-Control-Allow-Origin', req.headers.origin || '*');
-        res.header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS, PUT, DELETE, PATCH');
-        res.header('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Requested-With');
-        
+
         // Forward status and data
-        res.status(cubboResponse.status).json(responseData);
-        
+        res.status(result.status).json(result.data);
+
     } catch (error) {
         console.error('Erro no proxy de API:', error);
-        
-        // Set CORS headers even on error
-        res.header('Access-Control-Allow-Origin', req.headers.origin || '*');
-        res.header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS, PUT, DELETE, PATCH');
-        res.header('Access-Control-Allow-Headers', 'Content-Type, Authorization, X-Requested-With');
-        
+
         res.status(500).json({ 
             error: 'Erro ao processar requisição na API Cubbo.',
             details: error.message 
@@ -229,3 +768,9 @@ const port = process.env.PORT || 8080;
 app.listen(port, () => {
     console.log(`Proxy de autenticação e API Cubbo rodando na porta ${port}`);
 });
+
+// Cloud Run envia SIGTERM antes de encerrar a instância: gravar o índice pendente
+process.on('SIGTERM', () => {
+    orderIndex.flush();
+    process.exit(0);
+});
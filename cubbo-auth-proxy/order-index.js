@@ -0,0 +1,165 @@
+// Índice local de pedidos: order_number -> { id, shipping_email, status }.
+//
+// Clientes digitam o código de várias formas ("#R123", "lp12345", "LP 12345"), mas a Cubbo
+// só encontra o pedido com o order_number EXATO. O índice guarda cada pedido que passa pelo
+// proxy (e os do backfill) com uma chave normalizada, e resolve o código digitado para o
+// order_number real antes da chamada à Cubbo, em memória (sub-milissegundo).
+//
+// Além das chaves, o índice guarda em memória a última cópia completa de cada pedido visto
+// (em qualquer resposta: busca por código, páginas de /orders/stream, backfill). Uma busca por
+// código de um pedido visto há menos de ORDER_INDEX_SERVE_MAX_AGE_SECONDS é respondida com essa
+// cópia, sem chamar a Cubbo. As cópias não vão para o disco e são descartadas a cada escrita em /orders.
+//
+// Persistência: snapshot JSON em ORDER_INDEX_PATH (padrão: ./data/order-index.json), gravado
+// com atraso após mudanças. No Cloud Run, aponte ORDER_INDEX_PATH para um volume montado
+// (ex.: bucket do Cloud Storage) para o índice sobreviver a novas instâncias.
+
+const fs = require('fs');
+const path = require('path');
+
+const INDEX_PATH = process.env.ORDER_INDEX_PATH || path.join(__dirname, 'data', 'order-index.json');
+const SAVE_DELAY_MS = 5000;
+const SERVE_MAX_AGE_MS = (parseInt(process.env.ORDER_INDEX_SERVE_MAX_AGE_SECONDS, 10) || 60) * 1000;
+const SNAPSHOT_MAX_ENTRIES = parseInt(process.env.ORDER_INDEX_SNAPSHOT_MAX_ENTRIES, 10) || 5000;
+
+const entries = new Map(); // chave normalizada -> { order_number, id, shipping_email, status, store_id, updated_at, indexed_at }
+const snapshots = new Map(); // chave normalizada -> { order, seenAt } (só em memória, LRU)
+const stats = { lookups: 0, hits: 0, served: 0, indexed: 0, saves: 0, loadedFromDisk: 0 };
+let saveTimer = null;
+let snapshotGeneration = 0; // incrementado a cada escrita: respostas buscadas antes dela não viram cópia
+
+// "#lp-12345 " -> "LP12345": sem '#', espaços, hífens e underscores, em maiúsculas
+function normalizeOrderNumber(value) {
+    return String(value || '')
+        .replace(/[#\s\-_]/g, '')
+        .toUpperCase();
+}
+
+function toEntry(order, storeId) {
+    const shipping = order.shipping || order.shipping_address || {};
+    return {
+        order_number: String(order.order_number),
+        id: order.id !== undefined && order.id !== null ? String(order.id) : null,
+        shipping_email: (order.shipping_email || shipping.email || order.customer_email || '').toLowerCase() || null,
+        status: order.status || null,
+        store_id: storeId ? String(storeId) : null,
+        updated_at: order.updated_at || order.created_at || null,
+        indexed_at: new Date().toISOString()
+    };
+}
+
+function storeSnapshot(key, order) {
+    snapshots.delete(key);
+    snapshots.set(key, { order, seenAt: Date.now() });
+    while (snapshots.size > SNAPSHOT_MAX_ENTRIES) {
+        snapshots.delete(snapshots.keys().next().value);
+    }
+}
+
+// Indexa pedidos crus da API Cubbo; retorna quantos entraram ou mudaram.
+// `generation` é o valor de getSnapshotGeneration() quando a requisição à Cubbo começou.
+function indexOrders(orders, storeId, generation = snapshotGeneration) {
+    let changed = 0;
+    for (const order of orders || []) {
+        if (!order || !order.order_number) continue;
+        const key = normalizeOrderNumber(order.order_number);
+        const entry = toEntry(order, storeId);
+        const current = entries.get(key);
+        // Não regredir para um estado mais antigo (ex.: página em cache com status desatualizado)
+        if (current && current.updated_at && entry.updated_at && current.updated_at > entry.updated_at) continue;
+        if (generation === snapshotGeneration) storeSnapshot(key, order);
+        if (current && current.status === entry.status && current.shipping_email === entry.shipping_email && current.id === entry.id) continue;
+        entries.set(key, entry);
+        changed++;
+    }
+    if (changed > 0) {
+        stats.indexed += changed;
+        scheduleSave();
+    }
+    return changed;
+}
+
+// Cópia completa e recente do pedido (da mesma loja) para responder sem chamar a Cubbo, ou null
+function getFreshOrder(orderNumber, storeId) {
+    const key = normalizeOrderNumber(orderNumber);
+    const entry = entries.get(key);
+    const snapshot = snapshots.get(key);
+    if (!entry || !snapshot || !storeId || entry.store_id !== String(storeId)) return null;
+    if (Date.now() - snapshot.seenAt > SERVE_MAX_AGE_MS) return null;
+    stats.served++;
+    return snapshot.order;
+}
+
+// Uma escrita em /orders torna as cópias suspeitas: descartar todas
+function clearSnapshots() {
+    snapshotGeneration++;
+    snapshots.clear();
+}
+
+function getSnapshotGeneration() {
+    return snapshotGeneration;
+}
+
+// Pedido conhecido com esse código (em qualquer grafia) na loja informada, ou null
+function lookup(orderNumber, storeId) {
+    stats.lookups++;
+    const entry = entries.get(normalizeOrderNumber(orderNumber)) || null;
+    if (!entry || (storeId && entry.store_id && entry.store_id !== String(storeId))) return null;
+    stats.hits++;
+    return entry;
+}
+
+function load() {
+    try {
+        if (!fs.existsSync(INDEX_PATH)) return;
+        const snapshot = JSON.parse(fs.readFileSync(INDEX_PATH, 'utf8'));
+        for (const entry of snapshot.entries || []) {
+            entries.set(normalizeOrderNumber(entry.order_number), entry);
+        }
+        stats.loadedFromDisk = entries.size;
+        console.log(`[Order Index] ${entries.size} pedidos carregados de ${INDEX_PATH}`);
+    } catch (error) {
+        console.error('[Order Index] Falha ao carregar índice, começando vazio:', error.message);
+    }
+}
+
+function save() {
+    saveTimer = null;
+    try {
+        fs.mkdirSync(path.dirname(INDEX_PATH), { recursive: true });
+        const tmpPath = `${INDEX_PATH}.tmp`;
+        fs.writeFileSync(tmpPath, JSON.stringify({ savedAt: new Date().toISOString(), entries: Array.from(entries.values()) }));
+        fs.renameSync(tmpPath, INDEX_PATH);
+        stats.saves++;
+    } catch (error) {
+        console.error('[Order Index] Falha ao salvar índice:', error.message);
+    }
+}
+
+function scheduleSave() {
+    if (saveTimer) return;
+    saveTimer = setTimeout(save, SAVE_DELAY_MS);
+    saveTimer.unref();
+}
+
+// Grava o que estiver pendente (chamado no SIGTERM do Cloud Run)
+function flush() {
+    if (!saveTimer) return;
+    clearTimeout(saveTimer);
+    save();
+}
+
+function getStats() {
+    return {
+        ...stats,
+        size: entries.size,
+        snapshots: snapshots.size,
+        serveMaxAgeSeconds: SERVE_MAX_AGE_MS / 1000,
+        hitRate: stats.lookups ? Number((stats.hits / stats.lookups).toFixed(3)) : 0,
+        path: INDEX_PATH
+    };
+}
+
+load();
+
+module.exports = { normalizeOrderNumber, indexOrders, lookup, getFreshOrder, clearSnapshots, getSnapshotGeneration, flush, getStats };
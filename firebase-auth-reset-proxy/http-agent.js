@@ -0,0 +1,89 @@
+// Agente HTTPS com keep-alive usado por todas as chamadas de saída do proxy.
+// Sem ele, cada fetch abria uma nova conexão TCP + TLS até a API externa, e no
+// Cloud Run (southamerica-east1) o handshake custa mais do que a própria chamada.
+//
+// Este arquivo é idêntico em cubbo-auth-proxy, postmark-email-proxy e
+// firebase-auth-reset-proxy: cada proxy é implantado a partir da própria pasta.
+//
+// Variáveis de ambiente (opcionais):
+//   HTTP_MAX_SOCKETS        conexões simultâneas por host (padrão: 50)
+//   HTTP_MAX_FREE_SOCKETS   conexões ociosas mantidas por host (padrão: 10)
+//   HTTP_IDLE_TIMEOUT_MS    tempo até fechar uma conexão ociosa (padrão: 30000)
+//   HTTP_KEEPALIVE_MSECS    intervalo do TCP keep-alive (padrão: 1000)
+
+const https = require('https');
+
+const envInt = (name, fallback) => {
+    const value = parseInt(process.env[name], 10);
+    return Number.isFinite(value) && value > 0 ? value : fallback;
+};
+
+class PooledAgent extends https.Agent {
+    constructor(options) {
+        super(options);
+        this.stats = {
+            requests: 0,
+            socketsCreated: 0,
+            queuedRequests: 0,
+            peakActive: 0,
+            peakQueued: 0
+        };
+    }
+
+    createConnection(...args) {
+        this.stats.socketsCreated++;
+        return super.createConnection(...args);
+    }
+
+    addRequest(req, options, ...rest) {
+        this.stats.requests++;
+        super.addRequest(req, options, ...rest);
+
+        // Pool cheio: a requisição ficou na fila esperando um socket livre
+        const queue = this.requests[this.getName({ ...options, ...this.options })] || [];
+        if (queue.includes(req)) {
+            this.stats.queuedRequests++;
+        }
+
+        const { active, queued } = this.currentUsage();
+        this.stats.peakActive = Math.max(this.stats.peakActive, active);
+        this.stats.peakQueued = Math.max(this.stats.peakQueued, queued);
+    }
+
+    currentUsage() {
+        const count = (pool) => Object.values(pool).reduce((total, list) => total + list.length, 0);
+        return {
+            active: count(this.sockets),
+            idle: count(this.freeSockets),
+            queued: count(this.requests),
+            hosts: Object.keys(this.sockets).length
+        };
+    }
+}
+
+const httpsAgent = new PooledAgent({
+    keepAlive: true,
+    keepAliveMsecs: envInt('HTTP_KEEPALIVE_MSECS', 1000),
+    maxSockets: envInt('HTTP_MAX_SOCKETS', 50),
+    maxFreeSockets: envInt('HTTP_MAX_FREE_SOCKETS', 10),
+    timeout: envInt('HTTP_IDLE_TIMEOUT_MS', 30000)
+});
+
+// Ocupação do pool: saturation = sockets em uso / maxSockets no host mais ocupado
+function getPoolMetrics() {
+    const usage = httpsAgent.currentUsage();
+    const busiestHost = Math.max(0, ...Object.values(httpsAgent.sockets).map((list) => list.length));
+    const { requests, socketsCreated } = httpsAgent.stats;
+
+    return {
+        maxSockets: httpsAgent.maxSockets,
+        maxFreeSockets: httpsAgent.maxFreeSockets,
+        idleTimeoutMs: httpsAgent.options.timeout,
+        ...usage,
+        saturation: Number((busiestHost / httpsAgent.maxSockets).toFixed(3)),
+        ...httpsAgent.stats,
+        reuseRate: requests ? Number((Math.max(0, requests - socketsCreated) / requests).toFixed(3)) : 0
+    };
+}
+
+module.exports = { httpsAgent, getPoolMetrics };
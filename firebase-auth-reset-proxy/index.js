@@ -3,6 +3,7 @@
 const express = require('express');
 const admin = require('firebase-admin');
 const cors = require('cors');
+const { httpsAgent, getPoolMetrics } = require('./http-agent');
 
 const app = express();
 app.use(express.json());
@@ -46,13 +47,18 @@ if (!admin.apps.length) {
           }
         }
       }
+      // httpAgent: chamadas REST do Admin SDK (Auth e tokens OAuth) reutilizam conexões
       admin.initializeApp({
-        credential: admin.credential.cert(parsedAccount)
+        credential: admin.credential.cert(parsedAccount, httpsAgent),
+        httpAgent: httpsAgent
       });
       console.log('[FIREBASE ADMIN] Inicializado com Service Account');
     } else {
       // Use default credentials (when running on Cloud Run or with gcloud auth)
-      admin.initializeApp();
+      admin.initializeApp({
+        credential: admin.credential.applicationDefault(httpsAgent),
+        httpAgent: httpsAgent
+      });
       console.log('[FIREBASE ADMIN] Inicializado com Default Credentials');
     }
   } catch (error) {
@@ -78,6 +84,13 @@ app.get('/', (req, res) => {
   });
 });
 
+/**
+ * GET /metrics - Ocupação do pool de conexões HTTPS do Admin SDK
+ */
+app.get('/metrics', (req, res) => {
+  res.json({ connectionPool: getPoolMetrics() });
+});
+
 /**
  * POST /reset-password
  * Resets user password when auth code is valid
@@ -5,6 +5,7 @@
 const express = require('express');
 const fetch = require('node-fetch');
 const cors = require('cors');
+const { httpsAgent, getPoolMetrics } = require('./http-agent');
 
 const app = express();
 app.use(express.json());
@@ -63,7 +64,8 @@ app.post('/', async (req, res) => {
                 'Content-Type': 'application/json',
                 'X-Postmark-Server-Token': POSTMARK_SERVER_TOKEN
             },
-            body: JSON.stringify(postmarkBody)
+            body: JSON.stringify(postmarkBody),
+            agent: httpsAgent
         });
 
         const data = await postmarkResponse.json();
@@ -121,6 +123,11 @@ app.post('/', async (req, res) => {
     }
 });
 
+// Métricas do pool de conexões com a API do Postmark
+app.get('/metrics', (req, res) => {
+    res.json({ connectionPool: getPoolMetrics() });
+});
+
 const port = process.env.PORT || 8080;
 app.listen(port, () => {
     console.log(`Proxy de e-mail Postmark rodando na porta ${port}`);
@@ -279,5 +279,46 @@ export const sendAuthCodeEmail = async (email: string, code: string): Promise<{
   }
 };
 
+const ADMIN_SESSION_KEY = 'admin_session';
+const ADMIN_SESSION_HOURS = 8;
 
+export interface AdminSession {
+  email: string;
+  expiresAt: string; // ISO
+}
 
+/**
+ * Persists the admin session so a reload (or a restored browser storage state) keeps the admin logged in
+ */
+export const saveAdminSession = (email: string): void => {
+  const expiresAt = new Date();
+  expiresAt.setHours(expiresAt.getHours() + ADMIN_SESSION_HOURS);
+  const session: AdminSession = { email: email.toLowerCase().trim(), expiresAt: expiresAt.toISOString() };
+  localStorage.setItem(ADMIN_SESSION_KEY, JSON.stringify(session));
+};
+
+/**
+ * Returns the stored admin session, or null (and clears it) when missing, invalid or expired
+ */
+export const getAdminSession = (): AdminSession | null => {
+  const stored = localStorage.getItem(ADMIN_SESSION_KEY);
+  if (!stored) {
+    return null;
+  }
+
+  try {
+    const session = JSON.parse(stored) as AdminSession;
+    if (session.email && new Date(session.expiresAt) > new Date()) {
+      return session;
+    }
+  } catch (e) {
+    // Valor corrompido - tratar como sessão inexistente
+  }
+
+  localStorage.removeItem(ADMIN_SESSION_KEY);
+  return null;
+};
+
+export const clearAdminSession = (): void => {
+  localStorage.removeItem(ADMIN_SESSION_KEY);
+};
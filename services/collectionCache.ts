@@ -0,0 +1,179 @@
+import { db } from '../firebase';
+import { collection, getDocs, onSnapshot } from 'firebase/firestore';
+
+// Cópia local e sincronizada de uma coleção pequena do Firestore (FAQ, base de conhecimento).
+// - Na primeira leitura, serve o snapshot salvo no IndexedDB (se houver) e abre um onSnapshot
+//   na coleção; a partir daí só as mudanças (docChanges) são aplicadas à cópia em memória.
+// - Todas as telas da sessão leem da memória: filtros de categoria e buscas não vão ao Firestore.
+// - Cada mudança é repassada aos assinantes (índices de busca, componentes abertos) e o snapshot
+//   é regravado no IndexedDB para a próxima visita abrir instantaneamente.
+
+const IDB_NAME = 'suporte-cache';
+const IDB_STORE = 'collections';
+const IDB_SAVE_DELAY_MS = 1000;
+
+export type CollectionChange<T> = { type: 'added' | 'modified' | 'removed'; id: string; item?: T };
+
+export interface LiveCollection<T> {
+  // Resolve quando há dados para servir (IndexedDB ou primeiro snapshot do Firestore)
+  ready: () => Promise<void>;
+  getAll: () => T[];
+  get: (id: string) => T | undefined;
+  // Chamado a cada lote de mudanças; retorna a função para cancelar a assinatura
+  subscribe: (listener: (changes: CollectionChange<T>[]) => void) => () => void;
+  stats: () => { size: number; source: 'empty' | 'indexeddb' | 'firestore'; changesApplied: number };
+}
+
+const openCacheDatabase = (): Promise<IDBDatabase | null> =>
+  new Promise(resolve => {
+    if (typeof indexedDB === 'undefined') return resolve(null);
+    const request = indexedDB.open(IDB_NAME, 1);
+    request.onupgradeneeded = () => request.result.createObjectStore(IDB_STORE);
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => resolve(null);
+  });
+
+let cacheDatabase: Promise<IDBDatabase | null> | null = null;
+const getCacheDatabase = () => {
+  if (!cacheDatabase) cacheDatabase = openCacheDatabase();
+  return cacheDatabase;
+};
+
+const readPersisted = async <T>(name: string): Promise<Array<[string, T]> | null> => {
+  const database = await getCacheDatabase();
+  if (!database) return null;
+  return new Promise(resolve => {
+    const request = database.transaction(IDB_STORE, 'readonly').objectStore(IDB_STORE).get(name);
+    request.onsuccess = () => resolve(request.result?.entries || null);
+    request.onerror = () => resolve(null);
+  });
+};
+
+const writePersisted = async <T>(name: string, entries: Array<[string, T]>): Promise<void> => {
+  const database = await getCacheDatabase();
+  if (!database) return;
+  database.transaction(IDB_STORE, 'readwrite').objectStore(IDB_STORE).put({ savedAt: Date.now(), entries }, name);
+};
+
+export const createLiveCollection = <T>(name: string, fromFirestore: (docSnapshot: any) => T): LiveCollection<T> => {
+  const items = new Map<string, T>();
+  const listeners = new Set<(changes: CollectionChange<T>[]) => void>();
+  let source: 'empty' | 'indexeddb' | 'firestore' = 'empty';
+  let changesApplied = 0;
+  let readyPromise: Promise<void> | null = null;
+  let saveTimer: ReturnType<typeof setTimeout> | null = null;
+
+  const notify = (changes: CollectionChange<T>[]) => {
+    if (changes.length === 0) return;
+    changesApplied += changes.length;
+    listeners.forEach(listener => {
+      try {
+        listener(changes);
+      } catch (error) {
+        console.error(`[collectionCache:${name}] Erro em assinante:`, error);
+      }
+    });
+  };
+
+  const scheduleSave = () => {
+    if (saveTimer) return;
+    saveTimer = setTimeout(() => {
+      saveTimer = null;
+      writePersisted(name, Array.from(items.entries())).catch(error => {
+        console.warn(`[collectionCache:${name}] Não foi possível salvar no IndexedDB:`, error);
+      });
+    }, IDB_SAVE_DELAY_MS);
+  };
+
+  const start = (): Promise<void> =>
+    new Promise<void>(resolve => {
+      let resolved = false;
+      const markReady = () => {
+        if (!resolved) {
+          resolved = true;
+          resolve();
+        }
+      };
+
+      readPersisted<T>(name)
+        .then(persisted => {
+          // O snapshot do Firestore pode ter chegado antes: nesse caso ele já é a versão atual
+          if (!persisted || source === 'firestore') return;
+          persisted.forEach(([id, item]) => items.set(id, item));
+          source = 'indexeddb';
+          notify(persisted.map(([id, item]) => ({ type: 'added' as const, id, item })));
+          markReady();
+        })
+        .catch(error => console.warn(`[collectionCache:${name}] Falha ao ler IndexedDB:`, error));
+
+      let firstSnapshot = true;
+      onSnapshot(
+        collection(db, name),
+        snapshot => {
+          const changes: CollectionChange<T>[] = [];
+          if (firstSnapshot) {
+            // Documentos apagados enquanto a cópia do IndexedDB estava guardada
+            const liveIds = new Set(snapshot.docs.map(docSnapshot => docSnapshot.id));
+            Array.from(items.keys()).forEach(id => {
+              if (!liveIds.has(id)) {
+                items.delete(id);
+                changes.push({ type: 'removed', id });
+              }
+            });
+            firstSnapshot = false;
+          }
+
+          snapshot.docChanges().forEach(change => {
+            const id = change.doc.id;
+            if (change.type === 'removed') {
+              items.delete(id);
+              changes.push({ type: 'removed', id });
+            } else {
+              const item = fromFirestore(change.doc);
+              items.set(id, item);
+              changes.push({ type: change.type, id, item });
+            }
+          });
+
+          source = 'firestore';
+          notify(changes);
+          scheduleSave();
+          markReady();
+        },
+        async error => {
+          console.error(`[collectionCache:${name}] Erro no onSnapshot, lendo a coleção uma vez:`, error);
+          try {
+            const snapshot = await getDocs(collection(db, name));
+            const changes: CollectionChange<T>[] = Array.from(items.keys()).map(id => ({ type: 'removed' as const, id }));
+            items.clear();
+            snapshot.docs.forEach(docSnapshot => {
+              const item = fromFirestore(docSnapshot);
+              items.set(docSnapshot.id, item);
+              changes.push({ type: 'added', id: docSnapshot.id, item });
+            });
+            source = 'firestore';
+            notify(changes);
+          } catch (fallbackError) {
+            console.error(`[collectionCache:${name}] Falha na leitura de fallback:`, fallbackError);
+          }
+          markReady();
+        }
+      );
+    });
+
+  return {
+    ready: () => {
+      if (!readyPromise) readyPromise = start();
+      return readyPromise;
+    },
+    getAll: () => Array.from(items.values()),
+    get: (id) => items.get(id),
+    subscribe: (listener) => {
+      listeners.add(listener);
+      return () => {
+        listeners.delete(listener);
+      };
+    },
+    stats: () => ({ size: items.size, source, changesApplied }),
+  };
+};
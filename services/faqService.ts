@@ -1,20 +1,21 @@
 import { db } from '../firebase';
 import {
   collection,
-  getDocs,
+  collectionGroup,
   getDoc,
+  getDocs,
   addDoc,
   updateDoc,
   doc,
-  query,
-  where,
-  orderBy,
   serverTimestamp,
   Timestamp,
   deleteDoc,
   increment,
+  writeBatch,
 } from 'firebase/firestore';
 import { FAQEntry, FAQCategory } from '../types';
+import { createSearchIndex, foldText, stemWord, tokenize, topScored } from './textSearch';
+import { createLiveCollection } from './collectionCache';
 
 const faqCollection = collection(db, 'faq');
 
@@ -30,63 +31,187 @@ const faqFromFirestore = (docSnapshot: any): FAQEntry => {
   } as FAQEntry;
 };
 
+// Cópia local da coleção faq (IndexedDB + onSnapshot): leituras da sessão saem da memória
+const faqCache = createLiveCollection<FAQEntry>('faq', faqFromFirestore);
+
+const sortFAQEntries = (entries: FAQEntry[]): FAQEntry[] =>
+  entries.sort((a, b) => {
+    // Ordenar por order primeiro, depois por createdAt
+    if (a.order !== b.order) {
+      return (a.order || 0) - (b.order || 0);
+    }
+    return (a.createdAt || 0) - (b.createdAt || 0);
+  });
+
+// --- Índice de busca do FAQ ---
+// searchFAQ baixava a coleção inteira do Firestore a cada consulta. Agora as entradas ativas
+// ficam em um índice invertido em memória, alimentado pelas mudanças da cópia local da coleção.
+const FAQ_SEARCH_LIMIT = 10;
+// Peso de cada campo no score: pergunta > tags > resposta (mesma ordem da busca antiga)
+const FAQ_FIELD_WEIGHTS: Record<string, number> = { question: 3, tags: 2, answer: 1 };
+const FAQ_PREFIX_WEIGHT = 0.5; // termos que só completam a última palavra digitada
+const FAQ_PHRASE_BONUS = 5;    // consulta inteira contida na pergunta
+
+const faqIndex = createSearchIndex<FAQEntry>(entry => ({
+  question: entry.question || '',
+  tags: (entry.tags || []).join(' '),
+  answer: entry.answer || '',
+}));
+
+faqCache.subscribe(changes => {
+  changes.forEach(({ type, id, item }) => {
+    if (type === 'removed' || !item || item.active === false) {
+      faqIndex.remove(id);
+    } else {
+      faqIndex.add(id, item);
+    }
+  });
+});
+
+// --- Contadores de views/útil ---
+// Cada busca no FAQArea contava uma view por resultado com um updateDoc separado, e FAQs
+// populares esbarravam no limite de escritas por documento. Agora os eventos ficam em um
+// buffer local e são gravados juntos em um writeBatch a cada FAQ_COUNTER_FLUSH_MS (ou quando
+// a página é escondida/fechada), cada FAQ em um shard aleatório de faq/{id}/faqCounterShards.
+// O total exibido ao admin é o campo legado do documento + a soma dos shards.
+const FAQ_COUNTER_SHARDS = 10;
+const FAQ_COUNTER_FLUSH_MS = 15 * 1000;
+const FAQ_COUNTER_TOTALS_TTL_MS = 60 * 1000;
+const FIRESTORE_BATCH_LIMIT = 500;
+
+type FAQCounters = { views: number; helpful: number };
+
+// Teto por escrita em um shard, igual ao das regras do Firestore (faqCounterShards).
+// Um único visitante não passa disso em um ciclo; o excedente é descartado.
+const FAQ_COUNTER_MAX_DELTA: FAQCounters = { views: 100, helpful: 20 };
+
+const pendingCounters = new Map<string, FAQCounters>();
+let counterFlushTimer: ReturnType<typeof setTimeout> | null = null;
+let counterTotalsCache: { loadedAt: number; totals: Record<string, FAQCounters> } | null = null;
+
+const bufferCounter = (id: string, field: keyof FAQCounters, amount = 1) => {
+  const counters = pendingCounters.get(id) || { views: 0, helpful: 0 };
+  counters[field] += amount;
+  pendingCounters.set(id, counters);
+  if (!counterFlushTimer) {
+    counterFlushTimer = setTimeout(() => {
+      flushFAQCounters();
+    }, FAQ_COUNTER_FLUSH_MS);
+  }
+};
+
+const flushFAQCounters = async (): Promise<void> => {
+  if (counterFlushTimer) {
+    clearTimeout(counterFlushTimer);
+    counterFlushTimer = null;
+  }
+  if (pendingCounters.size === 0) return;
+
+  const pending = Array.from(pendingCounters.entries());
+  pendingCounters.clear();
+
+  for (let start = 0; start < pending.length; start += FIRESTORE_BATCH_LIMIT) {
+    const chunk = pending.slice(start, start + FIRESTORE_BATCH_LIMIT);
+    const batch = writeBatch(db);
+    chunk.forEach(([id, { views, helpful }]) => {
+      const shard = String(Math.floor(Math.random() * FAQ_COUNTER_SHARDS));
+      const update: Record<string, any> = {};
+      if (views) update.views = increment(Math.min(views, FAQ_COUNTER_MAX_DELTA.views));
+      if (helpful) update.helpful = increment(Math.min(helpful, FAQ_COUNTER_MAX_DELTA.helpful));
+      batch.set(doc(db, 'faq', id, 'faqCounterShards', shard), update, { merge: true });
+    });
+
+    try {
+      await batch.commit();
+    } catch (error) {
+      console.error('[faqCounters] Erro ao gravar contadores, tentando no próximo ciclo:', error);
+      chunk.forEach(([id, counters]) => {
+        bufferCounter(id, 'views', counters.views);
+        bufferCounter(id, 'helpful', counters.helpful);
+      });
+    }
+  }
+};
+
+if (typeof window !== 'undefined') {
+  // Gravar o que estiver no buffer antes de a aba ser escondida ou fechada
+  window.addEventListener('pagehide', () => {
+    flushFAQCounters();
+  });
+  document.addEventListener('visibilitychange', () => {
+    if (document.visibilityState === 'hidden') flushFAQCounters();
+  });
+}
+
+// Soma, por termo da consulta, idf × peso do campo × (1 + log tf); entradas que cobrem
+// mais termos da consulta ficam à frente.
+const scoreFAQQuery = (queryText: string): FAQEntry[] => {
+  const queryTerms = Array.from(new Set(tokenize(queryText)));
+  if (queryTerms.length === 0) return [];
+
+  // A última palavra pode estar incompleta ("rastr" -> "rastreio"): incluir os termos que a completam
+  const weightedTerms = new Map<string, number>(queryTerms.map(term => [term, 1]));
+  if (!/\s$/.test(queryText)) {
+    const lastWord = foldText(queryText).split(/[^a-z0-9]+/).filter(Boolean).pop() || '';
+    if (lastWord.length >= 3) {
+      faqIndex.expandPrefix(stemWord(lastWord)).forEach(term => {
+        if (!weightedTerms.has(term)) weightedTerms.set(term, FAQ_PREFIX_WEIGHT);
+      });
+    }
+  }
+
+  const totalDocs = faqIndex.size();
+  const scores = new Map<string, { score: number; matched: number }>();
+  weightedTerms.forEach((termWeight, term) => {
+    const postings = faqIndex.postings(term);
+    if (postings.size === 0) return;
+    const idf = Math.log(1 + totalDocs / postings.size);
+    postings.forEach((frequencies, id) => {
+      let termScore = 0;
+      Object.entries(frequencies).forEach(([field, tf]) => {
+        termScore += (FAQ_FIELD_WEIGHTS[field] || 1) * (1 + Math.log(tf));
+      });
+      const current = scores.get(id) || { score: 0, matched: 0 };
+      current.score += termWeight * idf * termScore;
+      if (termWeight === 1) current.matched++;
+      scores.set(id, current);
+    });
+  });
+
+  const foldedQuery = foldText(queryText).trim();
+  const scored: Array<{ item: FAQEntry; score: number }> = [];
+  scores.forEach(({ score, matched }, id) => {
+    const entry = faqIndex.get(id);
+    if (!entry) return;
+    let total = score * (0.5 + 0.5 * (matched / queryTerms.length));
+    if (foldedQuery.length > 3 && foldText(entry.question).includes(foldedQuery)) total += FAQ_PHRASE_BONUS;
+    scored.push({ item: entry, score: total });
+  });
+
+  return topScored(scored, FAQ_SEARCH_LIMIT).map(result => result.item);
+};
+
 export const faqService = {
   getFAQEntries: async (category?: FAQCategory): Promise<FAQEntry[]> => {
     try {
-      // Buscar todos os documentos e filtrar/ordenar em memória para evitar necessidade de índice composto
-      let q;
-      if (category) {
-        // Se tem categoria, filtrar por categoria e ordenar
-        q = query(
-          faqCollection,
-          where('category', '==', category),
-          orderBy('order', 'asc')
-        );
-      } else {
-        // Sem categoria, apenas ordenar
-        q = query(
-          faqCollection,
-          orderBy('order', 'asc')
-        );
-      }
-      
-      const snapshot = await getDocs(q);
-      const allEntries = snapshot.docs.map(faqFromFirestore);
-      
-      // Filtrar por active em memória e garantir ordenação correta
-      return allEntries
-        .filter(entry => entry.active !== false) // Incluir apenas ativos (default true se não definido)
-        .sort((a, b) => {
-          // Ordenar por order primeiro, depois por createdAt
-          if (a.order !== b.order) {
-            return (a.order || 0) - (b.order || 0);
-          }
-          return (a.createdAt || 0) - (b.createdAt || 0);
-        });
+      // Servido da cópia local: filtrar por categoria/ativo e ordenar em memória
+      await faqCache.ready();
+      return sortFAQEntries(
+        faqCache.getAll()
+          .filter(entry => entry.active !== false) // Incluir apenas ativos (default true se não definido)
+          .filter(entry => !category || entry.category === category)
+      );
     } catch (error) {
       console.error('Error fetching FAQ entries:', error);
-      // Fallback: buscar todos sem filtros e ordenar em memória
-      try {
-        const snapshot = await getDocs(faqCollection);
-        const allEntries = snapshot.docs.map(faqFromFirestore);
-        return allEntries
-          .filter(entry => entry.active !== false)
-          .filter(entry => !category || entry.category === category)
-          .sort((a, b) => {
-            if (a.order !== b.order) {
-              return (a.order || 0) - (b.order || 0);
-            }
-            return (a.createdAt || 0) - (b.createdAt || 0);
-          });
-      } catch (fallbackError) {
-        console.error('Error in fallback fetch:', fallbackError);
-        return [];
-      }
+      return [];
     }
   },
 
   getFAQEntry: async (id: string): Promise<FAQEntry | null> => {
     try {
+      const cached = faqCache.get(id);
+      if (cached) return cached;
+
       const docRef = doc(db, 'faq', id);
       const docSnap = await getDoc(docRef);
       
@@ -153,81 +278,73 @@ export const faqService = {
 
   searchFAQ: async (queryText: string): Promise<FAQEntry[]> => {
     try {
-      const allEntries = await faqService.getFAQEntries();
-      const lowerQuery = queryText.toLowerCase();
-      const queryWords = lowerQuery.split(' ').filter(w => w.length > 2);
-
-      return allEntries
-        .map(entry => {
-          let score = 0;
-          const questionLower = entry.question.toLowerCase();
-          const answerLower = entry.answer.toLowerCase();
-          const tagsLower = entry.tags.join(' ').toLowerCase();
-
-          // Match exato na pergunta
-          if (questionLower.includes(lowerQuery)) score += 10;
-          
-          // Match exato na resposta
-          if (answerLower.includes(lowerQuery)) score += 5;
-
-          // Match em tags
-          if (tagsLower.includes(lowerQuery)) score += 8;
-
-          // Match de palavras individuais
-          queryWords.forEach(word => {
-            if (questionLower.includes(word)) score += 3;
-            if (answerLower.includes(word)) score += 1;
-            if (tagsLower.includes(word)) score += 2;
-          });
-
-          return { entry, score };
-        })
-        .filter(item => item.score > 0)
-        .sort((a, b) => b.score - a.score)
-        .map(item => item.entry)
-        .slice(0, 10); // Limitar a 10 resultados
+      await faqCache.ready();
+      return scoreFAQQuery(queryText);
     } catch (error) {
       console.error('Error searching FAQ:', error);
       return [];
     }
   },
 
+  // Views e "útil" vão para o buffer de contadores; a gravação no Firestore é em lote
   incrementFAQViews: async (id: string): Promise<void> => {
-    try {
-      const docRef = doc(db, 'faq', id);
-      await updateDoc(docRef, {
-        views: increment(1),
-      });
-    } catch (error) {
-      console.error('Error incrementing FAQ views:', error);
-      // Não lançar erro, é uma operação não crítica
-    }
+    bufferCounter(id, 'views');
   },
 
   markFAQHelpful: async (id: string): Promise<void> => {
+    bufferCounter(id, 'helpful');
+  },
+
+  flushFAQCounters,
+
+  // Totais agregados por FAQ (campo legado + shards + eventos ainda no buffer), para o admin
+  getFAQCounterTotals: async (): Promise<Record<string, FAQCounters>> => {
     try {
-      const docRef = doc(db, 'faq', id);
-      await updateDoc(docRef, {
-        helpful: increment(1),
-      });
+      if (!counterTotalsCache || Date.now() - counterTotalsCache.loadedAt > FAQ_COUNTER_TOTALS_TTL_MS) {
+        const snapshot = await getDocs(collectionGroup(db, 'faqCounterShards'));
+        const totals: Record<string, FAQCounters> = {};
+        snapshot.docs.forEach(shard => {
+          const faqId = shard.ref.parent.parent?.id;
+          if (!faqId) return;
+          const data = shard.data();
+          const current = totals[faqId] || { views: 0, helpful: 0 };
+          current.views += data.views || 0;
+          current.helpful += data.helpful || 0;
+          totals[faqId] = current;
+        });
+        counterTotalsCache = { loadedAt: Date.now(), totals };
+      }
     } catch (error) {
-      console.error('Error marking FAQ as helpful:', error);
-      // Não lançar erro, é uma operação não crítica
+      console.error('Error loading FAQ counter shards:', error);
     }
+
+    const result: Record<string, FAQCounters> = {};
+    faqCache.getAll().forEach(entry => {
+      if (!entry.id) return;
+      const shards = counterTotalsCache?.totals[entry.id];
+      const pending = pendingCounters.get(entry.id);
+      result[entry.id] = {
+        views: (entry.views || 0) + (shards?.views || 0) + (pending?.views || 0),
+        helpful: (entry.helpful || 0) + (shards?.helpful || 0) + (pending?.helpful || 0),
+      };
+    });
+    return result;
   },
 
   // Método para obter todas as entradas (incluindo inativas) - útil para admin
   getAllFAQEntries: async (): Promise<FAQEntry[]> => {
     try {
-      const q = query(faqCollection, orderBy('order', 'asc'));
-      const snapshot = await getDocs(q);
-      return snapshot.docs.map(faqFromFirestore);
+      await faqCache.ready();
+      return faqCache.getAll().sort((a, b) => (a.order || 0) - (b.order || 0));
     } catch (error) {
       console.error('Error fetching all FAQ entries:', error);
       return [];
     }
   },
 
+  // Avisa quando o FAQ muda (nesta ou em outra sessão); retorna a função para cancelar
+  subscribeToFAQ: (onChange: () => void): (() => void) => faqCache.subscribe(() => onChange()),
+
   // Método para reordenar FAQ entries
   reorderFAQEntries: async (entries: Array<{ id: string; order: number }>): Promise<void> => {
     try {
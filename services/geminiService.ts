@@ -1,7 +1,10 @@
-import { GoogleGenAI, Type, FunctionDeclaration } from "@google/genai";
-import { Message, MessageSender } from "../types";
+import { GoogleGenAI, Type, FunctionDeclaration, FunctionCall, GenerateContentResponse } from "@google/genai";
+import { Message, MessageSender, FAQEntry } from "../types";
 import { faqService } from "./faqService";
 import { knowledgeBaseService } from "./knowledgeBaseService";
+import { supportService } from "./supportService";
+import { ToolRunResult } from "./toolScheduler";
+import { queryFingerprint, querySimilarity, QueryFingerprint } from "./textSearch";
 
 // Vite usa import.meta.env para variáveis de ambiente no frontend
 // No Cloud Run, a variável deve ter prefixo VITE_ e ser definida como variável de ambiente
@@ -361,26 +364,184 @@ Quando o cliente precisar abrir um chamado, identifique o tipo mais apropriado:
 - Para urgências: EMPATIA + INFORMAÇÕES DE RASTREIO + OFERTA DE CHAMADO`;
 
 
-export const getGeminiResponse = async (history: Message[], userMessage: string) => {
+const CHAT_MODEL = "gemini-2.5-flash";
+
+// --- Contexto limitado da conversa ---
+// Em vez de mandar o histórico inteiro a cada turno, só as últimas mensagens vão literais;
+// as anteriores entram num resumo acumulado (refeito em segundo plano pelo Gemini) e os
+// fatos-chave (email, pedidos citados) ficam fixos. O prompt por turno fica estável, por
+// mais longa que seja a conversa.
+const CONTEXT_RECENT_MESSAGES = 8;
+const CONTEXT_TOKEN_BUDGET = 1500; // mensagens recentes + resumo + fatos (fora o systemInstruction)
+const CONTEXT_MIN_RECENT_MESSAGES = 2;
+const SUMMARY_MAX_CHARS = 1200;
+const SUMMARY_LINE_MAX_CHARS = 160;
+const SUMMARY_REFRESH_MIN_MESSAGES = 4; // resume em lotes, não a cada turno
+
+// Estimativa grosseira (~4 caracteres por token em português)
+const estimateTokens = (text: string) => Math.ceil(text.length / 4);
+
+export interface ConversationFacts {
+    customerName?: string;
+    customerEmail?: string;
+    orderNumbers?: string[];
+}
+
+// Estado do contexto de uma conversa (um por instância do Chatbot)
+export interface ConversationContext {
+    summary: string;          // resumo das mensagens que saíram da janela
+    summarizedCount: number;  // quantas mensagens (sem as de sistema) o resumo já cobre
+    pinnedOrders: Set<string>;
+    refreshing: Promise<void> | null;
+    pendingToolResults: ToolRunResult[]; // resultado das ferramentas do turno anterior, enviado uma vez
+}
+
+export const createConversationContext = (): ConversationContext => ({
+    summary: '',
+    summarizedCount: 0,
+    pinnedOrders: new Set(),
+    refreshing: null,
+    pendingToolResults: [],
+});
+
+// Guarda o resultado das function calls de um turno para o Gemini ver tudo de uma vez no próximo
+// (o conteúdo já aparece no chat; aqui vai o que o histórico não mostra: falhas, timeouts, duração)
+export const recordToolResults = (context: ConversationContext, results: ToolRunResult[]) => {
+    context.pendingToolResults = results;
+};
+
+const truncateText = (text: string, maxLength: number) =>
+    text.length <= maxLength ? text : `${text.slice(0, maxLength - 1).trimEnd()}…`;
+
+const summaryLine = (m: Message) =>
+    `${m.sender === MessageSender.USER ? 'Cliente' : 'Assistente'}: ${truncateText(m.text.replace(/\s+/g, ' ').trim(), SUMMARY_LINE_MAX_CHARS)}`;
+
+// Resumo extrativo (uma linha curta por mensagem), mantendo o final se passar do limite
+const extractiveSummary = (previous: string, messages: Message[]) => {
+    const combined = [previous, ...messages.map(summaryLine)].filter(Boolean).join('\n');
+    return combined.length <= SUMMARY_MAX_CHARS ? combined : `…${combined.slice(combined.length - SUMMARY_MAX_CHARS + 1)}`;
+};
+
+// Atualiza o resumo com as mensagens que saíram da janela, sem bloquear o turno atual
+const refreshConversationSummary = (context: ConversationContext, older: Message[]) => {
+    if (context.refreshing || older.length - context.summarizedCount < SUMMARY_REFRESH_MIN_MESSAGES) return;
+    const newMessages = older.slice(context.summarizedCount);
+    const targetCount = older.length;
+
+    context.refreshing = (async () => {
+        let summary = '';
+        if (ai) {
+            try {
+                const response = await ai.models.generateContent({
+                    model: CHAT_MODEL,
+                    contents: `Atualize o resumo de um atendimento de suporte ao cliente. Mantenha pedidos, emails, problemas relatados, o que já foi verificado ou prometido e o que ainda está pendente. No máximo 6 frases, em português.
+
+Resumo atual:
+${context.summary || '(vazio)'}
+
+Novas mensagens:
+${newMessages.map(summaryLine).join('\n')}
+
+Resumo atualizado:`,
+                });
+                summary = (response.text || '').trim();
+            } catch (error) {
+                console.warn('[refreshConversationSummary] Falha ao resumir, usando resumo extrativo:', error);
+            }
+        }
+        context.summary = truncateText(summary || extractiveSummary(context.summary, newMessages), SUMMARY_MAX_CHARS);
+        context.summarizedCount = targetCount;
+    })().finally(() => {
+        context.refreshing = null;
+    });
+};
+
+const buildChatContents = (
+    history: Message[],
+    userMessage: string,
+    context?: ConversationContext,
+    facts?: ConversationFacts
+) => {
+    const dialog = history.filter(m => m.sender !== MessageSender.SYSTEM); // Exclude system messages from history for Gemini
+    const toContent = (m: Message) => ({
+        role: m.sender === MessageSender.USER ? 'user' : 'model',
+        parts: [{ text: m.text }],
+    });
+
+    if (!context) {
+        return {
+            contents: [...dialog.map(toContent), { role: 'user', parts: [{ text: userMessage }] }],
+            systemInstruction,
+        };
+    }
+
+    // Janela recente: as últimas mensagens, encolhida até caber no orçamento
+    let recentStart = Math.max(0, dialog.length - CONTEXT_RECENT_MESSAGES);
+    const recentTokens = () => dialog.slice(recentStart).reduce((total, m) => total + estimateTokens(m.text), estimateTokens(userMessage));
+    while (dialog.length - recentStart > CONTEXT_MIN_RECENT_MESSAGES && recentTokens() > CONTEXT_TOKEN_BUDGET * 0.6) {
+        recentStart++;
+    }
+    // A janela começa sempre numa mensagem do cliente
+    while (recentStart < dialog.length - 1 && dialog[recentStart].sender !== MessageSender.USER) {
+        recentStart++;
+    }
+    const older = dialog.slice(0, recentStart);
+    const recent = dialog.slice(recentStart);
+
+    // Fatos fixos: pedidos citados em qualquer ponto da conversa (inclusive nas mensagens já resumidas)
+    (facts?.orderNumbers || []).forEach(order => context.pinnedOrders.add(order));
+    older.slice(context.summarizedCount).forEach(m => {
+        supportService.extractOrderNumbers(m.text).forEach(order => context.pinnedOrders.add(order));
+    });
+
+    // Enquanto o resumo do Gemini não fica pronto, as mensagens ainda não cobertas entram de forma extrativa
+    const summary = older.length > context.summarizedCount
+        ? extractiveSummary(context.summary, older.slice(context.summarizedCount))
+        : context.summary;
+    refreshConversationSummary(context, older);
+
+    const pinned: string[] = [];
+    if (facts?.customerName) pinned.push(`Nome do cliente: ${facts.customerName}`);
+    if (facts?.customerEmail) pinned.push(`Email do cliente: ${facts.customerEmail}`);
+    if (context.pinnedOrders.size > 0) pinned.push(`Pedidos mencionados: ${Array.from(context.pinnedOrders).slice(-10).join(', ')}`);
+
+    let contextBlock = '';
+    if (pinned.length > 0) contextBlock += `\n\nDADOS FIXOS DA CONVERSA:\n${pinned.join('\n')}`;
+    if (summary) contextBlock += `\n\nRESUMO DAS MENSAGENS ANTERIORES (${older.length} mensagens):\n${summary}`;
+    if (context.pendingToolResults.length > 0) {
+        const lines = context.pendingToolResults.map(r =>
+            `- ${r.name}(${JSON.stringify(r.args)}): ${r.status === 'ok' ? 'concluída' : r.status === 'timeout' ? 'sem resposta a tempo' : `erro (${r.error || 'desconhecido'})`} em ${r.durationMs}ms`
+        );
+        contextBlock += `\n\nFUNÇÕES EXECUTADAS NO TURNO ANTERIOR:\n${lines.join('\n')}`;
+        context.pendingToolResults = [];
+    }
+
+    return {
+        contents: [...recent.map(toContent), { role: 'user', parts: [{ text: userMessage }] }],
+        systemInstruction: systemInstruction + contextBlock,
+    };
+};
+
+export const getGeminiResponse = async (
+    history: Message[],
+    userMessage: string,
+    context?: ConversationContext,
+    facts?: ConversationFacts
+) => {
     // Verificar se a API está disponível
     if (!ai) {
         console.error("Gemini API não está disponível. Verifique se VITE_GEMINI_API_KEY está configurada.");
         return null;
     }
 
-    const chatHistory = history
-      .filter(m => m.sender !== MessageSender.SYSTEM) // Exclude system messages from history for Gemini
-      .map(m => ({
-        role: m.sender === MessageSender.USER ? 'user' : 'model',
-        parts: [{ text: m.text }],
-      }));
+    const request = buildChatContents(history, userMessage, context, facts);
 
     try {
         const response = await ai.models.generateContent({
-            model: "gemini-2.5-flash",
-            contents: [...chatHistory, { role: 'user', parts: [{ text: userMessage }] }],
+            model: CHAT_MODEL,
+            contents: request.contents,
             config: {
-              systemInstruction,
+              systemInstruction: request.systemInstruction,
               tools: [{ functionDeclarations: tools }],
             },
         });
@@ -393,99 +554,334 @@ export const getGeminiResponse = async (history: Message[], userMessage: string)
     }
 };
 
-export const searchIntelligentFAQ = async (query: string): Promise<{
-  answer: string;
-  sources: Array<{ question: string; answer: string; category: string }>;
-  suggestedQuestions?: string[];
-}> => {
+// --- Chat em streaming ---
+// O Chatbot mostra o texto conforme ele chega e começa a executar cada function call
+// (trackOrder, searchFAQ, openSupportTicket...) assim que ela aparece no stream.
+export interface GeminiStreamHandlers {
+    onText?: (textSoFar: string) => void;
+    onFunctionCall?: (call: FunctionCall) => void;
+}
+
+export interface GeminiTurnResult {
+    text: string;
+    functionCalls: FunctionCall[];
+    ttftMs: number | null; // tempo até o primeiro texto ou function call
+    totalMs: number;
+}
+
+const LATENCY_SAMPLE_LIMIT = 50;
+const chatLatencySamples: Array<{ ttftMs: number | null; totalMs: number; promptTokens: number; at: number }> = [];
+
+const percentile = (values: number[], p: number): number | null => {
+    if (values.length === 0) return null;
+    const sorted = [...values].sort((a, b) => a - b);
+    return Math.round(sorted[Math.min(sorted.length - 1, Math.floor(p * sorted.length))]);
+};
+
+// Latência dos últimos turnos do chat (ms)
+export const getChatLatencyStats = () => {
+    const ttfts = chatLatencySamples.map(s => s.ttftMs).filter((v): v is number => v !== null);
+    const totals = chatLatencySamples.map(s => s.totalMs);
+    return {
+        turns: chatLatencySamples.length,
+        ttftP50: percentile(ttfts, 0.5),
+        ttftP95: percentile(ttfts, 0.95),
+        totalP50: percentile(totals, 0.5),
+        totalP95: percentile(totals, 0.95),
+        promptTokensP50: percentile(chatLatencySamples.map(s => s.promptTokens), 0.5),
+        last: chatLatencySamples[chatLatencySamples.length - 1] || null,
+    };
+};
+
+// Só as partes de texto do chunk (o getter .text avisa no console quando há function calls)
+const chunkText = (chunk: GenerateContentResponse): string =>
+    (chunk.candidates?.[0]?.content?.parts || [])
+        .filter(part => typeof part.text === 'string' && !part.thought)
+        .map(part => part.text)
+        .join('');
+
+export const streamGeminiResponse = async (
+    history: Message[],
+    userMessage: string,
+    handlers: GeminiStreamHandlers = {},
+    context?: ConversationContext,
+    facts?: ConversationFacts
+): Promise<GeminiTurnResult | null> => {
+    if (!ai) {
+        console.error("Gemini API não está disponível. Verifique se VITE_GEMINI_API_KEY está configurada.");
+        return null;
+    }
+
+    const startedAt = performance.now();
+    let ttftMs: number | null = null;
+    let text = '';
+    const functionCalls: FunctionCall[] = [];
+    const request = buildChatContents(history, userMessage, context, facts);
+    const promptTokens = estimateTokens(request.systemInstruction)
+        + request.contents.reduce((total, c) => total + estimateTokens(c.parts[0].text), 0);
+
     try {
-        // 1. Buscar no FAQ
-        const faqResults = await faqService.searchFAQ(query);
-        
-        // 2. Buscar na base de conhecimento
-        const kbResult = await knowledgeBaseService.searchKnowledgeBase(query, false);
-        
-        // 3. Preparar contexto para Gemini
-        const faqContext = faqResults.length > 0
-            ? faqResults.map(e => `P: ${e.question}\nR: ${e.answer}`).join('\n\n')
-            : 'Nenhuma entrada relevante encontrada no FAQ.';
-        
-        const kbContext = kbResult.answer || 'Nenhuma informação relevante na base de conhecimento.';
-        
-        // 4. Usar Gemini para sintetizar resposta
-        if (!ai) {
-            // Fallback: retornar primeira resposta do FAQ se disponível
-            if (faqResults.length > 0) {
-                return {
-                    answer: faqResults[0].answer,
-                    sources: faqResults.map(e => ({
-                        question: e.question,
-                        answer: e.answer,
-                        category: e.category,
-                    })),
-                };
+        const stream = await ai.models.generateContentStream({
+            model: CHAT_MODEL,
+            contents: request.contents,
+            config: {
+              systemInstruction: request.systemInstruction,
+              tools: [{ functionDeclarations: tools }],
+            },
+        });
+
+        for await (const chunk of stream) {
+            const textPart = chunkText(chunk);
+            const calls = chunk.functionCalls || [];
+            if (ttftMs === null && (textPart || calls.length > 0)) {
+                ttftMs = performance.now() - startedAt;
             }
-            return {
-                answer: 'Não encontrei informações específicas. Por favor, entre em contato com nosso suporte.',
-                sources: [],
-            };
+            if (textPart) {
+                text += textPart;
+                handlers.onText?.(text);
+            }
+            calls.forEach(call => {
+                functionCalls.push(call);
+                handlers.onFunctionCall?.(call);
+            });
         }
+    } catch (error) {
+        console.error("Error streaming Gemini API:", error);
+        // Nada chegou: o Chatbot mostra a mensagem de erro. Se algo chegou, fica a resposta parcial.
+        if (ttftMs === null) return null;
+    }
 
-        const prompt = `Você é um assistente de suporte da Lojinha Prio by Yoobe.
+    const totalMs = performance.now() - startedAt;
+    chatLatencySamples.push({ ttftMs, totalMs, promptTokens, at: Date.now() });
+    if (chatLatencySamples.length > LATENCY_SAMPLE_LIMIT) chatLatencySamples.shift();
+    console.log(`[streamGeminiResponse] TTFT: ${ttftMs !== null ? Math.round(ttftMs) : '-'}ms, total: ${Math.round(totalMs)}ms, prompt: ~${promptTokens} tokens`);
 
-Contexto do FAQ:
-${faqContext}
+    return { text, functionCalls, ttftMs, totalMs };
+};
 
-Contexto da Base de Conhecimento:
-${kbContext}
+// --- Busca inteligente (FAQ + base de conhecimento) ---
+// Pipeline próprio, separado do chat: as duas buscas locais rodam em paralelo e uma única
+// chamada leve ao Gemini (sem o systemInstruction do chat, sem tools, sem "thinking") devolve
+// resposta e perguntas sugeridas num JSON com schema.
+const SEARCH_FAQ_CONTEXT_LIMIT = 5;
+
+const searchAnswerSchema = {
+    type: Type.OBJECT,
+    properties: {
+        answer: {
+            type: Type.STRING,
+            description: "Resposta clara e amigável à pergunta, em português do Brasil, usando só o contexto fornecido.",
+        },
+        suggestedQuestions: {
+            type: Type.ARRAY,
+            description: "Até 3 perguntas relacionadas que o cliente pode ter em seguida.",
+            items: { type: Type.STRING },
+        },
+    },
+    required: ["answer", "suggestedQuestions"],
+};
 
-Pergunta do usuário: ${query}
+const searchAnswerInstruction = `Você é o assistente de suporte da Lojinha Prio by Yoobe e responde dúvidas a partir do FAQ e da base de conhecimento.
+- Use apenas as informações do contexto; se não forem suficientes, diga isso com honestidade e sugira abrir um chamado.
+- Seja conciso mas completo.
+- Sugira no máximo 3 perguntas relacionadas, diferentes da pergunta original.`;
+
+export interface SearchAnswer {
+    answer: string | null;
+    suggestedQuestions: string[];
+    faqResults: FAQEntry[];
+    knowledgeAnswer: string;
+    source: 'gemini' | 'faq' | 'none';
+}
 
-Sua tarefa:
-1. Responda a pergunta do usuário de forma clara, amigável e útil
-2. Use as informações do FAQ e base de conhecimento quando relevante
-3. Se não houver informação suficiente, seja honesto e sugira abrir um chamado
-4. Seja conciso mas completo
-5. Responda em português brasileiro
+const faqOnlyAnswer = (query: string, faqResults: FAQEntry[], knowledgeAnswer: string): SearchAnswer => ({
+    answer: faqResults.length > 0 ? faqResults[0].answer : null,
+    suggestedQuestions: faqResults
+        .slice(1, 4)
+        .map(e => e.question)
+        .filter(q => q.toLowerCase() !== query.toLowerCase()),
+    faqResults,
+    knowledgeAnswer,
+    source: faqResults.length > 0 ? 'faq' : 'none',
+});
+
+// 'always': sempre sintetiza com o Gemini; 'whenNeeded': perguntas curtas já respondidas pelo FAQ dispensam o Gemini
+export type SearchAnswerMode = 'always' | 'whenNeeded';
+
+const runSearchAnswer = async (query: string, mode: SearchAnswerMode): Promise<SearchAnswer> => {
+    const [faqResults, kbResult] = await Promise.all([
+        faqService.searchFAQ(query),
+        knowledgeBaseService.searchKnowledgeBase(query, false),
+    ]);
+    const knowledgeAnswer = kbResult.answer || '';
+
+    const useGemini = mode === 'always' || faqResults.length === 0 || query.length > 10;
+    if (!ai || !useGemini) {
+        return faqOnlyAnswer(query, faqResults, knowledgeAnswer);
+    }
 
-Resposta:`;
+    const faqContext = faqResults.length > 0
+        ? faqResults.slice(0, SEARCH_FAQ_CONTEXT_LIMIT).map(e => `P: ${e.question}\nR: ${e.answer}`).join('\n\n')
+        : 'Nenhuma entrada relevante encontrada no FAQ.';
+    const kbContext = kbResult.sources.length > 0 ? knowledgeAnswer : 'Nenhuma informação relevante na base de conhecimento.';
+
+    const response = await ai.models.generateContent({
+        model: CHAT_MODEL,
+        contents: `Contexto do FAQ:\n${faqContext}\n\nContexto da Base de Conhecimento:\n${kbContext}\n\nPergunta do usuário: ${query}`,
+        config: {
+            systemInstruction: searchAnswerInstruction,
+            responseMimeType: "application/json",
+            responseSchema: searchAnswerSchema,
+            thinkingConfig: { thinkingBudget: 0 },
+        },
+    });
 
-        const geminiMessages: Message[] = [
-            {
-                id: '1',
-                text: prompt,
-                sender: MessageSender.USER,
-            },
-        ];
+    const parsed = JSON.parse(response.text || '{}') as { answer?: string; suggestedQuestions?: string[] };
+    if (!parsed.answer) {
+        return faqOnlyAnswer(query, faqResults, knowledgeAnswer);
+    }
+    return {
+        answer: parsed.answer.trim(),
+        suggestedQuestions: (parsed.suggestedQuestions || [])
+            .map(q => q.trim())
+            .filter(q => q.length > 0 && q.toLowerCase() !== query.toLowerCase())
+            .slice(0, 3),
+        faqResults,
+        knowledgeAnswer,
+        source: 'gemini',
+    };
+};
 
-        const response = await getGeminiResponse(geminiMessages, query);
-        
-        let answer = '';
-        if (response && response.text) {
-            answer = response.text;
-        } else if (faqResults.length > 0) {
-            answer = faqResults[0].answer;
+// --- Cache de respostas ---
+// Perguntas de clientes se repetem muito ("qual o prazo de troca?", "qual é o prazo pra troca").
+// A chave é a consulta normalizada (sem acentos, stopwords e com stemming) + a versão do conteúdo
+// do FAQ/base de conhecimento; consultas quase iguais casam por similaridade de trigramas.
+// Qualquer mudança no FAQ ou na base gera nova versão e esvazia o cache.
+const ANSWER_CACHE_SIZE = 100;
+const ANSWER_CACHE_TTL_MS = 30 * 60 * 1000;
+const ANSWER_CACHE_MIN_SIMILARITY = 0.8; // coeficiente de Dice entre os trigramas das consultas (querySimilarity)
+
+interface AnswerCacheEntry {
+    mode: SearchAnswerMode;
+    fingerprint: QueryFingerprint;
+    version: number;
+    at: number;
+    generationMs: number; // quanto a resposta levou para ser gerada (economizado a cada acerto)
+    result: SearchAnswer;
+}
+
+const answerCache = new Map<string, AnswerCacheEntry>();
+const answerInFlight = new Map<string, Promise<SearchAnswer>>();
+let contentVersion = 0;
+const answerCacheStats = { lookups: 0, exactHits: 0, nearHits: 0, misses: 0, savedMs: 0, invalidations: 0 };
+
+const invalidateAnswerCache = () => {
+    contentVersion++;
+    answerCacheStats.invalidations++;
+    answerCache.clear();
+};
+faqService.subscribeToFAQ(invalidateAnswerCache);
+knowledgeBaseService.subscribeToKnowledgeBase(invalidateAnswerCache);
+
+const findCachedAnswer = (mode: SearchAnswerMode, fingerprint: QueryFingerprint): { entry: AnswerCacheEntry; exact: boolean } | null => {
+    const now = Date.now();
+    const isFresh = (entry: AnswerCacheEntry) => entry.version === contentVersion && now - entry.at < ANSWER_CACHE_TTL_MS;
+
+    const exact = answerCache.get(`${mode}:${fingerprint.key}`);
+    if (exact && isFresh(exact)) return { entry: exact, exact: true };
+
+    let best: AnswerCacheEntry | null = null;
+    let bestSimilarity = ANSWER_CACHE_MIN_SIMILARITY;
+    for (const entry of answerCache.values()) {
+        if (entry.mode !== mode || !isFresh(entry)) continue;
+        const similarity = querySimilarity(fingerprint, entry.fingerprint);
+        if (similarity >= bestSimilarity) {
+            best = entry;
+            bestSimilarity = similarity;
+        }
+    }
+    return best ? { entry: best, exact: false } : null;
+};
+
+// Resposta + sugestões para uma dúvida, servidas do cache quando a mesma pergunta (ou quase) já foi respondida
+export const getSearchAnswer = async (query: string, mode: SearchAnswerMode = 'always'): Promise<SearchAnswer> => {
+    const fingerprint = queryFingerprint(query);
+    const cacheKey = `${mode}:${fingerprint.key}`;
+    answerCacheStats.lookups++;
+
+    const cached = findCachedAnswer(mode, fingerprint);
+    if (cached) {
+        if (cached.exact) {
+            answerCacheStats.exactHits++;
+            // LRU: reinserir move a consulta para o fim (mais recente)
+            answerCache.delete(cacheKey);
+            answerCache.set(cacheKey, cached.entry);
         } else {
-            answer = 'Não encontrei informações específicas para sua pergunta. Gostaria de abrir um chamado de suporte para que nossa equipe possa ajudá-lo?';
+            answerCacheStats.nearHits++;
         }
+        answerCacheStats.savedMs += cached.entry.generationMs;
+        return cached.entry.result;
+    }
 
-        // Gerar perguntas sugeridas
-        let suggestedQuestions: string[] = [];
-        if (faqResults.length > 0) {
-            suggestedQuestions = faqResults
-                .slice(1, 4)
-                .map(e => e.question)
-                .filter(q => q.toLowerCase() !== query.toLowerCase());
+    // Buscas iguais em paralelo compartilham a mesma chamada
+    // (conta como acerto exato: a pergunta é a mesma e não gera nova chamada ao Gemini)
+    const pending = answerInFlight.get(cacheKey);
+    if (pending) {
+        answerCacheStats.exactHits++;
+        return pending;
+    }
+    answerCacheStats.misses++;
+
+    const version = contentVersion;
+    const startedAt = performance.now();
+    const request = runSearchAnswer(query.trim(), mode);
+    answerInFlight.set(cacheKey, request);
+    try {
+        const result = await request;
+        // Conteúdo mudou durante a geração: a resposta já nasce desatualizada
+        if (version === contentVersion) {
+            answerCache.set(cacheKey, { mode, fingerprint, version, at: Date.now(), generationMs: performance.now() - startedAt, result });
+            if (answerCache.size > ANSWER_CACHE_SIZE) {
+                answerCache.delete(answerCache.keys().next().value as string);
+            }
         }
+        return result;
+    } finally {
+        answerInFlight.delete(cacheKey);
+    }
+};
+
+// Acertos do cache de respostas e latência economizada (nesta sessão do navegador)
+export const getAnswerCacheStats = () => {
+    const hits = answerCacheStats.exactHits + answerCacheStats.nearHits;
+    return {
+        ...answerCacheStats,
+        savedMs: Math.round(answerCacheStats.savedMs),
+        hitRate: answerCacheStats.lookups ? Number((hits / answerCacheStats.lookups).toFixed(3)) : 0,
+        entries: answerCache.size,
+        contentVersion,
+    };
+};
+
+export const searchIntelligentFAQ = async (query: string): Promise<{
+  answer: string;
+  sources: Array<{ question: string; answer: string; category: string }>;
+  suggestedQuestions?: string[];
+}> => {
+    try {
+        const result = await getSearchAnswer(query);
+        const sources = result.faqResults.map(e => ({
+            question: e.question,
+            answer: e.answer,
+            category: e.category,
+        }));
 
         return {
-            answer,
-            sources: faqResults.map(e => ({
-                question: e.question,
-                answer: e.answer,
-                category: e.category,
-            })),
-            suggestedQuestions: suggestedQuestions.length > 0 ? suggestedQuestions : undefined,
+            answer: result.answer || (ai
+                ? 'Não encontrei informações específicas para sua pergunta. Gostaria de abrir um chamado de suporte para que nossa equipe possa ajudá-lo?'
+                : 'Não encontrei informações específicas. Por favor, entre em contato com nosso suporte.'),
+            sources,
+            suggestedQuestions: result.suggestedQuestions.length > 0 ? result.suggestedQuestions : undefined,
         };
     } catch (error) {
         console.error('Error in intelligent FAQ search:', error);
@@ -508,4 +904,4 @@ Resposta:`;
             sources: [],
         };
     }
-};
\ No newline at end of file
+};
@@ -0,0 +1,146 @@
+import { FunctionCall } from '@google/genai';
+import { supportService } from './supportService';
+import { foldText } from './textSearch';
+
+// Roteador de intenções na frente do Gemini.
+// Mensagens com intenção clara ("onde está meu pedido LP-12345", "quero abrir um chamado",
+// "qual o prazo de entrega?") viram direto a mesma function call que o Gemini faria,
+// economizando uma ida e volta ao modelo. Qualquer dúvida (mais de uma intenção, texto longo,
+// nenhuma regra forte) vai para o Gemini como antes.
+
+export type RoutedIntent = 'trackOrder' | 'openSupportTicket' | 'searchFAQ';
+
+export interface RouteDecision {
+  intent: RoutedIntent | 'gemini';
+  call: FunctionCall | null; // function call a executar localmente (null = mandar ao Gemini)
+  confidence: number;
+  reason: string;
+}
+
+const MIN_CONFIDENCE = 0.8;
+const MIN_MARGIN = 0.3;         // diferença mínima para a segunda intenção mais provável
+const MAX_ROUTED_LENGTH = 200;  // textos longos costumam misturar assuntos: Gemini
+
+const EMAIL_PATTERN = /[\w.+-]+@[\w-]+(\.[\w-]+)+/;
+
+// Padrões aplicados ao texto sem acentos e em minúsculas
+const TRACKING_PATTERN = /\b(onde|status|situacao|rastre\w*|rastrear|acompanh\w*|chegou|chega|chegar|entrega\w*|enviad\w*|saiu|cade|andamento)\b/;
+const TICKET_PATTERN = /\b(abrir|abre|registrar|criar)\b.{0,20}\b(chamado|ticket|reclamacao|solicitacao)\b|\b(chamado|ticket)\b.{0,10}\b(novo|abrir)\b/;
+const QUESTION_PATTERN = /\?|^(como|qual|quais|quanto|quando|posso|pode|onde|o que|existe|tem como|voces)\b/;
+const FAQ_TOPIC_PATTERN = /\b(prazo|frete|troca\w*|trocar|devolu\w*|devolver|pagamento|pagar|pix|boleto|cartao|parcel\w*|cupom|cadastro|senha|tamanho|garantia|politica|horario|retirada|retirar)\b/;
+// Referências ao próprio pedido/conta: perguntas assim precisam de dados do cliente, não do FAQ
+const PERSONAL_PATTERN = /\b(meu|minha|meus|minhas|comprei|recebi|paguei|pedi)\b/;
+
+const TICKET_SUBJECTS: Array<[RegExp, string]> = [
+  [/\bcancel\w*/, 'cancelamento'],
+  [/\b(reembols\w*|estorn\w*|dinheiro de volta)\b/, 'reembolso'],
+  [/\b(defeit\w*|quebrad\w*|estragad\w*|danificad\w*)\b/, 'produto_defeituoso'],
+  [/\bnao (recebi|chegou)\b/, 'produto_nao_recebido'],
+  [/\b(errad\w*|trocad\w*|diferente)\b/, 'produto_errado'],
+  [/\b(atras\w*|demor\w*)\b/, 'atraso_entrega'],
+  [/\btroca\w*|\btrocar\b/, 'troca'],
+  [/\b(pagamento|boleto|pix|cobranca|cobrad\w*)\b/, 'duvida_pagamento'],
+];
+
+const routingStats = {
+  total: 0,
+  routed: { trackOrder: 0, openSupportTicket: 0, searchFAQ: 0 } as Record<RoutedIntent, number>,
+  gemini: 0,
+  reasons: {} as Record<string, number>,
+  totalDecisionMs: 0,
+};
+
+const record = (decision: RouteDecision, startedAt: number): RouteDecision => {
+  routingStats.total++;
+  routingStats.totalDecisionMs += performance.now() - startedAt;
+  routingStats.reasons[decision.reason] = (routingStats.reasons[decision.reason] || 0) + 1;
+  if (decision.intent === 'gemini') {
+    routingStats.gemini++;
+  } else {
+    routingStats.routed[decision.intent]++;
+  }
+  return decision;
+};
+
+const toGemini = (reason: string, confidence = 0): RouteDecision => ({ intent: 'gemini', call: null, confidence, reason });
+
+export const routeIntent = (message: string): RouteDecision => {
+  const startedAt = performance.now();
+  const text = foldText(message).trim();
+
+  if (!text) return record(toGemini('vazio'), startedAt);
+  if (text.length > MAX_ROUTED_LENGTH) return record(toGemini('texto_longo'), startedAt);
+
+  const orderNumbers = supportService.extractOrderNumbers(message);
+  const email = message.match(EMAIL_PATTERN)?.[0];
+  const wordCount = text.split(/\s+/).length;
+
+  // Pontuação de cada intenção candidata (0 a 1)
+  const candidates: Array<{ intent: RoutedIntent; confidence: number; call: FunctionCall; reason: string }> = [];
+
+  const asksTicket = TICKET_PATTERN.test(text);
+  if (asksTicket) {
+    const subject = TICKET_SUBJECTS.find(([pattern]) => pattern.test(text))?.[1] || 'outro';
+    candidates.push({
+      intent: 'openSupportTicket',
+      confidence: 0.95,
+      reason: 'pedido_de_chamado',
+      call: { name: 'openSupportTicket', args: { subject, ...(orderNumbers[0] ? { orderNumber: orderNumbers[0] } : {}) } },
+    });
+  }
+
+  if (orderNumbers.length === 1) {
+    // Só o código, ou o código com uma palavra de rastreio: "LP-12345", "status do pedido R123"
+    const onlyCode = wordCount <= 3;
+    const tracking = TRACKING_PATTERN.test(text);
+    if (onlyCode || tracking) {
+      candidates.push({
+        intent: 'trackOrder',
+        confidence: onlyCode || !asksTicket ? 0.9 : 0.6,
+        reason: onlyCode ? 'codigo_de_pedido' : 'rastreio_com_codigo',
+        call: { name: 'trackOrder', args: { orderId: orderNumbers[0], ...(email ? { customerEmail: email } : {}) } },
+      });
+    }
+  } else if (orderNumbers.length > 1) {
+    return record(toGemini('varios_pedidos'), startedAt);
+  } else if (email && (wordCount <= 3 || TRACKING_PATTERN.test(text))) {
+    // Só o email, ou "meus pedidos do email x@y.com": lista os pedidos desse email
+    candidates.push({
+      intent: 'trackOrder',
+      confidence: 0.85,
+      reason: 'email_para_pedidos',
+      call: { name: 'trackOrder', args: { customerEmail: email } },
+    });
+  }
+
+  if (
+    orderNumbers.length === 0 && !email && !asksTicket &&
+    QUESTION_PATTERN.test(text) && FAQ_TOPIC_PATTERN.test(text) && !PERSONAL_PATTERN.test(text)
+  ) {
+    candidates.push({
+      intent: 'searchFAQ',
+      confidence: 0.85,
+      reason: 'pergunta_geral',
+      call: { name: 'searchFAQ', args: { query: message.trim() } },
+    });
+  }
+
+  if (candidates.length === 0) return record(toGemini('sem_intencao_clara'), startedAt);
+
+  candidates.sort((a, b) => b.confidence - a.confidence);
+  const [best, second] = candidates;
+  if (best.confidence < MIN_CONFIDENCE) return record(toGemini('baixa_confianca', best.confidence), startedAt);
+  if (second && best.confidence - second.confidence < MIN_MARGIN) return record(toGemini('ambiguo', best.confidence), startedAt);
+
+  return record({ intent: best.intent, call: best.call, confidence: best.confidence, reason: best.reason }, startedAt);
+};
+
+// Quantas mensagens foram resolvidas localmente e quantas foram para o Gemini (e por quê)
+export const getRoutingStats = () => ({
+  total: routingStats.total,
+  routed: { ...routingStats.routed },
+  gemini: routingStats.gemini,
+  routedRate: routingStats.total ? Number(((routingStats.total - routingStats.gemini) / routingStats.total).toFixed(3)) : 0,
+  reasons: { ...routingStats.reasons },
+  avgDecisionMs: routingStats.total ? Number((routingStats.totalDecisionMs / routingStats.total).toFixed(3)) : 0,
+});
@@ -1,14 +1,10 @@
 import { db } from '../firebase';
 import {
   collection,
-  getDocs,
   getDoc,
   addDoc,
   updateDoc,
   doc,
-  query,
-  where,
-  orderBy,
   serverTimestamp,
   Timestamp,
   deleteDoc,
@@ -16,6 +12,8 @@ import {
 import { KnowledgeBaseEntry } from '../types';
 import { supportService } from './supportService';
 import { Ticket } from '../types';
+import { bm25Search, createSearchIndex, extractSnippet, tokenize } from './textSearch';
+import { createLiveCollection } from './collectionCache';
 
 const knowledgeBaseCollection = collection(db, 'knowledgeBase');
 
@@ -31,37 +29,71 @@ const knowledgeEntryFromFirestore = (docSnapshot: any): KnowledgeBaseEntry => {
   } as KnowledgeBaseEntry;
 };
 
+// Cópia local da coleção knowledgeBase (IndexedDB + onSnapshot): leituras da sessão saem da memória
+const knowledgeCache = createLiveCollection<KnowledgeBaseEntry>('knowledgeBase', knowledgeEntryFromFirestore);
+
+// --- Índice BM25 da base de conhecimento ---
+// Só entradas verificadas são buscáveis. O índice (frequências por campo e tamanhos médios
+// para o BM25) é alimentado pelas mudanças da cópia local da coleção. Resultados de consultas
+// repetidas ficam em cache até a próxima mudança no índice.
+const KB_SEARCH_LIMIT = 5;
+const KB_FIELD_WEIGHTS: Record<string, number> = { title: 3, tags: 2, content: 1 };
+// Resultados abaixo desta fração do melhor score são descartados
+const KB_MIN_RELATIVE_SCORE = 0.25;
+const KB_SNIPPET_LENGTH = 240;
+const KB_QUERY_CACHE_SIZE = 100;
+
+type KnowledgeSearchResult = { answer: string; sources: KnowledgeBaseEntry[] };
+
+const knowledgeIndex = createSearchIndex<KnowledgeBaseEntry>(entry => ({
+  title: entry.title || '',
+  tags: (entry.tags || []).join(' '),
+  content: entry.content || '',
+}));
+const knowledgeQueryCache = new Map<string, KnowledgeSearchResult>();
+
+knowledgeCache.subscribe(changes => {
+  changes.forEach(({ type, id, item }) => {
+    if (type === 'removed' || !item || !item.verified) {
+      knowledgeIndex.remove(id);
+    } else {
+      knowledgeIndex.add(id, item);
+    }
+  });
+  knowledgeQueryCache.clear();
+});
+
+const searchKnowledgeIndex = (queryTerms: string[]): KnowledgeSearchResult => {
+  const ranked = bm25Search(knowledgeIndex, queryTerms, KB_FIELD_WEIGHTS, KB_SEARCH_LIMIT);
+  const relevant = ranked.filter(result => result.score >= ranked[0].score * KB_MIN_RELATIVE_SCORE);
+
+  if (relevant.length === 0) {
+    return {
+      answer: 'Não encontrei informações específicas na base de conhecimento. Posso ajudar de outra forma?',
+      sources: [],
+    };
+  }
+
+  // Trecho do conteúdo em volta dos termos encontrados, em vez dos primeiros 200 caracteres
+  const answer = relevant
+    .map(({ item }, index) => `${index + 1}. ${item.title}\n${extractSnippet(item.content, queryTerms, KB_SNIPPET_LENGTH)}`)
+    .join('\n\n');
+
+  return { answer, sources: relevant.map(result => result.item) };
+};
+
 export const knowledgeBaseService = {
   getKnowledgeBaseEntries: async (filters?: {
     category?: string;
     verified?: boolean;
   }): Promise<KnowledgeBaseEntry[]> => {
     try {
-      let q: any = query(knowledgeBaseCollection, orderBy('createdAt', 'desc'));
-
-      if (filters?.category) {
-        q = query(knowledgeBaseCollection, where('category', '==', filters.category), orderBy('createdAt', 'desc'));
-      }
-
-      if (filters?.verified !== undefined) {
-        if (filters.category) {
-          q = query(
-            knowledgeBaseCollection,
-            where('category', '==', filters.category),
-            where('verified', '==', filters.verified),
-            orderBy('createdAt', 'desc')
-          );
-        } else {
-          q = query(
-            knowledgeBaseCollection,
-            where('verified', '==', filters.verified),
-            orderBy('createdAt', 'desc')
-          );
-        }
-      }
-
-      const snapshot = await getDocs(q);
-      return snapshot.docs.map(knowledgeEntryFromFirestore);
+      // Servido da cópia local: filtros e ordenação (mais recentes primeiro) em memória
+      await knowledgeCache.ready();
+      return knowledgeCache.getAll()
+        .filter(entry => !filters?.category || entry.category === filters.category)
+        .filter(entry => filters?.verified === undefined || entry.verified === filters.verified)
+        .sort((a, b) => (b.createdAt || 0) - (a.createdAt || 0));
     } catch (error) {
       console.error('Error fetching knowledge base entries:', error);
       return [];
@@ -70,6 +102,9 @@ export const knowledgeBaseService = {
 
   getKnowledgeEntry: async (id: string): Promise<KnowledgeBaseEntry | null> => {
     try {
+      const cached = knowledgeCache.get(id);
+      if (cached) return cached;
+
       const docRef = doc(db, 'knowledgeBase', id);
       const docSnap = await getDoc(docRef);
 
@@ -134,59 +169,27 @@ export const knowledgeBaseService = {
     useGemini: boolean = false
   ): Promise<{ answer: string; sources: KnowledgeBaseEntry[] }> => {
     try {
-      const allEntries = await knowledgeBaseService.getKnowledgeBaseEntries({
-        verified: true,
-      });
+      await knowledgeCache.ready();
+
+      const queryTerms = Array.from(new Set(tokenize(queryText)));
+      const cacheKey = [...queryTerms].sort().join(' ');
+      const cached = knowledgeQueryCache.get(cacheKey);
+      if (cached) {
+        // LRU: reinserir move a consulta para o fim (mais recente)
+        knowledgeQueryCache.delete(cacheKey);
+        knowledgeQueryCache.set(cacheKey, cached);
+        return cached;
+      }
 
-      const lowerQuery = queryText.toLowerCase();
-      const queryWords = lowerQuery.split(' ').filter(w => w.length > 2);
-
-      // Busca simples primeiro
-      const matchingEntries = allEntries
-        .map(entry => {
-          let score = 0;
-          const titleLower = entry.title.toLowerCase();
-          const contentLower = entry.content.toLowerCase();
-          const tagsLower = entry.tags.join(' ').toLowerCase();
-
-          if (titleLower.includes(lowerQuery)) score += 10;
-          if (contentLower.includes(lowerQuery)) score += 5;
-          if (tagsLower.includes(lowerQuery)) score += 8;
-
-          queryWords.forEach(word => {
-            if (titleLower.includes(word)) score += 3;
-            if (contentLower.includes(word)) score += 1;
-            if (tagsLower.includes(word)) score += 2;
-          });
-
-          return { entry, score };
-        })
-        .filter(item => item.score > 0)
-        .sort((a, b) => b.score - a.score)
-        .map(item => item.entry)
-        .slice(0, 5);
-
-      if (matchingEntries.length > 0) {
-        // Se encontrou resultados, sintetizar resposta
-        const answer = matchingEntries
-          .map(
-            (entry, index) =>
-              `${index + 1}. ${entry.title}\n${entry.content.substring(0, 200)}...`
-          )
-          .join('\n\n');
-
-        return {
-          answer,
-          sources: matchingEntries,
-        };
+      const result = searchKnowledgeIndex(queryTerms);
+      knowledgeQueryCache.set(cacheKey, result);
+      if (knowledgeQueryCache.size > KB_QUERY_CACHE_SIZE) {
+        knowledgeQueryCache.delete(knowledgeQueryCache.keys().next().value as string);
       }
 
-      // Se não encontrou e useGemini é true, retornar resposta padrão
+      // Se não encontrou e useGemini é true, a resposta padrão é retornada
       // (a integração com Gemini será feita no geminiService)
-      return {
-        answer: 'Não encontrei informações específicas na base de conhecimento. Posso ajudar de outra forma?',
-        sources: [],
-      };
+      return result;
     } catch (error) {
       console.error('Error searching knowledge base:', error);
       return {
@@ -196,6 +199,9 @@ export const knowledgeBaseService = {
     }
   },
 
+  // Avisa quando a base de conhecimento muda (nesta ou em outra sessão); retorna a função para cancelar
+  subscribeToKnowledgeBase: (onChange: () => void): (() => void) => knowledgeCache.subscribe(() => onChange()),
+
   suggestFromTicket: async (ticketId: string): Promise<string | null> => {
     try {
       // Buscar o ticket
@@ -207,9 +213,10 @@ export const knowledgeBaseService = {
       }
 
       // Extrair informações relevantes do ticket
+      const history = await supportService.getTicketHistory(ticket);
       const title = `Solução para: ${ticket.subject}`;
       const content = `Problema: ${ticket.description}\n\nSolução: ${
-        ticket.history
+        history
           .filter(h => h.author === 'admin' && h.type === 'comment')
           .map(h => h.content)
           .join('\n\n') || 'Ticket resolvido.'
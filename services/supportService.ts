@@ -1,22 +1,30 @@
 // Fix: Implement the support service using Firebase.
-import { db } from '../firebase';
+import { db, auth } from '../firebase';
 import {
   collection,
   getDocs,
   getDoc,
-  addDoc,
   updateDoc,
   doc,
   query,
   where,
   serverTimestamp,
   orderBy,
-  arrayUnion,
   Timestamp,
   setDoc,
+  limit,
+  limitToLast,
+  startAfter,
+  endBefore,
+  QueryConstraint,
+  QueryDocumentSnapshot,
+  onSnapshot,
+  writeBatch,
+  increment,
 } from 'firebase/firestore';
-import { Ticket, TicketStatus, KnowledgeBase, ApiConfig, CubboOrder, PickupLocation, TicketSubject, TicketFormConfig } from '../types';
+import { Ticket, TicketStatus, TicketHistoryItem, KnowledgeBase, ApiConfig, CubboOrder, CustomerOrdersPage, PickupLocation, TicketSubject, TicketFormConfig } from '../types';
 import { getTicketFormConfig } from '../data/ticketFormConfigs';
+import { addTicketStatsChange, RESOLVED_STATUSES, TicketStatsChange } from './ticketStatsService';
 
 const ticketsCollection = collection(db, 'tickets');
 const apiConfigsCollection = collection(db, 'apiConfigs');
@@ -446,7 +454,8 @@ const getCubboConfig = async (): Promise<ApiConfig | null> => {
 const getProxyUrl = (): string => {
     // This URL points to your deployed Google Cloud Run service.
     // MAKE SURE THIS URL IS CORRECT
-    return 'https://cubbo-auth-proxy-409489811769.southamerica-east1.run.app';
+    // VITE_CUBBO_PROXY_URL permite apontar para o fake local (testsprite_tests/fake_cubbo_proxy.py)
+    return ((import.meta as any).env?.VITE_CUBBO_PROXY_URL as string) || 'https://cubbo-auth-proxy-409489811769.southamerica-east1.run.app';
 };
 
 const getAccessToken = async (): Promise<string> => {
@@ -512,6 +521,298 @@ const getAccessToken = async (): Promise<string> => {
 };
 
 
+// Paginação da busca de pedidos por cliente (ver GET /orders/stream no cubbo-auth-proxy)
+const CUSTOMER_ORDERS_PER_PAGE = 100;
+const CUSTOMER_ORDERS_MAX_PAGES = 20;
+const CUSTOMER_ORDERS_CONCURRENCY = 4;
+
+// Query da busca por cliente: store_id (obrigatório) + shipping_email ou customer_phone + ordenação
+const buildCustomerOrdersQuery = (storeId: string, user: { email?: string | null; phone?: string | null }): string | null => {
+    const queryParams: string[] = [`store_id=${encodeURIComponent(storeId)}`];
+
+    // Usar shipping_email ao invés de customer_email (conforme documentação da API Cubbo)
+    if (user.email) {
+        queryParams.push(`shipping_email=${encodeURIComponent(user.email)}`);
+    } else if (user.phone) {
+        const sanitizedPhone = user.phone.replace(/\D/g, '');
+        queryParams.push(`customer_phone=${sanitizedPhone}`);
+    } else {
+        return null;
+    }
+
+    queryParams.push(`per_page=${CUSTOMER_ORDERS_PER_PAGE}`);
+    queryParams.push(`sort=desc`);
+    queryParams.push(`sort_by=created_at`);
+    return queryParams.join('&');
+};
+
+// A API Cubbo pode retornar um array diretamente ou um objeto com 'orders', 'data' ou 'results'
+const extractOrdersList = (data: any): any[] => {
+    if (Array.isArray(data)) return data;
+    return data?.orders || data?.data || data?.results || [];
+};
+
+// Uma página de pedidos via GET /api/orders (usado quando o proxy não tem /orders/stream)
+const fetchCustomerOrdersPage = async (proxyUrl: string, customerQuery: string, page: number): Promise<any[]> => {
+    const requestUrl = `${proxyUrl}/api/orders?${customerQuery}&page=${page}`;
+    const response = await fetch(requestUrl, {
+        method: 'GET',
+        headers: { 'Content-Type': 'application/json' },
+        mode: 'cors'
+    });
+
+    if (!response.ok) {
+        const errorText = await response.text();
+        let errorData;
+        try {
+            errorData = JSON.parse(errorText);
+        } catch (e) {
+            errorData = { error: errorText };
+        }
+        console.error(`API Cubbo retornou status ${response.status}:`, errorData);
+        throw new Error(`Falha ao buscar pedidos: ${response.status} - ${errorData.error || errorData.details || errorText}`);
+    }
+
+    return extractOrdersList(await response.json());
+};
+
+// Lê uma resposta NDJSON (um JSON por linha) conforme os bytes chegam
+async function* readNdjsonLines(response: Response): AsyncGenerator<any> {
+    if (!response.body) {
+        const text = await response.text();
+        for (const line of text.split('\n')) {
+            if (line.trim()) yield JSON.parse(line);
+        }
+        return;
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let newlineIndex = buffer.indexOf('\n');
+        while (newlineIndex >= 0) {
+            const line = buffer.slice(0, newlineIndex).trim();
+            buffer = buffer.slice(newlineIndex + 1);
+            if (line) yield JSON.parse(line);
+            newlineIndex = buffer.indexOf('\n');
+        }
+    }
+    buffer += decoder.decode();
+    if (buffer.trim()) yield JSON.parse(buffer);
+}
+
+// --- Paginação de tickets ---
+// Consultas do painel admin: filtros aplicados no Firestore (índices compostos em
+// firestore.indexes.json) e páginas por cursor, em vez de baixar a coleção inteira.
+
+const TICKET_PAGE_SIZE = 25;
+const ACTIVE_TICKET_STATUSES: TicketStatus[] = ['aberto', 'em_andamento', 'resolvido', 'fechado'];
+
+export interface TicketQueryFilters {
+  // 'ativos' = todos menos arquivados; 'todos' = inclusive arquivados
+  status?: TicketStatus | 'ativos' | 'todos';
+  subject?: string;
+  createdFrom?: number; // timestamp (ms), inclusivo
+  createdTo?: number;   // timestamp (ms), inclusivo
+}
+
+// Cursor opaco para a página seguinte/anterior
+export interface TicketPageCursor {
+  direction: 'next' | 'prev';
+  snapshot: QueryDocumentSnapshot;
+}
+
+export interface TicketPage {
+  tickets: Ticket[];
+  nextCursor: TicketPageCursor | null;
+  prevCursor: TicketPageCursor | null;
+}
+
+const ticketFilterConstraints = (filters: TicketQueryFilters): QueryConstraint[] => {
+  const constraints: QueryConstraint[] = [];
+  const status = filters.status || 'ativos';
+  if (status === 'ativos') {
+    constraints.push(where('status', 'in', ACTIVE_TICKET_STATUSES));
+  } else if (status !== 'todos') {
+    constraints.push(where('status', '==', status));
+  }
+  if (filters.subject) {
+    constraints.push(where('subject', '==', filters.subject));
+  }
+  if (filters.createdFrom) {
+    constraints.push(where('createdAt', '>=', Timestamp.fromMillis(filters.createdFrom)));
+  }
+  if (filters.createdTo) {
+    constraints.push(where('createdAt', '<=', Timestamp.fromMillis(filters.createdTo)));
+  }
+  return constraints;
+};
+
+// Consulta de uma página: pageSize + 1 documentos, para saber se há mais uma página na direção do cursor
+const ticketPageQuery = (filters: TicketQueryFilters, cursor: TicketPageCursor | null | undefined, pageSize: number) => {
+  const constraints = [...ticketFilterConstraints(filters), orderBy('createdAt', 'desc')];
+  if (cursor?.direction === 'prev') {
+    constraints.push(endBefore(cursor.snapshot), limitToLast(pageSize + 1));
+  } else {
+    if (cursor) constraints.push(startAfter(cursor.snapshot));
+    constraints.push(limit(pageSize + 1));
+  }
+  return query(ticketsCollection, ...constraints);
+};
+
+const buildTicketPage = (
+  docs: Array<{ ticket: Ticket; snapshot: QueryDocumentSnapshot }>,
+  cursor: TicketPageCursor | null | undefined,
+  pageSize: number
+): TicketPage => {
+  if (cursor?.direction === 'prev') {
+    const hasPrev = docs.length > pageSize;
+    const pageDocs = docs.slice(-pageSize);
+    return {
+      tickets: pageDocs.map(d => d.ticket),
+      nextCursor: pageDocs.length > 0 ? { direction: 'next', snapshot: pageDocs[pageDocs.length - 1].snapshot } : null,
+      prevCursor: hasPrev ? { direction: 'prev', snapshot: pageDocs[0].snapshot } : null,
+    };
+  }
+
+  const hasNext = docs.length > pageSize;
+  const pageDocs = docs.slice(0, pageSize);
+  return {
+    tickets: pageDocs.map(d => d.ticket),
+    nextCursor: hasNext ? { direction: 'next', snapshot: pageDocs[pageDocs.length - 1].snapshot } : null,
+    prevCursor: cursor && pageDocs.length > 0 ? { direction: 'prev', snapshot: pageDocs[0].snapshot } : null,
+  };
+};
+
+// --- Histórico de tickets ---
+// Cada entrada do histórico é um documento em tickets/{id}/history (só inserção). O ticket guarda
+// apenas um resumo (historySummary): último status, status anterior e contadores. Assim o documento
+// do ticket não cresce a cada resposta e as leituras de arquivar/reativar/mudar status ficam leves.
+// Tickets antigos ainda podem ter o array `history` no próprio documento (legado, só leitura).
+
+const TICKET_HISTORY_PAGE_SIZE = 20;
+
+const ticketHistoryCollection = (ticketId: string) => collection(db, 'tickets', ticketId, 'history');
+
+export interface TicketHistoryPage {
+  items: TicketHistoryItem[];              // mais recentes primeiro
+  nextCursor: QueryDocumentSnapshot | null; // entradas mais antigas
+}
+
+// Grava a entrada no histórico e atualiza o ticket (campos + resumo) e as estatísticas
+// numa única escrita em lote
+const writeTicketHistory = async (
+  ticketId: string,
+  item: Omit<TicketHistoryItem, 'id'>,
+  ticketUpdates: Record<string, any> = {},
+  statsChange?: TicketStatsChange
+) => {
+  const batch = writeBatch(db);
+  batch.set(doc(ticketHistoryCollection(ticketId)), item);
+  batch.update(doc(db, 'tickets', ticketId), {
+    ...ticketUpdates,
+    'historySummary.entryCount': increment(1),
+    'historySummary.lastEntryAt': item.timestamp,
+    ...(item.type === 'comment' ? { 'historySummary.replyCount': increment(1) } : {}),
+    updatedAt: serverTimestamp(),
+  });
+  if (statsChange) addTicketStatsChange(batch, statsChange);
+  await batch.commit();
+};
+
+// Mudança de status: a entrada do histórico com a transição estruturada (from, to, at, by) e os
+// campos do resumo no ticket — status anterior, início do novo status e o tempo que o ticket passou
+// no status que está deixando. Reativar um arquivado e medir SLA leem só esses campos.
+// `stats` é a mudança correspondente nas estatísticas agregadas (stats/tickets).
+const statusTransition = (
+  ticketData: Ticket,
+  to: TicketStatus,
+  content: string,
+  author: TicketHistoryItem['author'] = 'admin'
+): { item: Omit<TicketHistoryItem, 'id'>; updates: Record<string, any>; stats: TicketStatsChange } => {
+  const at = Date.now();
+  const from = ticketData.status;
+  const since = ticketData.historySummary?.statusSince;
+  // Reaplicar o mesmo status não encerra o período atual (nem aqui nem em stats/tickets)
+  const sameStatus = from === to;
+  const elapsedMs = since && !sameStatus ? Math.max(0, at - since) : undefined;
+
+  // Tempo de resolução: só na primeira vez que o ticket chega a resolvido/fechado
+  const createdAt = (ticketData.createdAt as unknown as Timestamp)?.toMillis?.();
+  const firstResolution = RESOLVED_STATUSES.includes(to) && !RESOLVED_STATUSES.includes(from) &&
+    !ticketData.historySummary?.resolvedAt && !!createdAt;
+
+  return {
+    item: {
+      content,
+      author,
+      timestamp: at,
+      type: 'status_change',
+      transition: { from, to, at, by: auth.currentUser?.email || author },
+    },
+    updates: {
+      status: to,
+      'historySummary.lastStatus': to,
+      // Reaplicar o mesmo status não apaga o anterior (ex.: arquivar um ticket já arquivado)
+      ...(!sameStatus ? { 'historySummary.previousStatus': from } : {}),
+      ...(!sameStatus || !since ? { 'historySummary.statusSince': at } : {}),
+      // Tickets anteriores ao statusSince começam a contar a partir desta transição
+      ...(elapsedMs !== undefined ? {
+        [`historySummary.statusDurations.${from}`]: increment(elapsedMs),
+        [`historySummary.statusPeriods.${from}`]: increment(1),
+      } : {}),
+      ...(firstResolution ? { 'historySummary.resolvedAt': at } : {}),
+    },
+    stats: {
+      status: { from, to, elapsedMs },
+      ...(firstResolution ? { resolutionMs: Math.max(0, at - createdAt!) } : {}),
+    },
+  };
+};
+
+// Tickets arquivados antes do resumo existir: procurar o status anterior no texto do histórico legado
+const legacyPreviousStatus = (history: TicketHistoryItem[]): TicketStatus => {
+  let previousStatus: TicketStatus = 'aberto';
+  const statusHistory = history
+    .filter(item => item.type === 'status_change')
+    .sort((a, b) => b.timestamp - a.timestamp);
+
+  // Procurar por entrada que menciona "Status anterior"
+  for (const item of statusHistory) {
+    const match = item.content.match(/Status anterior: (.+)/);
+    if (match) {
+      const statusText = match[1].trim();
+      // Mapear texto para status
+      if (statusText.includes('aberto')) previousStatus = 'aberto';
+      else if (statusText.includes('andamento')) previousStatus = 'em_andamento';
+      else if (statusText.includes('resolvido')) previousStatus = 'resolvido';
+      else if (statusText.includes('fechado')) previousStatus = 'fechado';
+      break;
+    }
+  }
+
+  // Se não encontrou status anterior, procurar último status antes de arquivar
+  if (previousStatus === 'aberto') {
+    for (let i = statusHistory.length - 1; i >= 0; i--) {
+      const content = statusHistory[i].content.toLowerCase();
+      if (content.includes('status alterado para')) {
+        if (content.includes('aberto')) previousStatus = 'aberto';
+        else if (content.includes('andamento')) previousStatus = 'em_andamento';
+        else if (content.includes('resolvido')) previousStatus = 'resolvido';
+        else if (content.includes('fechado')) previousStatus = 'fechado';
+        break;
+      }
+    }
+  }
+
+  return previousStatus;
+};
+
 // --- Public Service Methods ---
 
 export const supportService = {
@@ -529,6 +830,53 @@ export const supportService = {
     return allTickets;
   },
 
+  // Uma página de tickets (mais recentes primeiro). Lê pageSize + 1 documentos para saber se há mais.
+  getTicketsPage: async (
+    filters: TicketQueryFilters = {},
+    cursor?: TicketPageCursor | null,
+    pageSize: number = TICKET_PAGE_SIZE
+  ): Promise<TicketPage> => {
+    const snapshot = await getDocs(ticketPageQuery(filters, cursor, pageSize));
+    return buildTicketPage(snapshot.docs.map(d => ({ ticket: ticketFromFirestore(d), snapshot: d })), cursor, pageSize);
+  },
+
+  // A mesma página, ao vivo. Cada snapshot traz só os documentos alterados (docChanges), que são
+  // convertidos e aplicados a um mapa id -> ticket; os demais são reaproveitados sem reprocessar.
+  // Retorna a função para cancelar a assinatura.
+  subscribeToTicketsPage: (
+    filters: TicketQueryFilters,
+    cursor: TicketPageCursor | null,
+    onPage: (page: TicketPage) => void,
+    onError?: (error: Error) => void,
+    pageSize: number = TICKET_PAGE_SIZE
+  ): (() => void) => {
+    const store = new Map<string, { ticket: Ticket; snapshot: QueryDocumentSnapshot }>();
+
+    return onSnapshot(
+      ticketPageQuery(filters, cursor, pageSize),
+      snapshot => {
+        snapshot.docChanges().forEach(change => {
+          const id = change.doc.id;
+          if (change.type === 'removed') {
+            store.delete(id);
+          } else {
+            store.set(id, { ticket: ticketFromFirestore(change.doc), snapshot: change.doc });
+          }
+        });
+
+        // Ordem do servidor; os tickets vêm do mapa
+        const docs = snapshot.docs
+          .map(d => store.get(d.id))
+          .filter((entry): entry is { ticket: Ticket; snapshot: QueryDocumentSnapshot } => !!entry);
+        onPage(buildTicketPage(docs, cursor, pageSize));
+      },
+      error => {
+        console.error('[subscribeToTicketsPage] Erro no onSnapshot:', error);
+        onError?.(error);
+      }
+    );
+  },
+
   getTicketsByUser: async (user: { email?: string | null; phone?: string | null }): Promise<Ticket[]> => {
     const queries = [];
     if (user.email) {
@@ -556,7 +904,7 @@ export const supportService = {
     return activeTickets;
   },
 
-  createTicket: async (ticketData: Omit<Ticket, 'id' | 'createdAt' | 'updatedAt' | 'history'>): Promise<string> => {
+  createTicket: async (ticketData: Omit<Ticket, 'id' | 'createdAt' | 'updatedAt' | 'history' | 'historySummary'>): Promise<string> => {
       // Se orderNumber foi fornecido, buscar pedido para relacionar
       let orderId = ticketData.orderId;
       if (ticketData.orderNumber && !orderId) {
@@ -576,14 +924,30 @@ export const supportService = {
           phone: ticketData.phone?.replace(/\D/g, '') || '',
           createdAt: serverTimestamp(),
           updatedAt: serverTimestamp(),
-          history: [{
-              timestamp: Date.now(),
-              author: 'user',
-              type: 'creation',
-              content: ticketData.description || 'Ticket criado pelo cliente.'
-          }]
+          historySummary: {
+              lastStatus: ticketData.status,
+              previousStatus: null,
+              replyCount: 0,
+              entryCount: 1,
+              lastEntryAt: Date.now(),
+              statusSince: Date.now(),
+              statusDurations: {},
+          }
+      };
+      const creationItem = {
+          timestamp: Date.now(),
+          author: 'user',
+          type: 'creation',
+          content: ticketData.description || 'Ticket criado pelo cliente.'
       };
-      const docRef = await addDoc(ticketsCollection, newTicket);
+
+      // Ticket e primeira entrada do histórico na mesma escrita
+      const docRef = doc(ticketsCollection);
+      const batch = writeBatch(db);
+      batch.set(docRef, newTicket);
+      batch.set(doc(ticketHistoryCollection(docRef.id)), creationItem);
+      addTicketStatsChange(batch, { created: { ticketId: docRef.id, status: ticketData.status, subject: ticketData.subject } });
+      await batch.commit();
       const ticketId = docRef.id;
       
       // Enviar email de confirmação ao cliente
@@ -615,7 +979,7 @@ export const supportService = {
       return ticketId;
   },
 
-  updateTicket: async (id: string, data: Partial<Omit<Ticket, 'id' | 'createdAt' | 'updatedAt' | 'history'>>) => {
+  updateTicket: async (id: string, data: Partial<Omit<Ticket, 'id' | 'createdAt' | 'updatedAt' | 'history' | 'historySummary'>>) => {
     const ticketDoc = doc(db, 'tickets', id);
     const ticketSnapshot = await getDoc(ticketDoc);
     
@@ -625,20 +989,23 @@ export const supportService = {
     
     const ticketData = ticketSnapshot.data() as Ticket;
     const oldStatus = ticketData.status;
-    const dataToUpdate: Record<string, any> = { ...data, updatedAt: serverTimestamp() };
+
+    const subjectChange = data.subject && data.subject !== ticketData.subject
+        ? { from: ticketData.subject, to: data.subject }
+        : undefined;
 
     if (data.status && oldStatus !== data.status) {
-        const newHistoryItem = {
-            content: `Status alterado para: ${data.status.replace('_', ' ')}`,
-            author: 'admin',
-            timestamp: Date.now(),
-            type: 'status_change'
-        };
-        dataToUpdate.history = arrayUnion(newHistoryItem);
+        const { item, updates, stats } = statusTransition(ticketData, data.status, `Status alterado para: ${data.status.replace('_', ' ')}`);
+        await writeTicketHistory(id, item, { ...data, ...updates }, { ...stats, subject: subjectChange });
+    } else if (subjectChange) {
+        const batch = writeBatch(db);
+        batch.update(ticketDoc, { ...data, updatedAt: serverTimestamp() });
+        addTicketStatsChange(batch, { subject: subjectChange });
+        await batch.commit();
+    } else {
+        await updateDoc(ticketDoc, { ...data, updatedAt: serverTimestamp() });
     }
     
-    await updateDoc(ticketDoc, dataToUpdate);
-    
     // Enviar email ao cliente sobre mudança de status (se houver mudança)
     if (data.status && oldStatus !== data.status && ticketData.email) {
       try {
@@ -676,9 +1043,43 @@ export const supportService = {
   },
 
   addTicketReply: async (id: string, reply: { content: string; author: 'admin' | 'user' }) => {
-    const ticketDoc = doc(db, 'tickets', id);
-    const newHistoryItem = { ...reply, timestamp: Date.now(), type: 'comment' };
-    await updateDoc(ticketDoc, { history: arrayUnion(newHistoryItem), updatedAt: serverTimestamp() });
+    await writeTicketHistory(id, { ...reply, timestamp: Date.now(), type: 'comment' });
+  },
+
+  // Uma página do histórico (mais recentes primeiro); passe o nextCursor para buscar as mais antigas
+  getTicketHistoryPage: async (
+    ticketId: string,
+    cursor?: QueryDocumentSnapshot | null,
+    pageSize: number = TICKET_HISTORY_PAGE_SIZE
+  ): Promise<TicketHistoryPage> => {
+    const constraints: QueryConstraint[] = [orderBy('timestamp', 'desc')];
+    if (cursor) constraints.push(startAfter(cursor));
+    constraints.push(limit(pageSize + 1));
+
+    const snapshot = await getDocs(query(ticketHistoryCollection(ticketId), ...constraints));
+    const docs = snapshot.docs.slice(0, pageSize);
+    return {
+      items: docs.map(d => ({ id: d.id, ...d.data() } as TicketHistoryItem)),
+      nextCursor: snapshot.docs.length > pageSize ? docs[docs.length - 1] : null,
+    };
+  },
+
+  // Histórico completo em ordem cronológica (subcoleção + array legado do documento)
+  getTicketHistory: async (ticket: Ticket): Promise<TicketHistoryItem[]> => {
+    const snapshot = await getDocs(query(ticketHistoryCollection(ticket.id), orderBy('timestamp', 'asc')));
+    const items = snapshot.docs.map(d => ({ id: d.id, ...d.data() } as TicketHistoryItem));
+    return [...(ticket.history || []), ...items].sort((a, b) => a.timestamp - b.timestamp);
+  },
+
+  // Tempo (ms) que o ticket passou em cada status, incluindo o status atual até `now`.
+  // Lê só o resumo do ticket, sem consultar o histórico.
+  getStatusDurations: (ticket: Ticket, now: number = Date.now()): Partial<Record<TicketStatus, number>> => {
+    const summary = ticket.historySummary;
+    const durations = { ...(summary?.statusDurations || {}) };
+    if (summary?.statusSince) {
+      durations[ticket.status] = (durations[ticket.status] || 0) + Math.max(0, now - summary.statusSince);
+    }
+    return durations;
   },
 
   archiveTicket: async (id: string) => {
@@ -696,18 +1097,12 @@ export const supportService = {
       return;
     }
     
-    const newHistoryItem = {
-        content: `Ticket arquivado. Status anterior: ${ticketData.status.replace('_', ' ')}`,
-        author: 'admin',
-        timestamp: Date.now(),
-        type: 'status_change'
-    };
-    
-    await updateDoc(ticketDoc, { 
-      status: 'arquivado', 
-      history: arrayUnion(newHistoryItem), 
-      updatedAt: serverTimestamp() 
-    });
+    const { item, updates, stats } = statusTransition(
+        ticketData,
+        'arquivado',
+        `Ticket arquivado. Status anterior: ${ticketData.status.replace('_', ' ')}`
+    );
+    await writeTicketHistory(id, item, updates, stats);
   },
 
   unarchiveTicket: async (id: string) => {
@@ -725,53 +1120,19 @@ export const supportService = {
       return;
     }
     
-    // Tentar restaurar status anterior do histórico
-    let previousStatus: TicketStatus = 'aberto';
-    const statusHistory = ticketData.history
-      .filter(item => item.type === 'status_change')
-      .sort((a, b) => b.timestamp - a.timestamp);
+    // Status anterior ao arquivamento: lido direto do resumo do ticket. O histórico legado só é
+    // varrido para tickets arquivados antes do resumo existir.
+    const summaryStatus = ticketData.historySummary?.previousStatus;
+    const previousStatus: TicketStatus = summaryStatus
+      ? (summaryStatus !== 'arquivado' ? summaryStatus : 'aberto')
+      : legacyPreviousStatus(ticketData.history || []);
     
-    // Procurar por entrada que menciona "Status anterior"
-    for (const item of statusHistory) {
-      const match = item.content.match(/Status anterior: (.+)/);
-      if (match) {
-        const statusText = match[1].trim();
-        // Mapear texto para status
-        if (statusText.includes('aberto')) previousStatus = 'aberto';
-        else if (statusText.includes('andamento')) previousStatus = 'em_andamento';
-        else if (statusText.includes('resolvido')) previousStatus = 'resolvido';
-        else if (statusText.includes('fechado')) previousStatus = 'fechado';
-        break;
-      }
-    }
-    
-    // Se não encontrou status anterior, procurar último status antes de arquivar
-    if (previousStatus === 'aberto') {
-      // Buscar último status válido antes do arquivamento
-      for (let i = statusHistory.length - 1; i >= 0; i--) {
-        const content = statusHistory[i].content.toLowerCase();
-        if (content.includes('status alterado para')) {
-          if (content.includes('aberto')) previousStatus = 'aberto';
-          else if (content.includes('andamento')) previousStatus = 'em_andamento';
-          else if (content.includes('resolvido')) previousStatus = 'resolvido';
-          else if (content.includes('fechado')) previousStatus = 'fechado';
-          break;
-        }
-      }
-    }
-    
-    const newHistoryItem = {
-        content: `Ticket reativado. Status restaurado para: ${previousStatus.replace('_', ' ')}`,
-        author: 'admin',
-        timestamp: Date.now(),
-        type: 'status_change'
-    };
-    
-    await updateDoc(ticketDoc, { 
-      status: previousStatus, 
-      history: arrayUnion(newHistoryItem), 
-      updatedAt: serverTimestamp() 
-    });
+    const { item, updates, stats } = statusTransition(
+        ticketData,
+        previousStatus,
+        `Ticket reativado. Status restaurado para: ${previousStatus.replace('_', ' ')}`
+    );
+    await writeTicketHistory(id, item, updates, stats);
   },
 
   updateTicketStatus: async (id: string, status: TicketStatus) => {
@@ -785,13 +1146,8 @@ export const supportService = {
     const ticketData = ticketSnapshot.data() as Ticket;
     const oldStatus = ticketData.status;
     
-    const newHistoryItem = {
-        content: `Status alterado para: ${status.replace('_', ' ')}`,
-        author: 'admin',
-        timestamp: Date.now(),
-        type: 'status_change'
-    };
-    await updateDoc(ticketDoc, { status: status, history: arrayUnion(newHistoryItem), updatedAt: serverTimestamp() });
+    const { item, updates, stats } = statusTransition(ticketData, status, `Status alterado para: ${status.replace('_', ' ')}`);
+    await writeTicketHistory(id, item, updates, stats);
     
     // Enviar email ao cliente sobre mudança de status
     if (oldStatus !== status && ticketData.email) {
@@ -1275,109 +1631,95 @@ export const supportService = {
     }
   },
   
-  findOrdersByCustomer: async (user: { email?: string | null; phone?: string | null }): Promise<CubboOrder[]> => {
-    let accessToken: string;
+  // Pedidos do cliente página a página, na ordem em que chegam do proxy (GET /orders/stream).
+  // A página 1 vem primeiro; as demais são buscadas em paralelo pelo proxy e entregues assim que prontas.
+  streamOrdersByCustomer: async function* (
+    user: { email?: string | null; phone?: string | null }
+  ): AsyncGenerator<CustomerOrdersPage> {
     let config: ApiConfig | null;
 
     try {
         config = await getCubboConfig();
-        if (!config) return [];
-        
+        if (!config) return;
+
         if (!config.storeId) {
-            console.error("[findOrdersByCustomer] store_id não configurado");
-            return [];
-        } 
-        accessToken = await getAccessToken();
+            console.error("[streamOrdersByCustomer] store_id não configurado");
+            return;
+        }
     } catch (error: any) {
-        console.error("Authentication failed in findOrdersByCustomer:", error);
-        return []; // Silently fail and return no orders.
+        console.error("[streamOrdersByCustomer] Erro ao carregar configuração da Cubbo:", error);
+        return;
     }
-    
-    let queryParams: string[] = [];
-    
-    // Adicionar store_id primeiro (obrigatório)
-    if (config.storeId) {
-        queryParams.push(`store_id=${encodeURIComponent(config.storeId)}`);
+
+    const customerQuery = buildCustomerOrdersQuery(config.storeId, user);
+    if (!customerQuery) return;
+
+    // Usar o proxy para evitar problemas de CORS (o proxy também cuida da autenticação)
+    const proxyUrl = getProxyUrl();
+    const requestUrl = `${proxyUrl}/orders/stream?${customerQuery}&max_pages=${CUSTOMER_ORDERS_MAX_PAGES}&concurrency=${CUSTOMER_ORDERS_CONCURRENCY}`;
+    console.log(`[streamOrdersByCustomer] Buscando pedidos via proxy`, {
+        storeId: config.storeId,
+        email: user.email,
+        phone: user.phone
+    });
+
+    let response: Response;
+    try {
+        response = await fetch(requestUrl, { method: 'GET', mode: 'cors' });
+    } catch (fetchError: any) {
+        const errorMessage = fetchError.message || String(fetchError);
+        console.error(`[streamOrdersByCustomer] Erro de rede ao fazer fetch:`, fetchError);
+        if (errorMessage.includes('Failed to fetch') || errorMessage.includes('NetworkError') || errorMessage.includes('CORS')) {
+            throw new Error(`CORS/Network Error: Não foi possível conectar ao proxy da API Cubbo. URL: ${requestUrl}`);
+        }
+        throw fetchError;
     }
-    
-    // Usar shipping_email ao invés de customer_email (conforme documentação da API Cubbo)
-    if (user.email) {
-        queryParams.push(`shipping_email=${encodeURIComponent(user.email)}`);
-    } else if (user.phone) {
-        const sanitizedPhone = user.phone.replace(/\D/g, '');
-        queryParams.push(`customer_phone=${sanitizedPhone}`);
-    } else {
-        return [];
+
+    // Proxy ainda sem /orders/stream: cair para uma única página via /api/orders
+    if (response.status === 404) {
+        console.warn('[streamOrdersByCustomer] Proxy sem /orders/stream, buscando apenas a primeira página');
+        const orders = await fetchCustomerOrdersPage(proxyUrl, customerQuery, 1);
+        yield { page: 1, orders: orders.map(normalizeOrderData) };
+        return;
     }
-    
-    // Adicionar parâmetros de paginação e ordenação (opcionais, mas recomendados)
-    queryParams.push(`per_page=100`);
-    queryParams.push(`page=1`);
-    queryParams.push(`sort=desc`);
-    queryParams.push(`sort_by=created_at`);
 
-    try {
-        // Usar o proxy para evitar problemas de CORS
-        const proxyUrl = getProxyUrl();
-        
-        const queryString = queryParams.length > 0 ? `?${queryParams.join('&')}` : '';
-        const requestUrl = `${proxyUrl}/api/orders${queryString}`;
-        console.log(`[findOrdersByCustomer] Fazendo requisição via proxy para: ${requestUrl}`, { 
-            storeId: config.storeId,
-            email: user.email,
-            phone: user.phone 
-        });
-        
-        let response: Response;
+    if (!response.ok) {
+        const errorText = await response.text();
+        let errorData;
         try {
-            response = await fetch(requestUrl, {
-                method: 'GET',
-                headers: { 'Content-Type': 'application/json' },
-                mode: 'cors'
-            });
-        } catch (fetchError: any) {
-            // Captura erros de rede/CORS especificamente
-            const errorMessage = fetchError.message || String(fetchError);
-            console.error(`[findOrdersByCustomer] Erro de rede ao fazer fetch:`, fetchError);
-            
-            if (errorMessage.includes('Failed to fetch') || errorMessage.includes('NetworkError') || errorMessage.includes('CORS')) {
-                // Lançar erro para ser capturado pelo catch externo e retornar array vazio com log
-                throw new Error(`CORS/Network Error: Não foi possível conectar ao proxy da API Cubbo. URL: ${requestUrl}`);
-            }
-            throw fetchError;
+            errorData = JSON.parse(errorText);
+        } catch (e) {
+            errorData = { error: errorText };
         }
-        
-        if (!response.ok) {
-            const errorText = await response.text();
-            let errorData;
-            try {
-                errorData = JSON.parse(errorText);
-            } catch (e) {
-                errorData = { error: errorText };
+        console.error(`API Cubbo retornou status ${response.status}:`, errorData);
+        throw new Error(`Falha ao buscar pedidos: ${response.status} - ${errorData.error || errorData.details || errorText}`);
+    }
+
+    for await (const line of readNdjsonLines(response)) {
+        if (line.error) {
+            // Páginas já entregues continuam válidas; apenas parar aqui
+            console.error('[streamOrdersByCustomer] Erro ao buscar página de pedidos:', line.details || line.error);
+            return;
+        }
+        if (line.done) {
+            if (line.truncated) {
+                console.warn(`[streamOrdersByCustomer] Lista truncada em ${line.pages} páginas (${line.total} pedidos)`);
             }
-            console.error(`API Cubbo retornou status ${response.status}:`, errorData);
-            throw new Error(`Falha ao buscar pedidos: ${response.status} - ${errorData.error || errorData.details || errorText}`);
+            return;
         }
-        
-        const data = await response.json();
-        // Log reduzido para melhor performance
-        console.log('[findOrdersByCustomer] Resposta recebida:', { 
-            ordersCount: Array.isArray(data) ? data.length : (data.orders?.length || data.data?.length || 0)
-        });
-        
-        // A API Cubbo pode retornar:
-        // - Um array diretamente
-        // - Um objeto com 'orders' contendo o array
-        // - Um objeto com 'data' contendo o array
-        let orders: any[] = [];
-        if (Array.isArray(data)) {
-            orders = data;
-        } else {
-            orders = data.orders || data.data || data.results || [];
+        yield { page: line.page, orders: extractOrdersList(line).map(normalizeOrderData) };
+    }
+  },
+
+  findOrdersByCustomer: async (user: { email?: string | null; phone?: string | null }): Promise<CubboOrder[]> => {
+    let orders: CubboOrder[] = [];
+
+    try {
+        for await (const page of supportService.streamOrdersByCustomer(user)) {
+            orders = supportService.mergeOrders(orders, page.orders);
         }
-        
-        // Normalizar dados de cada pedido
-        return orders.map(normalizeOrderData);
+        console.log('[findOrdersByCustomer] Pedidos recebidos:', { ordersCount: orders.length });
+        return orders;
     } catch (error: any) {
         const errorMessage = error?.message || String(error);
         console.error("Failed to find orders by customer:", error);
@@ -1386,15 +1728,25 @@ export const supportService = {
         if (errorMessage.includes('Failed to fetch') || errorMessage.includes('NetworkError') || errorMessage.includes('CORS')) {
             console.error(`[findOrdersByCustomer] Erro de conexão detectado. Isso pode indicar problema de CORS ou API inacessível.`, {
                 error: errorMessage,
-                configUrl: config?.url,
-                queryParams
+                email: user.email,
+                phone: user.phone
             });
         }
         
-        return [];
+        // Pedidos das páginas que chegaram antes do erro
+        return orders;
     }
   },
 
+  // Junta páginas de pedidos sem duplicar (por id) e mantém os mais recentes primeiro
+  mergeOrders: (current: CubboOrder[], incoming: CubboOrder[]): CubboOrder[] => {
+    const byId = new Map<string, CubboOrder>();
+    [...current, ...incoming].forEach(order => byId.set(String(order.id || order.order_number), order));
+    return Array.from(byId.values()).sort((a, b) =>
+        (new Date(b.created_at).getTime() || 0) - (new Date(a.created_at).getTime() || 0)
+    );
+  },
+
   // Buscar locais de coleta disponíveis (Click and Collect)
   getPickupLocations: async (postalCode: string): Promise<PickupLocation[]> => {
     let accessToken: string;
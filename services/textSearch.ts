@@ -0,0 +1,274 @@
+// Busca textual em memória para FAQ e base de conhecimento.
+// Normaliza o texto em português (sem acentos, sem stopwords, com stemming leve) e mantém
+// um índice invertido termo -> documentos que pode ser atualizado entrada a entrada.
+
+// Palavras muito frequentes que não ajudam a diferenciar as entradas (já sem acento)
+const PT_STOPWORDS = new Set([
+  'a', 'ao', 'aos', 'as', 'ate', 'com', 'como', 'da', 'das', 'de', 'dela', 'dele', 'deles', 'do', 'dos',
+  'e', 'ela', 'ele', 'eles', 'em', 'entre', 'era', 'essa', 'esse', 'esta', 'estao', 'este', 'eu', 'foi',
+  'ha', 'isso', 'isto', 'ja', 'la', 'lhe', 'mais', 'mas', 'me', 'meu', 'minha', 'muito', 'na', 'nas',
+  'nem', 'no', 'nos', 'num', 'numa', 'o', 'os', 'ou', 'para', 'pela', 'pelas', 'pelo', 'pelos', 'por',
+  'pra', 'qual', 'quando', 'que', 'se', 'sem', 'ser', 'seu', 'sua', 'so', 'ta', 'tem', 'ter', 'to', 'um',
+  'uma', 'umas', 'uns', 'voce', 'voces', 'vou', 'sao', 'sobre', 'tambem', 'onde', 'quero', 'gostaria',
+]);
+
+// Sufixos removidos pelo stemming, do mais longo para o mais curto (aplicado só ao primeiro que casar)
+const PLURAL_RULES: Array<[string, string]> = [
+  ['oes', 'ao'], ['aes', 'ao'], ['ais', 'al'], ['eis', 'el'], ['ois', 'ol'], ['ns', 'm'], ['res', 'r'], ['les', 'l'], ['s', ''],
+];
+const SUFFIX_RULES = [
+  'amente', 'mente', 'amento', 'imento', 'mento', 'acao', 'icao', 'ucao', 'cao',
+  'ando', 'endo', 'indo', 'ado', 'ada', 'ido', 'ida', 'eio', 'ar', 'er', 'ir', 'ue',
+];
+const MIN_STEM_LENGTH = 3;
+
+// "Devolução" -> "devolucao"
+export const foldText = (text: string): string =>
+  (text || '').normalize('NFD').replace(/[\u0300-\u036f]/g, '').toLowerCase();
+
+// Stemming leve (não é o RSLP completo): plural, sufixos verbais/nominais comuns e vogal final.
+// "entregas", "entregar", "entregue" e "entrega" viram "entreg"; "rastreio" e "rastreamento", "rastr".
+export const stemWord = (word: string): string => {
+  let stem = word;
+  if (stem.length > 3 && !stem.endsWith('ss') && !stem.endsWith('us')) {
+    const rule = PLURAL_RULES.find(([suffix]) => stem.endsWith(suffix) && stem.length - suffix.length >= MIN_STEM_LENGTH);
+    if (rule) stem = stem.slice(0, stem.length - rule[0].length) + rule[1];
+  }
+  const suffix = SUFFIX_RULES.find(s => stem.endsWith(s) && stem.length - s.length >= MIN_STEM_LENGTH);
+  if (suffix) stem = stem.slice(0, stem.length - suffix.length);
+  if (stem.length > MIN_STEM_LENGTH + 1 && /[aeo]$/.test(stem)) stem = stem.slice(0, -1);
+  return stem;
+};
+
+// Texto -> termos indexáveis (stems), na ordem em que aparecem
+export const tokenize = (text: string): string[] =>
+  foldText(text)
+    .split(/[^a-z0-9]+/)
+    .filter(word => word.length > 1 && !PT_STOPWORDS.has(word))
+    .map(stemWord);
+
+// Frequência de termos por campo de um documento
+interface IndexedDocument<T> {
+  item: T;
+  fields: Record<string, Map<string, number>>;
+  lengths: Record<string, number>;
+}
+
+export interface SearchIndex<T> {
+  add: (id: string, item: T) => void;
+  remove: (id: string) => void;
+  clear: () => void;
+  get: (id: string) => T | undefined;
+  size: () => number;
+  // Documentos que contêm o termo, com a frequência em cada campo
+  postings: (term: string) => Map<string, Record<string, number>>;
+  // Termos do índice que começam com o prefixo (para a última palavra ainda sendo digitada)
+  expandPrefix: (prefix: string, limit?: number) => string[];
+  document: (id: string) => IndexedDocument<T> | undefined;
+  // Soma dos tamanhos (em termos) de cada campo, para médias como a do BM25
+  totalLength: (field: string) => number;
+}
+
+// Índice invertido incremental. `extract` devolve o texto de cada campo a indexar.
+export const createSearchIndex = <T>(extract: (item: T) => Record<string, string>): SearchIndex<T> => {
+  const documents = new Map<string, IndexedDocument<T>>();
+  const terms = new Map<string, Map<string, Record<string, number>>>();
+  const totals: Record<string, number> = {};
+
+  const remove = (id: string) => {
+    const existing = documents.get(id);
+    if (!existing) return;
+    Object.entries(existing.fields).forEach(([field, counts]) => {
+      totals[field] -= existing.lengths[field];
+      counts.forEach((_, term) => {
+        const posting = terms.get(term);
+        if (!posting) return;
+        posting.delete(id);
+        if (posting.size === 0) terms.delete(term);
+      });
+    });
+    documents.delete(id);
+  };
+
+  const add = (id: string, item: T) => {
+    remove(id);
+    const indexed: IndexedDocument<T> = { item, fields: {}, lengths: {} };
+    Object.entries(extract(item)).forEach(([field, text]) => {
+      const tokens = tokenize(text);
+      const counts = new Map<string, number>();
+      tokens.forEach(token => counts.set(token, (counts.get(token) || 0) + 1));
+      indexed.fields[field] = counts;
+      indexed.lengths[field] = tokens.length;
+      totals[field] = (totals[field] || 0) + tokens.length;
+
+      counts.forEach((count, term) => {
+        let posting = terms.get(term);
+        if (!posting) {
+          posting = new Map();
+          terms.set(term, posting);
+        }
+        const frequencies = posting.get(id) || {};
+        frequencies[field] = count;
+        posting.set(id, frequencies);
+      });
+    });
+    documents.set(id, indexed);
+  };
+
+  return {
+    add,
+    remove,
+    clear: () => {
+      documents.clear();
+      terms.clear();
+      Object.keys(totals).forEach(field => delete totals[field]);
+    },
+    get: (id) => documents.get(id)?.item,
+    size: () => documents.size,
+    postings: (term) => terms.get(term) || new Map(),
+    expandPrefix: (prefix, limit = 20) => {
+      const matches: string[] = [];
+      for (const term of terms.keys()) {
+        if (term.startsWith(prefix) && term !== prefix) {
+          matches.push(term);
+          if (matches.length >= limit) break;
+        }
+      }
+      return matches;
+    },
+    document: (id) => documents.get(id),
+    totalLength: (field) => totals[field] || 0,
+  };
+};
+
+// Os `limit` itens de maior score, sem ordenar a lista inteira de candidatos
+export const topScored = <T>(scored: Array<{ item: T; score: number }>, limit: number): Array<{ item: T; score: number }> => {
+  const top: Array<{ item: T; score: number }> = [];
+  scored.forEach(candidate => {
+    if (top.length === limit && candidate.score <= top[top.length - 1].score) return;
+    let position = top.findIndex(current => candidate.score > current.score);
+    if (position === -1) position = top.length;
+    top.splice(position, 0, candidate);
+    if (top.length > limit) top.pop();
+  });
+  return top;
+};
+
+// --- BM25 ---
+// BM25F simplificado: a frequência de cada campo é normalizada pelo tamanho do campo,
+// ponderada pelo peso do campo e só então saturada por k1.
+const BM25_K1 = 1.2;
+const BM25_B = 0.75;
+
+export const bm25Search = <T>(
+  index: SearchIndex<T>,
+  queryTerms: string[],
+  fieldWeights: Record<string, number>,
+  limit: number
+): Array<{ id: string; item: T; score: number }> => {
+  const totalDocs = index.size();
+  if (totalDocs === 0) return [];
+
+  const averageLengths: Record<string, number> = {};
+  Object.keys(fieldWeights).forEach(field => {
+    averageLengths[field] = index.totalLength(field) / totalDocs || 1;
+  });
+
+  const scores = new Map<string, number>();
+  Array.from(new Set(queryTerms)).forEach(term => {
+    const postings = index.postings(term);
+    if (postings.size === 0) return;
+    const idf = Math.log(1 + (totalDocs - postings.size + 0.5) / (postings.size + 0.5));
+    postings.forEach((frequencies, id) => {
+      const lengths = index.document(id)?.lengths || {};
+      let weightedTf = 0;
+      Object.entries(frequencies).forEach(([field, tf]) => {
+        const lengthRatio = (lengths[field] || 0) / averageLengths[field];
+        weightedTf += (fieldWeights[field] || 1) * tf / (1 - BM25_B + BM25_B * lengthRatio);
+      });
+      scores.set(id, (scores.get(id) || 0) + idf * (weightedTf * (BM25_K1 + 1)) / (weightedTf + BM25_K1));
+    });
+  });
+
+  const scored: Array<{ item: { id: string; item: T }; score: number }> = [];
+  scores.forEach((score, id) => {
+    const item = index.get(id);
+    if (item) scored.push({ item: { id, item }, score });
+  });
+  return topScored(scored, limit).map(({ item, score }) => ({ ...item, score }));
+};
+
+// Trecho de até `maxLength` caracteres do texto com o maior número de termos distintos da
+// consulta, começando um pouco antes do primeiro termo encontrado na janela.
+export const extractSnippet = (text: string, queryTerms: string[], maxLength = 240): string => {
+  const clean = (text || '').replace(/\s+/g, ' ').trim();
+  if (clean.length <= maxLength) return clean;
+
+  const wanted = new Set(queryTerms);
+  const matches: Array<{ position: number; term: string }> = [];
+  const wordPattern = /[^\s.,;:!?()"]+/g;
+  let word: RegExpExecArray | null;
+  while ((word = wordPattern.exec(clean)) !== null) {
+    const term = stemWord(foldText(word[0]));
+    if (wanted.has(term)) matches.push({ position: word.index, term });
+  }
+
+  // Janela deslizante sobre as ocorrências: a que cobre mais termos distintos vence
+  let bestStart = 0;
+  let bestCoverage = 0;
+  for (let i = 0; i < matches.length; i++) {
+    const covered = new Set<string>();
+    for (let j = i; j < matches.length && matches[j].position - matches[i].position < maxLength * 0.8; j++) {
+      covered.add(matches[j].term);
+    }
+    if (covered.size > bestCoverage) {
+      bestCoverage = covered.size;
+      bestStart = matches[i].position;
+    }
+  }
+
+  let start = Math.max(0, bestStart - Math.floor(maxLength * 0.2));
+  if (start > 0) {
+    const sentenceStart = clean.lastIndexOf('. ', bestStart);
+    start = sentenceStart >= start ? sentenceStart + 2 : clean.indexOf(' ', start) + 1;
+  }
+  let end = Math.min(clean.length, start + maxLength);
+  if (end < clean.length) {
+    const lastSpace = clean.lastIndexOf(' ', end);
+    if (lastSpace > start) end = lastSpace;
+  }
+
+  return `${start > 0 ? '…' : ''}${clean.slice(start, end).trim()}${end < clean.length ? '…' : ''}`;
+};
+
+// --- Consultas quase iguais (cache de respostas) ---
+// Aqui toda palavra conta: "o pedido chegou?" e "pedido chegou?" são perguntas diferentes.
+// Stopwords e stemming ficam só na busca/ranking (tokenize).
+export interface QueryFingerprint {
+  key: string;           // texto sem acentos, minúsculo e com espaços colapsados
+  grams: Set<string>;    // trigramas de caracteres da chave
+  numbers: string;       // números da consulta, na ordem (pedido, data, valor)
+}
+
+const trigrams = (text: string): Set<string> => {
+  const padded = ` ${text} `;
+  const grams = new Set<string>();
+  for (let i = 0; i < padded.length - 2; i++) grams.add(padded.slice(i, i + 3));
+  return grams;
+};
+
+export const queryFingerprint = (query: string): QueryFingerprint => {
+  const key = foldText(query).replace(/\s+/g, ' ').trim();
+  return { key, grams: trigrams(key), numbers: (key.match(/\d+/g) || []).join(' ') };
+};
+
+// Coeficiente de Dice entre os trigramas (0 a 1). Consultas com números diferentes valem 0:
+// "pedido 12345" e "pedido 12346" diferem em um trigrama só, mas pedem respostas diferentes.
+export const querySimilarity = (a: QueryFingerprint, b: QueryFingerprint): number => {
+  if (a.numbers !== b.numbers || a.grams.size === 0 || b.grams.size === 0) return 0;
+  let shared = 0;
+  a.grams.forEach(gram => {
+    if (b.grams.has(gram)) shared++;
+  });
+  return (2 * shared) / (a.grams.size + b.grams.size);
+};
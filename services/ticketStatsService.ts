@@ -0,0 +1,202 @@
+import { db } from '../firebase';
+import {
+  collection,
+  doc,
+  getDoc,
+  getDocs,
+  increment,
+  onSnapshot,
+  serverTimestamp,
+  setDoc,
+  writeBatch,
+  Timestamp,
+  WriteBatch,
+} from 'firebase/firestore';
+import { TicketStats, TicketStatus } from '../types';
+
+// Estatísticas de tickets em um único documento (stats/tickets).
+// Cada escrita que muda uma contagem (criação, mudança de status, troca de assunto) acrescenta
+// os increments ao mesmo writeBatch do ticket, então o documento nunca fica para trás nem
+// adiantado em relação aos tickets. O painel lê só esse documento, sem varrer a coleção.
+// backfill() recalcula tudo a partir da coleção: na primeira vez ou para corrigir divergências.
+
+const statsDoc = doc(db, 'stats', 'tickets');
+const ticketsCollection = collection(db, 'tickets');
+
+const HOUR_MS = 60 * 60 * 1000;
+const FIRESTORE_BATCH_LIMIT = 500;
+
+export const RESOLVED_STATUSES: TicketStatus[] = ['resolvido', 'fechado'];
+
+// Faixas do histograma de tempo de resolução (limite superior exclusivo)
+export const RESOLUTION_BUCKETS: Array<{ key: string; label: string; maxMs: number }> = [
+  { key: 'ate_1h', label: 'até 1h', maxMs: HOUR_MS },
+  { key: 'ate_4h', label: '1h a 4h', maxMs: 4 * HOUR_MS },
+  { key: 'ate_24h', label: '4h a 24h', maxMs: 24 * HOUR_MS },
+  { key: 'ate_3d', label: '1 a 3 dias', maxMs: 72 * HOUR_MS },
+  { key: 'ate_7d', label: '3 a 7 dias', maxMs: 168 * HOUR_MS },
+  { key: 'mais_7d', label: 'mais de 7 dias', maxMs: Infinity },
+];
+
+const resolutionBucket = (ms: number) => RESOLUTION_BUCKETS.find(bucket => ms < bucket.maxMs)!.key;
+
+// Assuntos viram chaves de mapa no Firestore: sem pontos e nunca vazios
+// (firestore.rules repete esta normalização para validar a criação de tickets)
+const subjectKey = (subject?: string) => (subject || '').replace(/\./g, '').trim() || 'Sem assunto';
+
+const toMillis = (value: any): number | undefined =>
+  value instanceof Timestamp ? value.toMillis() : typeof value === 'number' ? value : undefined;
+
+// 93784000 -> "1d 2h"; 4500000 -> "1h 15min"
+export const formatDuration = (ms: number): string => {
+  const minutes = Math.floor(ms / 60000);
+  const hours = Math.floor(minutes / 60);
+  const days = Math.floor(hours / 24);
+  if (days > 0) return `${days}d ${hours % 24}h`;
+  if (hours > 0) return `${hours}h ${minutes % 60}min`;
+  return `${minutes}min`;
+};
+
+export const emptyTicketStats = (): TicketStats => ({
+  total: 0,
+  byStatus: {},
+  bySubject: {},
+  timeInStatus: {},
+  resolution: { count: 0, totalMs: 0, histogram: {} },
+});
+
+export interface TicketStatsChange {
+  created?: { ticketId: string; status: TicketStatus; subject: string };
+  status?: { from: TicketStatus; to: TicketStatus; elapsedMs?: number }; // elapsedMs: tempo no status `from`
+  subject?: { from: string; to: string };
+  resolutionMs?: number; // só na primeira resolução do ticket
+}
+
+// Acrescenta ao lote os increments correspondentes à mudança
+export const addTicketStatsChange = (batch: WriteBatch, change: TicketStatsChange): void => {
+  const byStatus: Record<string, number> = {};
+  const bySubject: Record<string, number> = {};
+  const add = (target: Record<string, number>, key: string, amount: number) => {
+    target[key] = (target[key] || 0) + amount;
+  };
+  const update: Record<string, any> = { updatedAt: serverTimestamp() };
+
+  if (change.created) {
+    // As regras do Firestore conferem o incremento contra este ticket (criado no mesmo lote)
+    update.lastCreatedTicketId = change.created.ticketId;
+    update.total = increment(1);
+    add(byStatus, change.created.status, 1);
+    add(bySubject, subjectKey(change.created.subject), 1);
+  }
+  if (change.status && change.status.from !== change.status.to) {
+    add(byStatus, change.status.from, -1);
+    add(byStatus, change.status.to, 1);
+    if (change.status.elapsedMs !== undefined) {
+      update.timeInStatus = {
+        [change.status.from]: { totalMs: increment(change.status.elapsedMs), count: increment(1) },
+      };
+    }
+  }
+  if (change.subject && subjectKey(change.subject.from) !== subjectKey(change.subject.to)) {
+    add(bySubject, subjectKey(change.subject.from), -1);
+    add(bySubject, subjectKey(change.subject.to), 1);
+  }
+  if (change.resolutionMs !== undefined) {
+    update.resolution = {
+      count: increment(1),
+      totalMs: increment(change.resolutionMs),
+      histogram: { [resolutionBucket(change.resolutionMs)]: increment(1) },
+    };
+  }
+
+  // Mapas vazios no merge substituiriam o campo inteiro: só entram chaves com delta
+  const setIncrements = (field: string, deltas: Record<string, number>) => {
+    const entries = Object.entries(deltas).filter(([, amount]) => amount !== 0);
+    if (entries.length > 0) update[field] = Object.fromEntries(entries.map(([key, amount]) => [key, increment(amount)]));
+  };
+  setIncrements('byStatus', byStatus);
+  setIncrements('bySubject', bySubject);
+
+  // set + merge com mapas aninhados: cria o documento na primeira escrita
+  batch.set(statsDoc, update, { merge: true });
+};
+
+const statsFromFirestore = (data: any): TicketStats => ({
+  ...emptyTicketStats(),
+  ...data,
+  resolution: { ...emptyTicketStats().resolution, ...(data?.resolution || {}) },
+  updatedAt: toMillis(data?.updatedAt),
+  backfilledAt: toMillis(data?.backfilledAt),
+});
+
+export const ticketStatsService = {
+  getStats: async (): Promise<TicketStats> => {
+    const snapshot = await getDoc(statsDoc);
+    return snapshot.exists() ? statsFromFirestore(snapshot.data()) : emptyTicketStats();
+  },
+
+  // Estatísticas ao vivo; retorna a função para cancelar a assinatura
+  subscribeToStats: (onStats: (stats: TicketStats) => void, onError?: (error: Error) => void): (() => void) =>
+    onSnapshot(
+      statsDoc,
+      snapshot => onStats(snapshot.exists() ? statsFromFirestore(snapshot.data()) : emptyTicketStats()),
+      error => {
+        console.error('[ticketStats] Erro no onSnapshot:', error);
+        onError?.(error);
+      }
+    ),
+
+  // Recalcula o documento a partir de todos os tickets (a única varredura da coleção).
+  // Tickets resolvidos antes do resolvedAt existir ganham o campo, estimado pelo updatedAt,
+  // para que uma reabertura seguida de nova resolução não conte duas vezes.
+  // Escritas de tickets feitas durante o backfill podem se perder: rode com pouco movimento.
+  backfill: async (): Promise<TicketStats> => {
+    const snapshot = await getDocs(ticketsCollection);
+    const stats = emptyTicketStats();
+    const missingResolvedAt: Array<{ id: string; resolvedAt: number }> = [];
+
+    snapshot.docs.forEach(ticketDoc => {
+      const data = ticketDoc.data();
+      const status = data.status as TicketStatus;
+      const summary = data.historySummary || {};
+      stats.total++;
+      stats.byStatus[status] = (stats.byStatus[status] || 0) + 1;
+      const subject = subjectKey(data.subject);
+      stats.bySubject[subject] = (stats.bySubject[subject] || 0) + 1;
+
+      // Períodos encerrados em cada status, na mesma unidade dos increments de addTicketStatsChange
+      // (um por transição). Durações sem contagem de períodos ficam de fora.
+      const periods = (summary.statusPeriods || {}) as Record<string, number>;
+      Object.entries((summary.statusDurations || {}) as Record<string, number>).forEach(([from, ms]) => {
+        if (!periods[from]) return;
+        const current = stats.timeInStatus[from as TicketStatus] || { totalMs: 0, count: 0 };
+        stats.timeInStatus[from as TicketStatus] = { totalMs: current.totalMs + ms, count: current.count + periods[from] };
+      });
+
+      const resolved = RESOLVED_STATUSES.includes(status) ||
+        (status === 'arquivado' && RESOLVED_STATUSES.includes(summary.previousStatus));
+      const createdAt = toMillis(data.createdAt);
+      const resolvedAt = summary.resolvedAt ?? (resolved ? toMillis(data.updatedAt) : undefined);
+      if (createdAt && resolvedAt) {
+        const ms = Math.max(0, resolvedAt - createdAt);
+        const bucket = resolutionBucket(ms);
+        stats.resolution.count++;
+        stats.resolution.totalMs += ms;
+        stats.resolution.histogram[bucket] = (stats.resolution.histogram[bucket] || 0) + 1;
+        if (!summary.resolvedAt) missingResolvedAt.push({ id: ticketDoc.id, resolvedAt });
+      }
+    });
+
+    for (let start = 0; start < missingResolvedAt.length; start += FIRESTORE_BATCH_LIMIT) {
+      const batch = writeBatch(db);
+      missingResolvedAt.slice(start, start + FIRESTORE_BATCH_LIMIT).forEach(({ id, resolvedAt }) => {
+        batch.update(doc(db, 'tickets', id), { 'historySummary.resolvedAt': resolvedAt });
+      });
+      await batch.commit();
+    }
+
+    await setDoc(statsDoc, { ...stats, updatedAt: serverTimestamp(), backfilledAt: serverTimestamp() });
+    console.log(`[ticketStats] Backfill concluído: ${stats.total} tickets, ${missingResolvedAt.length} com resolvedAt estimado`);
+    return { ...stats, updatedAt: Date.now(), backfilledAt: Date.now() };
+  },
+};
@@ -0,0 +1,105 @@
+import { FunctionCall } from '@google/genai';
+
+// Executa as function calls de um turno do Gemini em paralelo.
+// - Consultas independentes (trackOrder, findCustomerOrders, searchFAQ) rodam ao mesmo tempo,
+//   até `concurrency` por vez.
+// - Ferramentas que abrem formulários ou mudam o rumo da conversa (chamado, troca, atendente)
+//   esperam as anteriores terminarem e seguram as seguintes, mantendo a ordem pedida pelo modelo.
+// - Cada ferramenta tem um tempo máximo; ao estourar, o resultado vira 'timeout' e o turno segue
+//   (a consulta em si não é cancelada e ainda pode exibir o resultado quando chegar).
+
+export type ToolRunStatus = 'ok' | 'error' | 'timeout';
+
+export interface ToolRunResult {
+  name: string;
+  args: Record<string, unknown>;
+  status: ToolRunStatus;
+  durationMs: number;
+  error?: string;
+}
+
+const DEFAULT_CONCURRENCY = 3;
+const DEFAULT_TIMEOUT_MS = 20000;
+const TOOL_TIMEOUTS_MS: Record<string, number> = {
+  trackOrder: 15000,
+  findCustomerOrders: 30000, // percorre todas as páginas de pedidos do cliente
+  searchFAQ: 12000,
+};
+const SEQUENTIAL_TOOLS = new Set(['openSupportTicket', 'initiateExchange', 'escalateToHuman']);
+
+class ToolTimeoutError extends Error {}
+
+const withTimeout = <T>(promise: Promise<T>, timeoutMs: number): Promise<T> => {
+  let timer: ReturnType<typeof setTimeout>;
+  const timeout = new Promise<never>((_, reject) => {
+    timer = setTimeout(() => reject(new ToolTimeoutError(`Tempo esgotado após ${timeoutMs}ms`)), timeoutMs);
+  });
+  return Promise.race([promise, timeout]).finally(() => clearTimeout(timer));
+};
+
+export const createToolScheduler = (options: { concurrency?: number; timeouts?: Record<string, number> } = {}) => {
+  const concurrency = options.concurrency || DEFAULT_CONCURRENCY;
+  const timeouts = { ...TOOL_TIMEOUTS_MS, ...options.timeouts };
+  const tasks: Array<Promise<ToolRunResult>> = [];
+  const waiting: Array<() => void> = [];
+  let running = 0;
+  let barrier: Promise<unknown> = Promise.resolve();
+
+  const acquire = () =>
+    new Promise<void>(resolve => {
+      if (running < concurrency) {
+        running++;
+        resolve();
+      } else {
+        waiting.push(resolve);
+      }
+    });
+
+  const release = () => {
+    const next = waiting.shift();
+    if (next) {
+      next();
+    } else {
+      running--;
+    }
+  };
+
+  // Agenda a execução de `call`; `execute` é quem de fato chama o serviço e atualiza o chat
+  const schedule = (call: FunctionCall, execute: () => Promise<void>): Promise<ToolRunResult> => {
+    const name = call.name || 'desconhecida';
+    const sequential = SEQUENTIAL_TOOLS.has(name);
+    const gate = sequential ? Promise.allSettled(tasks.slice()) : barrier;
+
+    const task = gate.then(acquire).then(async (): Promise<ToolRunResult> => {
+      const startedAt = performance.now();
+      let status: ToolRunStatus = 'ok';
+      let error: string | undefined;
+      try {
+        await withTimeout(execute(), timeouts[name] || DEFAULT_TIMEOUT_MS);
+      } catch (err) {
+        status = err instanceof ToolTimeoutError ? 'timeout' : 'error';
+        error = err instanceof Error ? err.message : String(err);
+        console.warn(`[toolScheduler] ${name} terminou com ${status}:`, error);
+      } finally {
+        release();
+      }
+      return { name, args: (call.args || {}) as Record<string, unknown>, status, durationMs: Math.round(performance.now() - startedAt), error };
+    });
+
+    tasks.push(task);
+    if (sequential) barrier = task;
+    return task;
+  };
+
+  // Espera todas as ferramentas agendadas (inclusive as agendadas enquanto espera), na ordem do modelo
+  const drain = async (): Promise<ToolRunResult[]> => {
+    let count: number;
+    do {
+      count = tasks.length;
+      await Promise.all(tasks);
+    } while (tasks.length !== count);
+    return Promise.all(tasks);
+  };
+
+  return { schedule, drain, size: () => tasks.length };
+};
@@ -1,11 +1,13 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from waits import StepWaiter
 
 async def run_test():
     pw = None
     browser = None
     context = None
+    steps = None
     
     try:
         # Start a Playwright session in asynchronous mode
@@ -29,6 +31,9 @@ async def run_test():
         # Open a new page in the browser context
         page = await context.new_page()
         
+        # Wait on real conditions (actionability, proxy calls, Firestore writes) instead of fixed sleeps
+        steps = StepWaiter(context, name="TC002")
+        
         # Navigate to your target URL and wait until the network request is committed
         await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
         
@@ -50,47 +55,47 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Acessar Portal do Cliente' button to start client login process and request 4-digit code.
         elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Acessar Portal do Cliente' button to start client login process and request 4-digit code.")
         
 
         # -> Input client email to request the 4-digit code.
         frame = context.pages[-1]
         # Input client email to request 4-digit code.
         elem = frame.locator('xpath=html/body/div/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('client@example.com')
+        await steps.fill(elem, 'client@example.com', "Input client email to request 4-digit code.")
         
 
         frame = context.pages[-1]
         # Click 'Enviar Código de Acesso' to request the 4-digit code.
         elem = frame.locator('xpath=html/body/div/div/div/div/div/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Enviar Código de Acesso' to request the 4-digit code.")
         
 
         # -> Retry sending the 4-digit code or check for alternative ways to obtain the code.
         frame = context.pages[-1]
         # Click 'Voltar para a página inicial' to reset and retry the process.
         elem = frame.locator('xpath=html/body/div/div/div/div/div/div[4]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Voltar para a página inicial' to reset and retry the process.")
         
 
         # -> Click on 'Acessar Portal do Cliente' to retry requesting the 4-digit code for client email.
         frame = context.pages[-1]
         # Click on 'Acessar Portal do Cliente' button to start client login process and request 4-digit code.
         elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Acessar Portal do Cliente' button to start client login process and request 4-digit code.")
         
 
         # -> Input client email and click 'Enviar Código de Acesso' to request the 4-digit code.
         frame = context.pages[-1]
         # Input client email to request 4-digit code.
         elem = frame.locator('xpath=html/body/div/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('client@example.com')
+        await steps.fill(elem, 'client@example.com', "Input client email to request 4-digit code.")
         
 
         frame = context.pages[-1]
         # Click 'Enviar Código de Acesso' to request the 4-digit code.
         elem = frame.locator('xpath=html/body/div/div/div/div/div/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Enviar Código de Acesso' to request the 4-digit code.")
         
 
         # --> Assertions to verify final state
@@ -99,9 +104,11 @@ async def run_test():
             await expect(frame.locator('text=Authentication Successful').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test failed: Authentication did not fail as expected when submitting an expired 4-digit code. The login should have been rejected with an expiration error message.")
-        await asyncio.sleep(5)
+        await steps.settle()
     
     finally:
+        if steps:
+            steps.report()
         if context:
             await context.close()
         if browser:
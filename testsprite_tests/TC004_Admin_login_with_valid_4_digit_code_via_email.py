@@ -1,11 +1,13 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from waits import StepWaiter
 
 async def run_test():
     pw = None
     browser = None
     context = None
+    steps = None
     
     try:
         # Start a Playwright session in asynchronous mode
@@ -29,6 +31,9 @@ async def run_test():
         # Open a new page in the browser context
         page = await context.new_page()
         
+        # Wait on real conditions (actionability, proxy calls, Firestore writes) instead of fixed sleeps
+        steps = StepWaiter(context, name="TC004")
+        
         # Navigate to your target URL and wait until the network request is committed
         await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
         
@@ -50,100 +55,100 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Acesso Administrativo' button to go to admin login page
         elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Acesso Administrativo' button to go to admin login page")
         
 
         # -> Input admin email 'admin@yoobe.co' in the email field to request the code.
         frame = context.pages[-1]
         # Input admin email to request code
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@yoobe.co')
+        await steps.fill(elem, 'admin@yoobe.co', "Input admin email to request code")
         
 
         # -> Input password '123456' and click 'Entrar' button to request the 4-digit code.
         frame = context.pages[-1]
         # Input admin password
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+        await steps.fill(elem, '123456', "Input admin password")
         
 
         frame = context.pages[-1]
         # Click 'Entrar' button to request 4-digit code
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Entrar' button to request 4-digit code")
         
 
         # -> Navigate back to admin login or 4-digit code input page to verify code sending and input.
         frame = context.pages[-1]
         # Click 'Sair' button to log out and return to login page
         elem = frame.locator('xpath=html/body/div/div/div/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Sair' button to log out and return to login page")
         
 
         # -> Click on 'Acesso Administrativo' button to navigate to admin login page.
         frame = context.pages[-1]
         # Click on 'Acesso Administrativo' button to go to admin login page
         elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Acesso Administrativo' button to go to admin login page")
         
 
         # -> Input admin email 'admin@yoobe.co' and password '123456' and click 'Entrar' to request the 4-digit code.
         frame = context.pages[-1]
         # Input admin email
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@yoobe.co')
+        await steps.fill(elem, 'admin@yoobe.co', "Input admin email")
         
 
         frame = context.pages[-1]
         # Input admin password
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+        await steps.fill(elem, '123456', "Input admin password")
         
 
         frame = context.pages[-1]
         # Click 'Entrar' button to request 4-digit code
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Entrar' button to request 4-digit code")
         
 
         # -> Check if there is any UI element or menu related to 4-digit code authentication or multi-factor authentication settings.
         frame = context.pages[-1]
         # Click on 'Configurações' to check for multi-factor authentication or code input settings
         elem = frame.locator('xpath=html/body/div/div/div/div/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Configurações' to check for multi-factor authentication or code input settings")
         
 
         # -> Navigate back to the main page and try to find any other navigation or login flow that might trigger the 4-digit code authentication.
         frame = context.pages[-1]
         # Click 'Sair' button to log out and return to main portal page
         elem = frame.locator('xpath=html/body/div/div/div/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Sair' button to log out and return to main portal page")
         
 
         # -> Click on 'Acesso Administrativo' button to navigate to admin login page and retry authentication flow.
         frame = context.pages[-1]
         # Click on 'Acesso Administrativo' button to go to admin login page
         elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Acesso Administrativo' button to go to admin login page")
         
 
         # -> Input admin email 'admin@yoobe.co' and password '123456' and click 'Entrar' to attempt login.
         frame = context.pages[-1]
         # Input admin email
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@yoobe.co')
+        await steps.fill(elem, 'admin@yoobe.co', "Input admin email")
         
 
         frame = context.pages[-1]
         # Input admin password
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+        await steps.fill(elem, '123456', "Input admin password")
         
 
         frame = context.pages[-1]
         # Click 'Entrar' button to attempt login
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Entrar' button to attempt login")
         
 
         # --> Assertions to verify final state
@@ -165,9 +170,11 @@ async def run_test():
         await expect(frame.locator('text=05/11/2025').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Ver').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Editar').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
+        await steps.settle()
     
     finally:
+        if steps:
+            steps.report()
         if context:
             await context.close()
         if browser:
@@ -1,11 +1,13 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from waits import StepWaiter
 
 async def run_test():
     pw = None
     browser = None
     context = None
+    steps = None
     
     try:
         # Start a Playwright session in asynchronous mode
@@ -29,6 +31,9 @@ async def run_test():
         # Open a new page in the browser context
         page = await context.new_page()
         
+        # Wait on real conditions (actionability, proxy calls, Firestore writes) instead of fixed sleeps
+        steps = StepWaiter(context, name="TC005")
+        
         # Navigate to your target URL and wait until the network request is committed
         await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
         
@@ -50,40 +55,40 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Acesso Administrativo' button to proceed to admin login
         elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Acesso Administrativo' button to proceed to admin login")
         
 
         # -> Input email and password, then click Entrar to login
         frame = context.pages[-1]
         # Input the email for admin login
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@yoobe.co')
+        await steps.fill(elem, 'admin@yoobe.co', "Input the email for admin login")
         
 
         frame = context.pages[-1]
         # Input the password for admin login
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+        await steps.fill(elem, '123456', "Input the password for admin login")
         
 
         frame = context.pages[-1]
         # Click the Entrar button to submit login form
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click the Entrar button to submit login form")
         
 
         # -> Click on 'Configurações' menu to access settings for OAuth credentials configuration
         frame = context.pages[-1]
         # Click on 'Configurações' menu to access settings for OAuth credentials configuration
         elem = frame.locator('xpath=html/body/div/div/div/div/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Configurações' menu to access settings for OAuth credentials configuration")
         
 
         # -> Click the 'Testar' button to send an authentication request to Cubbo Auth Proxy and verify the response for a valid OAuth token.
         frame = context.pages[-1]
         # Click the 'Testar' button to send authentication request to Cubbo Auth Proxy
         elem = frame.locator('xpath=html/body/div/div/div/main/div/div[2]/div/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click the 'Testar' button to send authentication request to Cubbo Auth Proxy")
         
 
         # --> Assertions to verify final state
@@ -92,9 +97,11 @@ async def run_test():
             await expect(frame.locator('text=Authentication Successful').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The Cubbo Auth Proxy did not authenticate correctly or did not return a valid OAuth token as expected.")
-        await asyncio.sleep(5)
+        await steps.settle()
     
     finally:
+        if steps:
+            steps.report()
         if context:
             await context.close()
         if browser:
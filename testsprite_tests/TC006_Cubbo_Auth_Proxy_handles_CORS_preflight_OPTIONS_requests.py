@@ -1,11 +1,13 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from waits import StepWaiter
 
 async def run_test():
     pw = None
     browser = None
     context = None
+    steps = None
     
     try:
         # Start a Playwright session in asynchronous mode
@@ -29,6 +31,9 @@ async def run_test():
         # Open a new page in the browser context
         page = await context.new_page()
         
+        # Wait on real conditions (actionability, proxy calls, Firestore writes) instead of fixed sleeps
+        steps = StepWaiter(context, name="TC006")
+        
         # Navigate to your target URL and wait until the network request is committed
         await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
         
@@ -48,17 +53,17 @@ async def run_test():
         # Interact with the page elements to simulate user flow
         # -> Send HTTP OPTIONS request to Cubbo Auth Proxy endpoint to verify CORS headers.
         await page.goto('http://localhost:3000/api/auth-proxy', timeout=10000)
-        await asyncio.sleep(3)
+        await steps.settle()
         
 
         # -> Send HTTP OPTIONS request to Cubbo Auth Proxy endpoint and verify response headers for CORS.
         await page.goto('http://localhost:3000/api/auth-proxy', timeout=10000)
-        await asyncio.sleep(3)
+        await steps.settle()
         
 
         # -> Send an explicit HTTP OPTIONS request to the Cubbo Auth Proxy endpoint and verify the response headers for CORS preflight compliance.
         await page.goto('http://localhost:3000/api/auth-proxy', timeout=10000)
-        await asyncio.sleep(3)
+        await steps.settle()
         
 
         # --> Assertions to verify final state
@@ -72,9 +77,11 @@ async def run_test():
         await expect(frame.locator('text=ou').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Acesso Administrativo').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=💬 Use nosso chatbot para atendimento rápido e eficiente').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
+        await steps.settle()
     
     finally:
+        if steps:
+            steps.report()
         if context:
             await context.close()
         if browser:
@@ -1,11 +1,13 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from waits import StepWaiter
 
 async def run_test():
     pw = None
     browser = None
     context = None
+    steps = None
     
     try:
         # Start a Playwright session in asynchronous mode
@@ -29,6 +31,9 @@ async def run_test():
         # Open a new page in the browser context
         page = await context.new_page()
         
+        # Wait on real conditions (actionability, proxy calls, Firestore writes) instead of fixed sleeps
+        steps = StepWaiter(context, name="TC007")
+        
         # Navigate to your target URL and wait until the network request is committed
         await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
         
@@ -50,112 +55,112 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Acessar Portal do Cliente' button to access client portal login.
         elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Acessar Portal do Cliente' button to access client portal login.")
         
 
         # -> Input client email A into the email field and click 'Enviar Código de Acesso' to request access code.
         frame = context.pages[-1]
         # Input client email A for login
         elem = frame.locator('xpath=html/body/div/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('clientA@example.com')
+        await steps.fill(elem, 'clientA@example.com', "Input client email A for login")
         
 
         frame = context.pages[-1]
         # Click 'Enviar Código de Acesso' to send access code
         elem = frame.locator('xpath=html/body/div/div/div/div/div/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Enviar Código de Acesso' to send access code")
         
 
         # -> Verify if the email input is correct and retry sending the access code or try a different client email.
         frame = context.pages[-1]
         # Re-input client email A to ensure correctness
         elem = frame.locator('xpath=html/body/div/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('clientA@example.com')
+        await steps.fill(elem, 'clientA@example.com', "Re-input client email A to ensure correctness")
         
 
         frame = context.pages[-1]
         # Retry clicking 'Enviar Código de Acesso' to send access code
         elem = frame.locator('xpath=html/body/div/div/div/div/div/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Retry clicking 'Enviar Código de Acesso' to send access code")
         
 
         # -> Go back to the main page to try alternative approach or test admin login for order search functionality.
         frame = context.pages[-1]
         # Click 'Voltar para a página inicial' to return to main page
         elem = frame.locator('xpath=html/body/div/div/div/div/div/div[4]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Voltar para a página inicial' to return to main page")
         
 
         # -> Click on 'Acesso Administrativo' to login as admin for order search testing.
         frame = context.pages[-1]
         # Click on 'Acesso Administrativo' button to access admin login.
         elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Acesso Administrativo' button to access admin login.")
         
 
         # -> Input admin email and password, then click Entrar to login as admin.
         frame = context.pages[-1]
         # Input admin email
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@yoobe.co')
+        await steps.fill(elem, 'admin@yoobe.co', "Input admin email")
         
 
         frame = context.pages[-1]
         # Input admin password
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+        await steps.fill(elem, '123456', "Input admin password")
         
 
         frame = context.pages[-1]
         # Click Entrar button to login as admin
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click Entrar button to login as admin")
         
 
         # -> Navigate to 'Pedidos Cubbo' section to access order search functionality.
         frame = context.pages[-1]
         # Click on 'Pedidos Cubbo' menu to access order search functionality
         elem = frame.locator('xpath=html/body/div/div/div/div/nav/a[4]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Pedidos Cubbo' menu to access order search functionality")
         
 
         # -> Input client email A and order code belonging to client A, then click 'Buscar' to verify order details are returned.
         frame = context.pages[-1]
         # Click 'Buscar por Cliente' tab to ensure searching by client email is active
         elem = frame.locator('xpath=html/body/div/div/div/main/div/div[2]/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Buscar por Cliente' tab to ensure searching by client email is active")
         
 
         frame = context.pages[-1]
         # Input client email A for order search
         elem = frame.locator('xpath=html/body/div/div/div/main/div/div[2]/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('clientA@example.com')
+        await steps.fill(elem, 'clientA@example.com', "Input client email A for order search")
         
 
         frame = context.pages[-1]
         # Click 'Buscar' button to perform order search by client email
         elem = frame.locator('xpath=html/body/div/div/div/main/div/div[2]/div/div[3]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Buscar' button to perform order search by client email")
         
 
         # -> Switch to 'Buscar por Pedido' tab, input an order code that belongs to clientA@example.com, and click 'Buscar' to verify order details are returned.
         frame = context.pages[-1]
         # Click 'Buscar por Pedido' tab to search by order code
         elem = frame.locator('xpath=html/body/div/div/div/main/div/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Buscar por Pedido' tab to search by order code")
         
 
         # -> Input order code 'LP-12345' that belongs to client A and click 'Buscar' to verify order details are returned.
         frame = context.pages[-1]
         # Input order code LP-12345 for client A
         elem = frame.locator('xpath=html/body/div/div/div/main/div/div[2]/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('LP-12345')
+        await steps.fill(elem, 'LP-12345', "Input order code LP-12345 for client A")
         
 
         frame = context.pages[-1]
         # Click 'Buscar' button to perform order search by order code
         elem = frame.locator('xpath=html/body/div/div/div/main/div/div[2]/div/div[3]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Buscar' button to perform order search by order code")
         
 
         # --> Assertions to verify final state
@@ -164,9 +169,11 @@ async def run_test():
             await expect(frame.locator('text=Unauthorized Access Detected').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The order tracking search did not prevent unauthorized access as required by the test plan. Orders belonging to other clients were accessible, violating access control.")
-        await asyncio.sleep(5)
+        await steps.settle()
     
     finally:
+        if steps:
+            steps.report()
         if context:
             await context.close()
         if browser:
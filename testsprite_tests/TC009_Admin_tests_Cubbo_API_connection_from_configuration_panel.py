@@ -1,11 +1,14 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from waits import StepWaiter
+from admin_session import ADMIN_SESSION
 
 async def run_test():
     pw = None
     browser = None
     context = None
+    steps = None
     
     try:
         # Start a Playwright session in asynchronous mode
@@ -22,13 +25,16 @@ async def run_test():
             ],
         )
         
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Create a new browser context carrying the shared admin session (logs in once per run)
+        context = await ADMIN_SESSION.new_context(browser)
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
         
+        # Wait on real conditions (actionability, proxy calls, Firestore writes) instead of fixed sleeps
+        steps = StepWaiter(context, name="TC009")
+        
         # Navigate to your target URL and wait until the network request is committed
         await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
         
@@ -46,44 +52,22 @@ async def run_test():
                 pass
         
         # Interact with the page elements to simulate user flow
-        # -> Click on 'Acesso Administrativo' button to enter admin dashboard
-        frame = context.pages[-1]
-        # Click on 'Acesso Administrativo' button to enter admin dashboard
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input admin email and password, then click Entrar to login
-        frame = context.pages[-1]
-        # Input admin email
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@yoobe.co')
-        
-
-        frame = context.pages[-1]
-        # Input admin password
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
-        
-
-        frame = context.pages[-1]
-        # Click Entrar button to login
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Admin session restored from the shared storage state; re-login only if it was rejected.
+        await ADMIN_SESSION.ensure_logged_in(page)
         
 
         # -> Click on 'Configurações' menu to open API configuration panel
         frame = context.pages[-1]
         # Click on 'Configurações' menu to open API configuration panel
         elem = frame.locator('xpath=html/body/div/div/div/div/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Configurações' menu to open API configuration panel")
         
 
         # -> Click the 'Testar' button to test the Cubbo API connection and verify the response message for success or error.
         frame = context.pages[-1]
         # Click the 'Testar' button to test the Cubbo API connection
         elem = frame.locator('xpath=html/body/div/div/div/main/div/div[2]/div/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click the 'Testar' button to test the Cubbo API connection")
         
 
         # --> Assertions to verify final state
@@ -91,9 +75,11 @@ async def run_test():
         await expect(frame.locator('text=Configurações').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Gerencie a integração com a API da Cubbo. A autenticação é gerenciada de forma segura por um serviço de proxy.').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Testar').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
+        await steps.settle()
     
     finally:
+        if steps:
+            steps.report()
         if context:
             await context.close()
         if browser:
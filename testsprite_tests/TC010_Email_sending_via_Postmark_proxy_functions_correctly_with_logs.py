@@ -1,11 +1,14 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from waits import StepWaiter
+from admin_session import ADMIN_SESSION
 
 async def run_test():
     pw = None
     browser = None
     context = None
+    steps = None
     
     try:
         # Start a Playwright session in asynchronous mode
@@ -22,13 +25,16 @@ async def run_test():
             ],
         )
         
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Create a new browser context carrying the shared admin session (logs in once per run)
+        context = await ADMIN_SESSION.new_context(browser)
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
         
+        # Wait on real conditions (actionability, proxy calls, Firestore writes) instead of fixed sleeps
+        steps = StepWaiter(context, name="TC010")
+        
         # Navigate to your target URL and wait until the network request is committed
         await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
         
@@ -46,102 +52,80 @@ async def run_test():
                 pass
         
         # Interact with the page elements to simulate user flow
-        # -> Click on 'Acesso Administrativo' to login as admin for testing email sending and logs
-        frame = context.pages[-1]
-        # Click on 'Acesso Administrativo' button to access admin login
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input admin email and password and click Entrar to login
-        frame = context.pages[-1]
-        # Input admin email
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@yoobe.co')
-        
-
-        frame = context.pages[-1]
-        # Input admin password
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
-        
-
-        frame = context.pages[-1]
-        # Click Entrar button to login as admin
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Admin session restored from the shared storage state; re-login only if it was rejected.
+        await ADMIN_SESSION.ensure_logged_in(page)
         
 
         # -> Navigate to 'Status do Sistema' to check logs for email send attempts
         frame = context.pages[-1]
         # Click on 'Status do Sistema' menu to view system status and logs
         elem = frame.locator('xpath=html/body/div/div/div/div/nav/a[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Status do Sistema' menu to view system status and logs")
         
 
         # -> Navigate to 'Chamados de Suporte' to create a support ticket that triggers an email send
         frame = context.pages[-1]
         # Click on 'Chamados de Suporte' menu to create a support ticket and trigger email sending
         elem = frame.locator('xpath=html/body/div/div/div/div/nav/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Chamados de Suporte' menu to create a support ticket and trigger email sending")
         
 
         # -> Click 'Criar Chamado' button to open the form for creating a new support ticket
         frame = context.pages[-1]
         # Click 'Criar Chamado' button to open new support ticket form
         elem = frame.locator('xpath=html/body/div/div/div/main/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Criar Chamado' button to open new support ticket form")
         
 
         # -> Fill the form fields with test data and submit to trigger email sending
         frame = context.pages[-1]
         # Input client name
         elem = frame.locator('xpath=html/body/div/div/div/dialog/div/div/form/div/label/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Client')
+        await steps.fill(elem, 'Test Client', "Input client name")
         
 
         frame = context.pages[-1]
         # Input client email
         elem = frame.locator('xpath=html/body/div/div/div/dialog/div/div/form/div/label[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testclient@example.com')
+        await steps.fill(elem, 'testclient@example.com', "Input client email")
         
 
         frame = context.pages[-1]
         # Input client phone
         elem = frame.locator('xpath=html/body/div/div/div/dialog/div/div/form/div/label[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('1234567890')
+        await steps.fill(elem, '1234567890', "Input client phone")
         
 
         frame = context.pages[-1]
         # Input subject
         elem = frame.locator('xpath=html/body/div/div/div/dialog/div/div/form/label/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Subject')
+        await steps.fill(elem, 'Test Subject', "Input subject")
         
 
         frame = context.pages[-1]
         # Input description
         elem = frame.locator('xpath=html/body/div/div/div/dialog/div/div/form/label[2]/textarea').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('This is a test support ticket to trigger email sending.')
+        await steps.fill(elem, 'This is a test support ticket to trigger email sending.', "Input description")
         
 
         frame = context.pages[-1]
         # Click 'Criar Chamado' button to submit the support ticket and trigger email sending
         elem = frame.locator('xpath=html/body/div/div/div/dialog/div/div/form/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Criar Chamado' button to submit the support ticket and trigger email sending")
         
 
         # -> Navigate to 'Status do Sistema' to check logs for email send attempts and results
         frame = context.pages[-1]
         # Click on 'Status do Sistema' menu to check logs for email send attempts
         elem = frame.locator('xpath=html/body/div/div/div/div/nav/a[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Status do Sistema' menu to check logs for email send attempts")
         
 
         # -> Navigate to 'Configurações' to check for email logs or Postmark proxy settings
         frame = context.pages[-1]
         # Click on 'Configurações' menu to check for email logs or Postmark proxy settings
         elem = frame.locator('xpath=html/body/div/div/div/div/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Configurações' menu to check for email logs or Postmark proxy settings")
         
 
         # -> Look for any visible logs or email proxy status related to Postmark or email sending on this page
@@ -152,7 +136,7 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Status do Sistema' menu to re-check for email send logs or results
         elem = frame.locator('xpath=html/body/div/div/div/div/nav/a[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Status do Sistema' menu to re-check for email send logs or results")
         
 
         # --> Assertions to verify final state
@@ -168,9 +152,11 @@ async def run_test():
         await expect(frame.locator('text=reCAPTCHA invisível configurado para proteger o login por telefone.').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=API da Cubbo').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=A conexão com a API da Cubbo foi bem-sucedida.').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
+        await steps.settle()
     
     finally:
+        if steps:
+            steps.report()
         if context:
             await context.close()
         if browser:
@@ -1,11 +1,13 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from waits import StepWaiter
 
 async def run_test():
     pw = None
     browser = None
     context = None
+    steps = None
     
     try:
         # Start a Playwright session in asynchronous mode
@@ -29,6 +31,9 @@ async def run_test():
         # Open a new page in the browser context
         page = await context.new_page()
         
+        # Wait on real conditions (actionability, proxy calls, Firestore writes) instead of fixed sleeps
+        steps = StepWaiter(context, name="TC011")
+        
         # Navigate to your target URL and wait until the network request is committed
         await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
         
@@ -50,26 +55,26 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Acesso Administrativo' button to access admin login page
         elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Acesso Administrativo' button to access admin login page")
         
 
         # -> Input email 'admin@yoobe.co' and password '123456' and submit the login form to test authentication rejection for unauthorized domain.
         frame = context.pages[-1]
         # Input email for admin login
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@yoobe.co')
+        await steps.fill(elem, 'admin@yoobe.co', "Input email for admin login")
         
 
         frame = context.pages[-1]
         # Input password for admin login
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+        await steps.fill(elem, '123456', "Input password for admin login")
         
 
         frame = context.pages[-1]
         # Click 'Entrar' button to submit login form
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Entrar' button to submit login form")
         
 
         # --> Assertions to verify final state
@@ -78,9 +83,11 @@ async def run_test():
             await expect(frame.locator('text=Login Successful').first).to_be_visible(timeout=5000)
         except AssertionError:
             raise AssertionError('Test failed: Authentication request from unauthorized domain was not rejected as expected. Login should be blocked with an error indicating the domain is not allowed.')
-        await asyncio.sleep(5)
+        await steps.settle()
     
     finally:
+        if steps:
+            steps.report()
         if context:
             await context.close()
         if browser:
@@ -1,11 +1,13 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from waits import StepWaiter
 
 async def run_test():
     pw = None
     browser = None
     context = None
+    steps = None
     
     try:
         # Start a Playwright session in asynchronous mode
@@ -29,6 +31,9 @@ async def run_test():
         # Open a new page in the browser context
         page = await context.new_page()
         
+        # Wait on real conditions (actionability, proxy calls, Firestore writes) instead of fixed sleeps
+        steps = StepWaiter(context, name="TC012")
+        
         # Navigate to your target URL and wait until the network request is committed
         await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
         
@@ -50,34 +55,34 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Acessar Portal do Cliente' button to open client login page
         elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Acessar Portal do Cliente' button to open client login page")
         
 
         # -> Input client email and click 'Enviar Código de Acesso' to receive access code.
         frame = context.pages[-1]
         # Input client email to receive access code
         elem = frame.locator('xpath=html/body/div/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('client@example.com')
+        await steps.fill(elem, 'client@example.com', "Input client email to receive access code")
         
 
         frame = context.pages[-1]
         # Click 'Enviar Código de Acesso' button to send access code
         elem = frame.locator('xpath=html/body/div/div/div/div/div/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Enviar Código de Acesso' button to send access code")
         
 
         # -> Check if there is an alternative login or retry option or navigate back to the initial page to try a different approach.
         frame = context.pages[-1]
         # Click '← Voltar para a página inicial' to go back to the initial page and try alternative login or navigation
         elem = frame.locator('xpath=html/body/div/div/div/div/div/div[4]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click '← Voltar para a página inicial' to go back to the initial page and try alternative login or navigation")
         
 
         # -> Click on the chatbot prompt or icon to open the chatbot interface and enter a valid order-related question.
         frame = context.pages[-1]
         # Click on chatbot prompt or icon to open chatbot interface
         elem = frame.locator('xpath=html/body/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on chatbot prompt or icon to open chatbot interface")
         
 
         # --> Assertions to verify final state
@@ -86,9 +91,11 @@ async def run_test():
             await expect(frame.locator('text=Order Confirmation Successful').first).to_be_visible(timeout=30000)
         except AssertionError:
             raise AssertionError("Test case failed: The chatbot on the client dashboard did not use Google Gemini AI or Cubbo API proxy to process and respond to order tracking queries as expected.")
-        await asyncio.sleep(5)
+        await steps.settle()
     
     finally:
+        if steps:
+            steps.report()
         if context:
             await context.close()
         if browser:
@@ -1,11 +1,13 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from waits import StepWaiter
 
 async def run_test():
     pw = None
     browser = None
     context = None
+    steps = None
     
     try:
         # Start a Playwright session in asynchronous mode
@@ -29,6 +31,9 @@ async def run_test():
         # Open a new page in the browser context
         page = await context.new_page()
         
+        # Wait on real conditions (actionability, proxy calls, Firestore writes) instead of fixed sleeps
+        steps = StepWaiter(context, name="TC013")
+        
         # Navigate to your target URL and wait until the network request is committed
         await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
         
@@ -50,46 +55,46 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Acessar Portal do Cliente' button to login as client user
         elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Acessar Portal do Cliente' button to login as client user")
         
 
         # -> Input client user email and click 'Enviar Código de Acesso' button to request access code.
         frame = context.pages[-1]
         # Input client user email
         elem = frame.locator('xpath=html/body/div/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('client@example.com')
+        await steps.fill(elem, 'client@example.com', "Input client user email")
         
 
         frame = context.pages[-1]
         # Click 'Enviar Código de Acesso' button to send access code
         elem = frame.locator('xpath=html/body/div/div/div/div/div/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Enviar Código de Acesso' button to send access code")
         
 
         # -> Retry sending access code or try alternative login method if available.
         frame = context.pages[-1]
         # Retry input with admin email to check if access code sending works
         elem = frame.locator('xpath=html/body/div/div/div/div/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@yoobe.co')
+        await steps.fill(elem, 'admin@yoobe.co', "Retry input with admin email to check if access code sending works")
         
 
         frame = context.pages[-1]
         # Click 'Enviar Código de Acesso' button to retry sending access code
         elem = frame.locator('xpath=html/body/div/div/div/div/div/form/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Enviar Código de Acesso' button to retry sending access code")
         
 
         # -> Input the 4-digit access code and click 'Verificar e Acessar' button to complete login.
         frame = context.pages[-1]
         # Input the 4-digit access code
         elem = frame.locator('xpath=html/body/div/div/div/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('1234')
+        await steps.fill(elem, '1234', "Input the 4-digit access code")
         
 
         frame = context.pages[-1]
         # Click 'Verificar e Acessar' button to verify code and login
         elem = frame.locator('xpath=html/body/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Verificar e Acessar' button to verify code and login")
         
 
         # --> Assertions to verify final state
@@ -98,9 +103,11 @@ async def run_test():
             await expect(frame.locator('text=Support Ticket Created Successfully').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The end-to-end flow for creating, viewing, and replying to a support ticket did not complete successfully as expected.")
-        await asyncio.sleep(5)
+        await steps.settle()
     
     finally:
+        if steps:
+            steps.report()
         if context:
             await context.close()
         if browser:
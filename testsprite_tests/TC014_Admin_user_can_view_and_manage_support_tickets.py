@@ -1,11 +1,14 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from waits import StepWaiter
+from admin_session import ADMIN_SESSION
 
 async def run_test():
     pw = None
     browser = None
     context = None
+    steps = None
     
     try:
         # Start a Playwright session in asynchronous mode
@@ -22,13 +25,16 @@ async def run_test():
             ],
         )
         
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Create a new browser context carrying the shared admin session (logs in once per run)
+        context = await ADMIN_SESSION.new_context(browser)
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
         
+        # Wait on real conditions (actionability, proxy calls, Firestore writes) instead of fixed sleeps
+        steps = StepWaiter(context, name="TC014")
+        
         # Navigate to your target URL and wait until the network request is committed
         await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
         
@@ -46,70 +52,48 @@ async def run_test():
                 pass
         
         # Interact with the page elements to simulate user flow
-        # -> Click on 'Acesso Administrativo' to proceed to admin login.
-        frame = context.pages[-1]
-        # Click on 'Acesso Administrativo' button to go to admin login page
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input admin credentials and click Entrar to login.
-        frame = context.pages[-1]
-        # Input admin email
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@yoobe.co')
-        
-
-        frame = context.pages[-1]
-        # Input admin password
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
-        
-
-        frame = context.pages[-1]
-        # Click Entrar button to login as admin
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Admin session restored from the shared storage state; re-login only if it was rejected.
+        await ADMIN_SESSION.ensure_logged_in(page)
         
 
         # -> Open detail modal for the first ticket by clicking the 'Ver' button.
         frame = context.pages[-1]
         # Click 'Ver' button for the first ticket to open detail modal
         elem = frame.locator('xpath=html/body/div/div/div/main/div/div[2]/table/tbody/tr/td[6]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Ver' button for the first ticket to open detail modal")
         
 
         # -> Input a response in the textarea, change the ticket status to 'Em Andamento', and submit the response.
         frame = context.pages[-1]
         # Input a response message in the response textarea
         elem = frame.locator('xpath=html/body/div/div/div/dialog[2]/div/form[2]/textarea').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test response from admin to verify update functionality.')
+        await steps.fill(elem, 'Test response from admin to verify update functionality.', "Input a response message in the response textarea")
         
 
         frame = context.pages[-1]
         # Click 'Enviar Resposta' button to submit the response and status update
         elem = frame.locator('xpath=html/body/div/div/div/dialog[2]/div/form[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Enviar Resposta' button to submit the response and status update")
         
 
         # -> Open detail modal for the second ticket to verify details and interaction history.
         frame = context.pages[-1]
         # Click 'Ver' button for the second ticket to open detail modal
         elem = frame.locator('xpath=html/body/div/div/div/main/div/div[2]/table/tbody/tr[2]/td[6]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Ver' button for the second ticket to open detail modal")
         
 
         # -> Input a response in the textarea, change the ticket status to 'Resolvido', and submit the response to verify changes are saved and reflected.
         frame = context.pages[-1]
         # Input a response message in the response textarea
         elem = frame.locator('xpath=html/body/div/div/div/dialog[2]/div/form[2]/textarea').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Closing this ticket as issue resolved.')
+        await steps.fill(elem, 'Closing this ticket as issue resolved.', "Input a response message in the response textarea")
         
 
         frame = context.pages[-1]
         # Click 'Enviar Resposta' button to submit the response and status update
         elem = frame.locator('xpath=html/body/div/div/div/dialog[2]/div/form[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Enviar Resposta' button to submit the response and status update")
         
 
         # --> Assertions to verify final state
@@ -144,9 +128,11 @@ async def run_test():
         await expect(frame.locator('text=aberto').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=media').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=04/11/2025').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
+        await steps.settle()
     
     finally:
+        if steps:
+            steps.report()
         if context:
             await context.close()
         if browser:
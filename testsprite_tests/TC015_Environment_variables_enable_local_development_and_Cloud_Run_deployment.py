@@ -1,11 +1,14 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from waits import StepWaiter
+from admin_session import ADMIN_SESSION
 
 async def run_test():
     pw = None
     browser = None
     context = None
+    steps = None
     
     try:
         # Start a Playwright session in asynchronous mode
@@ -22,13 +25,16 @@ async def run_test():
             ],
         )
         
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Create a new browser context carrying the shared admin session (logs in once per run)
+        context = await ADMIN_SESSION.new_context(browser)
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
         
+        # Wait on real conditions (actionability, proxy calls, Firestore writes) instead of fixed sleeps
+        steps = StepWaiter(context, name="TC015")
+        
         # Navigate to your target URL and wait until the network request is committed
         await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
         
@@ -46,122 +52,100 @@ async def run_test():
                 pass
         
         # Interact with the page elements to simulate user flow
-        # -> Click on 'Acesso Administrativo' button to proceed to admin login.
-        frame = context.pages[-1]
-        # Click on 'Acesso Administrativo' button to access admin login.
-        elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input admin email and password, then click 'Entrar' to login.
-        frame = context.pages[-1]
-        # Input admin email
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@yoobe.co')
-        
-
-        frame = context.pages[-1]
-        # Input admin password
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
-        
-
-        frame = context.pages[-1]
-        # Click 'Entrar' button to submit login form
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        # -> Admin session restored from the shared storage state; re-login only if it was rejected.
+        await ADMIN_SESSION.ensure_logged_in(page)
         
 
         # -> Navigate to 'Pedidos Cubbo' section to test order search by order ID and customer email.
         frame = context.pages[-1]
         # Click on 'Pedidos Cubbo' to access order search functionality.
         elem = frame.locator('xpath=html/body/div/div/div/div/nav/a[4]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Pedidos Cubbo' to access order search functionality.")
         
 
         # -> Click on 'Buscar por Pedido' tab to test order search by order ID with and without '#' prefix.
         frame = context.pages[-1]
         # Click on 'Buscar por Pedido' tab to switch to order ID search.
         elem = frame.locator('xpath=html/body/div/div/div/main/div/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Buscar por Pedido' tab to switch to order ID search.")
         
 
         # -> Input order ID with '#' prefix and click 'Buscar' to test order search by order ID with prefix.
         frame = context.pages[-1]
         # Input order ID with '#' prefix
         elem = frame.locator('xpath=html/body/div/div/div/main/div/div[2]/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('#LP-12345')
+        await steps.fill(elem, '#LP-12345', "Input order ID with '#' prefix")
         
 
         frame = context.pages[-1]
         # Click 'Buscar' button to search order by ID with '#' prefix
         elem = frame.locator('xpath=html/body/div/div/div/main/div/div[2]/div/div[3]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Buscar' button to search order by ID with '#' prefix")
         
 
         # -> Clear the input field, input order ID without '#' prefix, and click 'Buscar' to test order search by order ID without prefix.
         frame = context.pages[-1]
         # Click 'Limpar' button to clear the order ID input field
         elem = frame.locator('xpath=html/body/div/div/div/main/div/div[2]/div/div[4]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Limpar' button to clear the order ID input field")
         
 
         frame = context.pages[-1]
         # Input order ID without '#' prefix
         elem = frame.locator('xpath=html/body/div/div/div/main/div/div[2]/div/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('LP-12345')
+        await steps.fill(elem, 'LP-12345', "Input order ID without '#' prefix")
         
 
         frame = context.pages[-1]
         # Click 'Buscar' button to search order by ID without '#' prefix
         elem = frame.locator('xpath=html/body/div/div/div/main/div/div[2]/div/div[3]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Buscar' button to search order by ID without '#' prefix")
         
 
         # -> Switch to 'Buscar por Cliente' tab to test order search by customer email.
         frame = context.pages[-1]
         # Click on 'Buscar por Cliente' tab to switch to customer email search.
         elem = frame.locator('xpath=html/body/div/div/div/main/div/div[2]/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Buscar por Cliente' tab to switch to customer email search.")
         
 
         # -> Input a test customer email and click 'Buscar' to test order search by customer email.
         frame = context.pages[-1]
         # Input test customer email
         elem = frame.locator('xpath=html/body/div/div/div/main/div/div[2]/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testcustomer@example.com')
+        await steps.fill(elem, 'testcustomer@example.com', "Input test customer email")
         
 
         frame = context.pages[-1]
         # Click 'Buscar' button to search order by customer email
         elem = frame.locator('xpath=html/body/div/div/div/main/div/div[2]/div/div[3]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Buscar' button to search order by customer email")
         
 
         # -> Input a test phone number and click 'Buscar' to test order search by customer phone number.
         frame = context.pages[-1]
         # Click 'Limpar' button to clear the email input field
         elem = frame.locator('xpath=html/body/div/div/div/main/div/div[2]/div/div[4]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Limpar' button to clear the email input field")
         
 
         frame = context.pages[-1]
         # Input test customer phone number
         elem = frame.locator('xpath=html/body/div/div/div/main/div/div[2]/div/div[2]/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('(11) 99999-9999')
+        await steps.fill(elem, '(11) 99999-9999', "Input test customer phone number")
         
 
         frame = context.pages[-1]
         # Click 'Buscar' button to search order by customer phone number
         elem = frame.locator('xpath=html/body/div/div/div/main/div/div[2]/div/div[3]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Buscar' button to search order by customer phone number")
         
 
         # -> Proceed to deploy the application and services to Cloud Run with environment variables set and verify deployed services respond correctly and integration points work.
         frame = context.pages[-1]
         # Click 'Sair' button to log out from admin dashboard before deployment testing.
         elem = frame.locator('xpath=html/body/div/div/div/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Sair' button to log out from admin dashboard before deployment testing.")
         
 
         # --> Assertions to verify final state
@@ -174,9 +158,11 @@ async def run_test():
         await expect(frame.locator('text=Acessar Portal do Cliente').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Acesso Administrativo').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=💬 Use nosso chatbot para atendimento rápido e eficiente').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
+        await steps.settle()
     
     finally:
+        if steps:
+            steps.report()
         if context:
             await context.close()
         if browser:
@@ -1,11 +1,13 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from waits import StepWaiter
 
 async def run_test():
     pw = None
     browser = None
     context = None
+    steps = None
     
     try:
         # Start a Playwright session in asynchronous mode
@@ -29,6 +31,9 @@ async def run_test():
         # Open a new page in the browser context
         page = await context.new_page()
         
+        # Wait on real conditions (actionability, proxy calls, Firestore writes) instead of fixed sleeps
+        steps = StepWaiter(context, name="TC016")
+        
         # Navigate to your target URL and wait until the network request is committed
         await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
         
@@ -50,149 +55,149 @@ async def run_test():
         frame = context.pages[-1]
         # Click on 'Acesso Administrativo' button to access admin login.
         elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Acesso Administrativo' button to access admin login.")
         
 
         # -> Input invalid email and password to trigger authentication failure and click Entrar.
         frame = context.pages[-1]
         # Input invalid email to trigger authentication failure.
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('invalid@user.com')
+        await steps.fill(elem, 'invalid@user.com', "Input invalid email to trigger authentication failure.")
         
 
         frame = context.pages[-1]
         # Input invalid password to trigger authentication failure.
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('wrongpassword')
+        await steps.fill(elem, 'wrongpassword', "Input invalid password to trigger authentication failure.")
         
 
         frame = context.pages[-1]
         # Click Entrar button to submit invalid credentials and trigger authentication failure.
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click Entrar button to submit invalid credentials and trigger authentication failure.")
         
 
         # -> Navigate to the Cubbo API call failure test interface or trigger the API call with invalid token.
         frame = context.pages[-1]
         # Click on 'Acesso Administrativo' or relevant element to navigate or refresh for next test if needed.
         elem = frame.locator('xpath=html/body/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Acesso Administrativo' or relevant element to navigate or refresh for next test if needed.")
         
 
         # -> Trigger Cubbo API call failure by navigating to the order search functionality in AdminOrders component and using an invalid token or invalid API call.
         frame = context.pages[-1]
         # Click on 'Acesso Administrativo' or relevant element to navigate to AdminOrders or order search functionality to trigger Cubbo API call failure.
         elem = frame.locator('xpath=html/body/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Acesso Administrativo' or relevant element to navigate to AdminOrders or order search functionality to trigger Cubbo API call failure.")
         
 
         # -> Trigger Cubbo API call failure by navigating to the AdminOrders component or relevant interface and using an invalid token or invalid API call.
         await page.goto('http://localhost:3000/admin/orders', timeout=10000)
-        await asyncio.sleep(3)
+        await steps.settle()
         
 
         # -> Click on 'Acesso Administrativo' to access admin interface and proceed with Cubbo API call failure test.
         frame = context.pages[-1]
         # Click on 'Acesso Administrativo' button to access admin interface for Cubbo API call failure test.
         elem = frame.locator('xpath=html/body/div/div/div/div/div/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Acesso Administrativo' button to access admin interface for Cubbo API call failure test.")
         
 
         # -> Input valid admin credentials and login to access AdminOrders component for Cubbo API call failure test.
         frame = context.pages[-1]
         # Input valid admin email for login.
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin@yoobe.co')
+        await steps.fill(elem, 'admin@yoobe.co', "Input valid admin email for login.")
         
 
         frame = context.pages[-1]
         # Input valid admin password for login.
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123456')
+        await steps.fill(elem, '123456', "Input valid admin password for login.")
         
 
         frame = context.pages[-1]
         # Click Entrar button to login with valid credentials.
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/form/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click Entrar button to login with valid credentials.")
         
 
         # -> Click on 'Pedidos Cubbo' menu to trigger Cubbo API call failure with invalid token or simulate failure.
         frame = context.pages[-1]
         # Click on 'Pedidos Cubbo' menu to access Cubbo orders and trigger API call failure.
         elem = frame.locator('xpath=html/body/div/div/div/div/nav/a[4]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Pedidos Cubbo' menu to access Cubbo orders and trigger API call failure.")
         
 
         # -> Trigger Cubbo API call failure by entering invalid token or invalid search parameters and clicking Buscar button.
         frame = context.pages[-1]
         # Input invalid email to simulate invalid token for Cubbo API call failure.
         elem = frame.locator('xpath=html/body/div/div/div/main/div/div[2]/div/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('invalidtoken@example.com')
+        await steps.fill(elem, 'invalidtoken@example.com', "Input invalid email to simulate invalid token for Cubbo API call failure.")
         
 
         frame = context.pages[-1]
         # Click Buscar button to trigger Cubbo API call with invalid token and cause failure.
         elem = frame.locator('xpath=html/body/div/div/div/main/div/div[2]/div/div[3]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click Buscar button to trigger Cubbo API call with invalid token and cause failure.")
         
 
         # -> Trigger Postmark email sending failure by simulating bad API key or invalid email sending action.
         frame = context.pages[-1]
         # Click on 'Chamados de Suporte' to navigate to support tickets for triggering Postmark email sending failure.
         elem = frame.locator('xpath=html/body/div/div/div/div/nav/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click on 'Chamados de Suporte' to navigate to support tickets for triggering Postmark email sending failure.")
         
 
         # -> Click 'Criar Chamado' button to open the new support ticket form and trigger Postmark email sending failure.
         frame = context.pages[-1]
         # Click 'Criar Chamado' button to open new support ticket form for triggering Postmark email sending failure.
         elem = frame.locator('xpath=html/body/div/div/div/main/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Criar Chamado' button to open new support ticket form for triggering Postmark email sending failure.")
         
 
         # -> Fill the new support ticket form with invalid email and other required fields, then submit to trigger Postmark email sending failure.
         frame = context.pages[-1]
         # Input client name for new support ticket.
         elem = frame.locator('xpath=html/body/div/div/div/dialog/div/div/form/div/label/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test User')
+        await steps.fill(elem, 'Test User', "Input client name for new support ticket.")
         
 
         frame = context.pages[-1]
         # Input invalid email to trigger Postmark email sending failure.
         elem = frame.locator('xpath=html/body/div/div/div/dialog/div/div/form/div/label[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('invalid-email-format')
+        await steps.fill(elem, 'invalid-email-format', "Input invalid email to trigger Postmark email sending failure.")
         
 
         frame = context.pages[-1]
         # Input phone number for new support ticket.
         elem = frame.locator('xpath=html/body/div/div/div/dialog/div/div/form/div/label[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('1234567890')
+        await steps.fill(elem, '1234567890', "Input phone number for new support ticket.")
         
 
         frame = context.pages[-1]
         # Input subject for new support ticket.
         elem = frame.locator('xpath=html/body/div/div/div/dialog/div/div/form/label/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Subject for Email Failure')
+        await steps.fill(elem, 'Test Subject for Email Failure', "Input subject for new support ticket.")
         
 
         frame = context.pages[-1]
         # Input description for new support ticket.
         elem = frame.locator('xpath=html/body/div/div/div/dialog/div/div/form/label[2]/textarea').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('This is a test description to trigger Postmark email sending failure.')
+        await steps.fill(elem, 'This is a test description to trigger Postmark email sending failure.', "Input description for new support ticket.")
         
 
         frame = context.pages[-1]
         # Click 'Criar Chamado' button to submit the new support ticket and trigger Postmark email sending failure.
         elem = frame.locator('xpath=html/body/div/div/div/dialog/div/div/form/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click 'Criar Chamado' button to submit the new support ticket and trigger Postmark email sending failure.")
         
 
         # -> Close the new support ticket form, then attempt to trigger Postmark email sending failure by other means such as editing existing ticket or simulating email failure with valid email format.
         frame = context.pages[-1]
         # Click '✕' button to close the new support ticket form.
         elem = frame.locator('xpath=html/body/div/div/div/dialog/div/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, "Click '✕' button to close the new support ticket form.")
         
 
         # --> Assertions to verify final state
@@ -228,9 +233,11 @@ async def run_test():
         await expect(frame.locator('text=Status (Aberto, Em Andamento, Resolvido, Fechado)').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=This is a test description to trigger Postmark email sending failure.').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Criar Chamado').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
+        await steps.settle()
     
     finally:
+        if steps:
+            steps.report()
         if context:
             await context.close()
         if browser:
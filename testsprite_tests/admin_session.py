@@ -0,0 +1,131 @@
+"""Shared admin session for the TestSprite Playwright suite.
+
+Admin tests used to repeat the whole login form (Acesso Administrativo ->
+email -> senha -> Entrar) before doing anything else. ``AdminSessionCache``
+logs in once per run, saves the browser storage state (the app's
+``admin_session`` localStorage entry plus Firebase Auth's IndexedDB, when the
+installed Playwright supports it) and restores it into every new context.
+
+The saved state is reused while its ``admin_session.expiresAt`` is comfortably
+in the future; otherwise, or when the restored page does not show the admin
+dashboard, the cache logs in again and rewrites the state file.
+
+Usage inside a TC module:
+    context = await ADMIN_SESSION.new_context(browser)
+    ...
+    await page.goto(ADMIN_SESSION.base_url)
+    await ADMIN_SESSION.ensure_logged_in(page)
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+TESTS_DIR = Path(__file__).resolve().parent
+CONFIG_PATH = TESTS_DIR / "tmp" / "config.json"
+STATE_PATH = TESTS_DIR / "tmp" / "admin_storage_state.json"
+
+# Must match ADMIN_SESSION_KEY in services/authService.ts
+ADMIN_SESSION_KEY = "admin_session"
+DASHBOARD_MARKER = "text=Admin Prio"
+# Re-login when the session expires within this margin, so it cannot lapse mid-test.
+EXPIRY_MARGIN = timedelta(minutes=10)
+
+
+def _load_config():
+    if not CONFIG_PATH.exists():
+        return {}
+    with CONFIG_PATH.open(encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def _parse_iso(value):
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class AdminSessionCache:
+    def __init__(self, state_path=STATE_PATH):
+        config = _load_config()
+        self.base_url = config.get("localEndpoint", "http://localhost:3000").rstrip("/")
+        self.email = config.get("loginUser", "admin@yoobe.co")
+        self.password = config.get("loginPassword", "123456")
+        self.state_path = Path(state_path)
+        self.logins = 0
+        self._lock = asyncio.Lock()
+
+    def session_expires_at(self):
+        """Expiry of the saved admin session, or None if there is no usable saved state."""
+        if not self.state_path.exists():
+            return None
+        try:
+            with self.state_path.open(encoding="utf-8") as fh:
+                state = json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+        for origin in state.get("origins", []):
+            if origin.get("origin", "").rstrip("/") != self.base_url:
+                continue
+            for item in origin.get("localStorage", []):
+                if item.get("name") == ADMIN_SESSION_KEY:
+                    try:
+                        return _parse_iso(json.loads(item["value"])["expiresAt"])
+                    except (KeyError, ValueError, TypeError):
+                        return None
+        return None
+
+    def is_fresh(self):
+        expires_at = self.session_expires_at()
+        return expires_at is not None and expires_at - datetime.now(timezone.utc) > EXPIRY_MARGIN
+
+    async def new_context(self, browser, **kwargs):
+        """New browser context already carrying the admin session (logs in first if needed)."""
+        async with self._lock:
+            if not self.is_fresh():
+                await self._login_in_new_context(browser)
+        return await browser.new_context(storage_state=str(self.state_path), **kwargs)
+
+    async def ensure_logged_in(self, page, timeout=5000):
+        """Checks the restored page shows the admin dashboard; logs in again through the UI if not."""
+        try:
+            await page.locator(DASHBOARD_MARKER).first.wait_for(state="visible", timeout=timeout)
+            return
+        except Exception:  # noqa: BLE001 - playwright TimeoutError, without importing playwright here
+            pass
+
+        print("🔑 Sessão admin restaurada não é válida, refazendo login...")
+        async with self._lock:
+            await self._login(page)
+            await self._save(page.context)
+
+    async def _login_in_new_context(self, browser):
+        context = await browser.new_context()
+        try:
+            page = await context.new_page()
+            await self._login(page)
+            await self._save(context)
+        finally:
+            await context.close()
+
+    async def _login(self, page):
+        await page.goto(self.base_url, wait_until="domcontentloaded")
+        await page.get_by_role("button", name="Acesso Administrativo").click()
+        await page.locator('input[type="email"]').fill(self.email)
+        await page.locator('input[type="password"]').fill(self.password)
+        await page.locator('button[type="submit"]').click()
+        await page.locator(DASHBOARD_MARKER).first.wait_for(state="visible", timeout=15000)
+        self.logins += 1
+        print(f"🔑 Login admin realizado ({self.logins}x nesta execução)")
+
+    async def _save(self, context):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            await context.storage_state(path=str(self.state_path), indexed_db=True)
+        except TypeError:
+            # Playwright < 1.51 cannot export IndexedDB; localStorage is enough for the admin flag.
+            await context.storage_state(path=str(self.state_path))
+
+
+# One cache per process: every admin test of a run shares the same login.
+ADMIN_SESSION = AdminSessionCache()
@@ -0,0 +1,524 @@
+"""Local stand-in for cubbo-auth-proxy (Cloud Run) and the Cubbo API behind it.
+
+TC005, TC006, TC007, TC009 and TC017 reach api.cubbo.com through the proxy,
+so their result and timing depend on the network and on real store data.
+This fake serves the same routes as ``cubbo-auth-proxy/index.js``:
+
+* ``POST /``                                   -> ``{ token, access_token, expires_in }``
+* ``GET  /api/orders?store_id=&order_number=``  -> ``{ orders: [order] }`` or 404
+* ``GET  /api/orders?store_id=&shipping_email=&per_page=&page=`` (or ``customer_phone``)
+* ``GET  /api/carrier-services/pickup-locations?postal_code=`` -> ``{ rates: [...] }``
+* ``PUT/PATCH /api/orders/<id>`` updates a fixture, ``POST /api/orders`` adds one
+* ``GET  /orders/stream?store_id=&shipping_email=`` -> NDJSON, one ``{ page, orders }`` line per page
+
+Orders use the raw Cubbo shape read by ``normalizeOrderData`` in
+services/supportService.ts (``order_lines[].product``, ``shipping.address_1``,
+``delivery_tracking``, ``shipping_method.carrier_name``...).
+
+Latency and failures are configured per route (``token``, ``orders``,
+``pickup``, ``api``) so order tracking can be benchmarked deterministically:
+
+    python testsprite_tests/fake_cubbo_proxy.py --port 8090 \\
+        --latency token=80 --latency orders=250~50 --error-rate orders=0.1 --bulk-orders 250
+
+``GET /__stats`` returns request counts and served latency per route;
+``POST /__reset`` clears them.
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+ROUTES = ("token", "orders", "pickup", "api")
+MAX_PER_PAGE = 100
+# Same defaults as CUBBO_ORDERS_STREAM_MAX_PAGES / CUBBO_ORDERS_STREAM_CONCURRENCY in the proxy
+STREAM_MAX_PAGES = 20
+STREAM_CONCURRENCY = 4
+TOKEN_TTL_SECONDS = 86400
+BULK_EMAIL = "bulk@example.com"
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Methods": "GET, POST, OPTIONS, PUT, DELETE, PATCH",
+    "Access-Control-Allow-Headers": "Content-Type, Authorization, X-Requested-With",
+    "Access-Control-Allow-Credentials": "true",
+}
+
+PRODUCTS = (
+    {"id": 101, "sku": "CAM-PRETA-M", "name": "Camiseta Preta M", "price": "79.90"},
+    {"id": 102, "sku": "MOC-YOOBE", "name": "Mochila Yoobe", "price": "249.00"},
+    {"id": 103, "sku": "GAR-TERM-500", "name": "Garrafa Térmica 500ml", "price": "119.50"},
+    {"id": 104, "sku": "CAD-A5", "name": "Caderno A5", "price": "39.90"},
+    {"id": 105, "sku": "BON-AZUL", "name": "Boné Azul", "price": "59.00"},
+)
+
+ADDRESSES = (
+    {"address_1": "Rua Augusta, 1500", "address_2": "Consolação", "city": "São Paulo", "state": "SP", "zip_code": "01304-001"},
+    {"address_1": "Avenida Atlântica, 200", "address_2": "Copacabana", "city": "Rio de Janeiro", "state": "RJ", "zip_code": "22010-000"},
+    {"address_1": "Rua da Bahia, 1148", "address_2": "Centro", "city": "Belo Horizonte", "state": "MG", "zip_code": "30160-011"},
+)
+
+CARRIERS = ("Correios", "Loggi", "Jadlog")
+
+# (order_number, shipping_email, status, days ago, product indexes)
+SEED_ORDERS = (
+    ("LP-12345", "clientA@example.com", "shipped", 3, (0, 1)),
+    ("R595531189", "clientA@example.com", "delivered", 20, (2,)),
+    ("R595531189-dup", "clientA@example.com", "processing", 1, (3, 4)),
+    ("LP-67890", "clientB@example.com", "delivered", 10, (1,)),
+    ("R123456", "clientB@example.com", "pending", 0, (0,)),
+    ("R100001", "client@example.com", "shipped", 5, (2, 3)),
+    ("R100002", "client@example.com", "cancelled", 40, (4,)),
+)
+
+
+def _iso(moment):
+    return moment.astimezone(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def build_order(order_id, order_number, email, status, created_at, product_indexes, rng):
+    """One order in the raw Cubbo API shape."""
+    address = ADDRESSES[rng.randrange(len(ADDRESSES))]
+    first_name, _, domain = email.partition("@")
+    lines = []
+    total = 0.0
+    for line_id, index in enumerate(product_indexes, start=1):
+        product = PRODUCTS[index]
+        quantity = rng.randint(1, 3)
+        total += float(product["price"]) * quantity
+        lines.append({
+            "id": order_id * 10 + line_id,
+            "sku": product["sku"],
+            "quantity": quantity,
+            "price_per_item": product["price"],
+            "product": dict(product),
+        })
+
+    order = {
+        "id": str(order_id),
+        "order_number": order_number,
+        "status": status,
+        "created_at": _iso(created_at),
+        "updated_at": _iso(created_at + timedelta(hours=6)),
+        "shipping_email": email,
+        "customer_email": email,
+        "customer_phone": f"5511{order_id:09d}"[-13:],
+        "order_lines": lines,
+        "total_price": f"{total:.2f}",
+        "currency": "BRL",
+        "payment_method": "credit_card",
+        "shipping": {
+            **address,
+            "country": "BR",
+            "first_name": first_name,
+            "last_name": domain.split(".")[0].title(),
+            "phone": f"+5511{order_id:08d}"[-14:],
+            "email": email,
+        },
+        "shipping_method": {"id": 1, "shipping_name": "Padrão", "carrier_name": CARRIERS[order_id % len(CARRIERS)], "is_cod": False},
+        "delivery_tracking": [],
+    }
+    if status in ("shipped", "delivered"):
+        tracking = f"BR{order_id:09d}BR"
+        order["shipping_date"] = _iso(created_at + timedelta(days=1))
+        order["delivery_tracking"] = [{
+            "shipping_number": tracking,
+            "tracking_url": f"https://rastreamento.example.com/{tracking}",
+            "service_id": 1,
+        }]
+    if status == "delivered":
+        order["delivered_at"] = _iso(created_at + timedelta(days=4))
+    return order
+
+
+def seed_orders(bulk_orders=0, seed=42):
+    """Fixed fixtures plus ``bulk_orders`` generated orders for BULK_EMAIL (pagination benchmarks)."""
+    rng = random.Random(seed)
+    now = datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc)
+    orders = []
+    for offset, (number, email, status, days_ago, products) in enumerate(SEED_ORDERS):
+        orders.append(build_order(1000 + offset, number, email, status, now - timedelta(days=days_ago), products, rng))
+
+    statuses = ("pending", "processing", "shipped", "delivered", "cancelled", "refunded")
+    for n in range(bulk_orders):
+        products = tuple(rng.sample(range(len(PRODUCTS)), rng.randint(1, 3)))
+        created = now - timedelta(hours=n * 7)
+        orders.append(build_order(5000 + n, f"R{700000 + n}", BULK_EMAIL, statuses[n % len(statuses)], created, products, rng))
+    return orders
+
+
+def parse_route_values(specs, cast):
+    """``["orders=250", "token=80"]`` -> ``{"orders": 250, "token": 80}``; a bare value applies to every route."""
+    values = {}
+    for spec in specs:
+        route, sep, raw = spec.partition("=")
+        if not sep:
+            route, raw = "*", route
+        if route != "*" and route not in ROUTES:
+            raise argparse.ArgumentTypeError(f"rota desconhecida '{route}' (use: {', '.join(ROUTES)})")
+        values[route] = cast(raw)
+    return values
+
+
+def parse_latency(raw):
+    """``"250"`` or ``"250~50"`` (mean ~ jitter, in ms)."""
+    mean, _, jitter = raw.partition("~")
+    return float(mean), float(jitter or 0)
+
+
+class RouteStats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.total_ms = 0.0
+
+    def as_dict(self):
+        avg = self.total_ms / self.requests if self.requests else 0
+        return {"requests": self.requests, "errors": self.errors, "avg_ms": round(avg, 1)}
+
+
+class FakeCubbo:
+    """Fixtures, fault configuration and counters shared by every request handler."""
+
+    def __init__(self, orders=None, latency=None, error_rate=None, error_status=None, seed=42, token_ttl=TOKEN_TTL_SECONDS):
+        self.orders = list(orders if orders is not None else seed_orders(seed=seed))
+        self.latency = latency or {}
+        self.error_rate = error_rate or {}
+        self.error_status = error_status or {}
+        self.token_ttl = token_ttl
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {route: RouteStats() for route in ROUTES}
+            self.tokens_issued = 0
+
+    def _setting(self, table, route, default):
+        return table.get(route, table.get("*", default))
+
+    def delay_for(self, route):
+        mean, jitter = self._setting(self.latency, route, (0.0, 0.0))
+        with self._lock:
+            offset = self._rng.uniform(-jitter, jitter) if jitter else 0
+        return max(0.0, mean + offset) / 1000
+
+    def should_fail(self, route):
+        rate = self._setting(self.error_rate, route, 0.0)
+        with self._lock:
+            return rate > 0 and self._rng.random() < rate
+
+    def failure_status(self, route):
+        return self._setting(self.error_status, route, 503)
+
+    def record(self, route, elapsed_ms, failed):
+        with self._lock:
+            stats = self.stats[route]
+            stats.requests += 1
+            stats.errors += int(failed)
+            stats.total_ms += elapsed_ms
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "tokens_issued": self.tokens_issued,
+                "orders": len(self.orders),
+                "routes": {route: stats.as_dict() for route, stats in self.stats.items()},
+            }
+
+    # --- Cubbo behaviour ---
+
+    def issue_token(self):
+        with self._lock:
+            self.tokens_issued += 1
+            token = f"fake-{self.tokens_issued}-{int(time.time())}"
+        return {"token": token, "access_token": token, "token_type": "Bearer", "expires_in": self.token_ttl}
+
+    def find_orders(self, params):
+        """Returns (status, body) for GET /api/orders."""
+        if not params.get("store_id"):
+            return 400, {"error": "store_id is required"}
+
+        order_number = params.get("order_number")
+        if order_number:
+            matches = [o for o in self.orders if o["order_number"] == order_number]
+            if not matches:
+                return 404, {"error": "Order not found"}
+            return 200, {"orders": matches}
+
+        email = (params.get("shipping_email") or "").lower()
+        phone = re.sub(r"\D", "", params.get("customer_phone") or "")
+        if email:
+            matches = [o for o in self.orders if o["shipping_email"].lower() == email]
+        elif phone:
+            matches = [o for o in self.orders if o["customer_phone"] == phone]
+        else:
+            matches = list(self.orders)
+
+        sort_by = params.get("sort_by") or "created_at"
+        matches.sort(key=lambda o: o.get(sort_by) or "", reverse=params.get("sort", "desc") != "asc")
+
+        per_page = min(max(_int(params.get("per_page"), MAX_PER_PAGE), 1), MAX_PER_PAGE)
+        page = max(_int(params.get("page"), 1), 1)
+        start = (page - 1) * per_page
+        total_pages = (len(matches) + per_page - 1) // per_page
+        return 200, {
+            "orders": matches[start:start + per_page],
+            "meta": {"page": page, "per_page": per_page, "total": len(matches), "total_pages": total_pages},
+        }
+
+    def update_order(self, order_id, changes):
+        with self._lock:
+            for order in self.orders:
+                if order["id"] == order_id:
+                    order.update(changes or {})
+                    order["updated_at"] = _iso(datetime.now(timezone.utc))
+                    return 200, order
+        return 404, {"error": "Order not found"}
+
+    def create_order(self, payload):
+        payload = payload or {}
+        with self._lock:
+            order_id = str(max((_int(o["id"], 0) for o in self.orders), default=0) + 1)
+            order = {"id": order_id, "status": "pending", "created_at": _iso(datetime.now(timezone.utc)), **payload}
+            order.setdefault("order_number", f"R{order_id}")
+            self.orders.append(order)
+        return 201, order
+
+    @staticmethod
+    def pickup_locations(params):
+        postal_code = params.get("postal_code") or ""
+        return 200, {"rates": [
+            {"service_name": "Locker Paulista", "service_code": "LCK-01", "source": "Av. Paulista, 1000 - São Paulo/SP", "description": f"Retirada próxima a {postal_code}", "distance": "1.2"},
+            {"service_name": "Agência Correios Centro", "service_code": "COR-22", "source": "Rua XV de Novembro, 50 - São Paulo/SP", "description": "Retirada em agência", "distance": "3.8"},
+        ]}
+
+
+def _int(value, default):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class FakeCubboHandler(BaseHTTPRequestHandler):
+    server_version = "FakeCubboProxy/1.0"
+    fake = None  # set by make_server()
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    def _cors(self):
+        self.send_header("Access-Control-Allow-Origin", self.headers.get("Origin") or "*")
+        for name, value in CORS_HEADERS.items():
+            self.send_header(name, value)
+
+    def _send_json(self, status, body):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self._cors()
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read_json(self):
+        length = _int(self.headers.get("Content-Length"), 0)
+        if not length:
+            return None
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return None
+
+    def _route_for(self, path):
+        if path == "/":
+            return "token"
+        if path.startswith("/api/orders"):
+            return "orders"
+        if path.startswith("/api/carrier-services/pickup-locations"):
+            return "pickup"
+        if path.startswith("/api/"):
+            return "api"
+        return None
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self._cors()
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method):
+        url = urlsplit(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        if url.path == "/__stats" and method == "GET":
+            return self._send_json(200, self.fake.snapshot())
+        if url.path == "/__reset" and method == "POST":
+            self.fake.reset_stats()
+            return self._send_json(200, {"ok": True})
+
+        if url.path == "/orders/stream" and method == "GET":
+            return self._stream_orders(params)
+
+        route = self._route_for(url.path)
+        if route is None or (route == "token" and method != "POST"):
+            return self._send_json(404, {"error": f"Cannot {method} {url.path}"})
+
+        started = time.perf_counter()
+        time.sleep(self.fake.delay_for(route))
+        failed = self.fake.should_fail(route)
+        if failed:
+            status, body = self.fake.failure_status(route), {"error": "Falha simulada pelo fake da Cubbo.", "route": route}
+        else:
+            status, body = self._handle(route, method, url.path, params)
+        self.fake.record(route, (time.perf_counter() - started) * 1000, failed)
+        self._send_json(status, body)
+
+    def _fetch_page(self, params, page):
+        """One upstream page as the proxy sees it: orders latency and failures apply."""
+        started = time.perf_counter()
+        time.sleep(self.fake.delay_for("orders"))
+        failed = self.fake.should_fail("orders")
+        if failed:
+            status, body = self.fake.failure_status("orders"), {"error": "Falha simulada pelo fake da Cubbo.", "route": "orders"}
+        else:
+            status, body = self.fake.find_orders({**params, "page": str(page)})
+        self.fake.record("orders", (time.perf_counter() - started) * 1000, failed)
+        return status, body
+
+    def _stream_orders(self, params):
+        """Mirrors GET /orders/stream of the proxy; pages after the first are fetched STREAM_CONCURRENCY at a time."""
+        per_page = min(max(_int(params.get("per_page"), MAX_PER_PAGE), 1), MAX_PER_PAGE)
+        max_pages = min(max(_int(params.get("max_pages"), STREAM_MAX_PAGES), 1), STREAM_MAX_PAGES)
+        concurrency = min(max(_int(params.get("concurrency"), STREAM_CONCURRENCY), 1), STREAM_CONCURRENCY)
+        params = {**params, "per_page": str(per_page)}
+
+        status, first = self._fetch_page(params, 1)
+        if status >= 400:
+            return self._send_json(status, {"error": "Erro ao processar requisição na API Cubbo.", "details": first})
+
+        self.send_response(200)
+        self._cors()
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        def write_line(payload):
+            self.wfile.write((json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+        total_pages = first["meta"]["total_pages"]
+        last_page = min(total_pages, max_pages)
+        write_line({"page": 1, "orders": first["orders"], "totalPages": total_pages})
+        total = len(first["orders"])
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for batch_start in range(2, last_page + 1, concurrency):
+                pages = range(batch_start, min(batch_start + concurrency, last_page + 1))
+                for page, (status, body) in zip(pages, pool.map(lambda n: self._fetch_page(params, n), pages)):
+                    if status >= 400:
+                        return write_line({"error": "Erro ao buscar página de pedidos na API Cubbo.", "details": body})
+                    total += len(body["orders"])
+                    write_line({"page": page, "orders": body["orders"]})
+        write_line({"done": True, "total": total, "pages": last_page, "truncated": total_pages > max_pages})
+
+    def _handle(self, route, method, path, params):
+        if route == "token":
+            return 200, self.fake.issue_token()
+        if route == "pickup" and method == "GET":
+            return self.fake.pickup_locations(params)
+        if route == "orders":
+            order_id = path[len("/api/orders"):].strip("/")
+            if method == "GET" and not order_id:
+                return self.fake.find_orders(params)
+            if method == "GET":
+                matches = [o for o in self.fake.orders if o["id"] == order_id]
+                return (200, matches[0]) if matches else (404, {"error": "Order not found"})
+            if method in ("PUT", "PATCH") and order_id:
+                return self.fake.update_order(order_id, self._read_json())
+            if method == "POST" and not order_id:
+                return self.fake.create_order(self._read_json())
+        return 404, {"error": f"{method} {path} não existe no fake da Cubbo."}
+
+
+def make_server(fake, host="127.0.0.1", port=8090, verbose=False):
+    handler = type("BoundFakeCubboHandler", (FakeCubboHandler,), {"fake": fake})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.verbose = verbose
+    return server
+
+
+def serve_in_background(fake=None, host="127.0.0.1", port=0, verbose=False):
+    """Starts the fake on a daemon thread; returns (server, base_url). Port 0 picks a free port."""
+    server = make_server(fake or FakeCubbo(), host, port, verbose)
+    threading.Thread(target=server.serve_forever, name="fake-cubbo-proxy", daemon=True).start()
+    bound_host, bound_port = server.server_address[:2]
+    return server, f"http://{bound_host}:{bound_port}"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fake local do cubbo-auth-proxy com latência e falhas configuráveis.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency", action="append", default=[], metavar="ROTA=MS[~JITTER]",
+                        help=f"latência por rota ({', '.join(ROUTES)}); sem ROTA= vale para todas (repetível)")
+    parser.add_argument("--error-rate", action="append", default=[], metavar="ROTA=FRAÇÃO",
+                        help="fração de requisições que falham, ex.: orders=0.1 (repetível)")
+    parser.add_argument("--error-status", action="append", default=[], metavar="ROTA=STATUS",
+                        help="status HTTP das falhas simuladas (padrão: 503)")
+    parser.add_argument("--bulk-orders", type=int, default=0,
+                        help=f"pedidos extras gerados para {BULK_EMAIL}, para testar paginação")
+    parser.add_argument("--token-ttl", type=int, default=TOKEN_TTL_SECONDS, help="expires_in do token em segundos")
+    parser.add_argument("--seed", type=int, default=42, help="semente para fixtures, latência e falhas")
+    parser.add_argument("--verbose", action="store_true", help="registrar cada requisição")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    fake = FakeCubbo(
+        orders=seed_orders(args.bulk_orders, args.seed),
+        latency=parse_route_values(args.latency, parse_latency),
+        error_rate=parse_route_values(args.error_rate, float),
+        error_status=parse_route_values(args.error_status, int),
+        seed=args.seed,
+        token_ttl=args.token_ttl,
+    )
+    server = make_server(fake, args.host, args.port, args.verbose)
+    print(f"🧪 Fake da Cubbo em http://{args.host}:{args.port} com {len(fake.orders)} pedido(s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(fake.snapshot(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
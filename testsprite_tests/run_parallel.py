@@ -0,0 +1,287 @@
+"""Parallel runner for the TestSprite Playwright suite.
+
+Each TC0xx_*.py module launches its own Chromium and calls
+``asyncio.run(run_test())`` at import time, so running the files one by one
+costs the sum of every test. This runner loads the modules without their
+entrypoint call, points their ``async_playwright()`` at one shared Chromium
+process and runs the ``run_test`` coroutines concurrently, each in its own
+browser context, limited by ``--workers``.
+
+Results are written in the same shape as ``tmp/test_results.json``.
+
+With ``--fake-cubbo`` every call to cubbo-auth-proxy is answered by the local
+fake in ``fake_cubbo_proxy.py`` instead of Cloud Run and api.cubbo.com.
+
+Usage:
+    python testsprite_tests/run_parallel.py
+    python testsprite_tests/run_parallel.py --workers 6 --filter TC004 --filter TC014
+    python testsprite_tests/run_parallel.py --fake-cubbo --cubbo-latency orders=250 --filter TC007
+"""
+
+import argparse
+import ast
+import asyncio
+import json
+import sys
+import time
+import traceback
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from types import ModuleType
+
+from urllib.parse import urlsplit
+
+from playwright import async_api
+
+from fake_cubbo_proxy import FakeCubbo, parse_latency, parse_route_values, serve_in_background
+from waits import SUITE_HISTOGRAM
+
+TESTS_DIR = Path(__file__).resolve().parent
+RESULTS_TEMPLATE = TESTS_DIR / "tmp" / "test_results.json"
+DEFAULT_OUTPUT = TESTS_DIR / "tmp" / "parallel_test_results.json"
+
+# Same flags as the generated tests, minus "--single-process": a single-process
+# Chromium cannot host several concurrent contexts reliably.
+BROWSER_ARGS = [
+    "--window-size=1280,720",
+    "--disable-dev-shm-usage",
+    "--ipc=host",
+]
+
+# Cloud Run host of cubbo-auth-proxy, as returned by getProxyUrl() in services/supportService.ts
+CUBBO_PROXY_GLOB = "https://cubbo-auth-proxy-*.run.app/**"
+
+
+def cubbo_redirect(fake_url):
+    """Route handler answering cubbo-auth-proxy calls from the local fake (same path and query)."""
+
+    async def handler(route):
+        original = urlsplit(route.request.url)
+        target = fake_url + original.path + (f"?{original.query}" if original.query else "")
+        response = await route.fetch(url=target)
+        await route.fulfill(response=response)
+
+    return handler
+
+
+class BrowserLease:
+    """Browser handed to one test: contexts are real, closing only closes those contexts."""
+
+    def __init__(self, browser, cubbo_url=None):
+        self._browser = browser
+        self._cubbo_url = cubbo_url
+        self._contexts = []
+
+    async def new_context(self, **kwargs):
+        context = await self._browser.new_context(**kwargs)
+        if self._cubbo_url:
+            await context.route(CUBBO_PROXY_GLOB, cubbo_redirect(self._cubbo_url))
+        self._contexts.append(context)
+        return context
+
+    async def close(self):
+        for context in self._contexts:
+            try:
+                await context.close()
+            except async_api.Error:
+                pass
+        self._contexts.clear()
+
+    def __getattr__(self, name):
+        return getattr(self._browser, name)
+
+
+class SharedPlaywright:
+    """Replaces ``async_playwright()`` inside a TC module so ``chromium.launch()`` returns a lease."""
+
+    def __init__(self, lease):
+        self._lease = lease
+        self.chromium = self
+
+    def __call__(self):
+        return self
+
+    async def start(self):
+        return self
+
+    async def stop(self):
+        pass
+
+    async def launch(self, **_kwargs):
+        return self._lease
+
+
+class AsyncApiProxy:
+    """Module-level ``async_api`` seen by a TC module; everything but ``async_playwright`` is the real one."""
+
+    def __init__(self, shared_playwright):
+        self.async_playwright = shared_playwright
+
+    def __getattr__(self, name):
+        return getattr(async_api, name)
+
+
+def _is_entrypoint_call(node):
+    """True for a top-level ``asyncio.run(...)`` statement."""
+    if not isinstance(node, ast.Expr) or not isinstance(node.value, ast.Call):
+        return False
+    func = node.value.func
+    return (
+        isinstance(func, ast.Attribute)
+        and func.attr == "run"
+        and isinstance(func.value, ast.Name)
+        and func.value.id == "asyncio"
+    )
+
+
+def load_test_module(path):
+    """Executes a TC module without its module-level ``asyncio.run(run_test())``."""
+    source = path.read_text(encoding="utf-8")
+    tree = ast.parse(source, filename=str(path))
+    tree.body = [node for node in tree.body if not _is_entrypoint_call(node)]
+
+    module = ModuleType(path.stem)
+    module.__file__ = str(path)
+    exec(compile(tree, str(path), "exec"), module.__dict__)
+
+    if not asyncio.iscoroutinefunction(getattr(module, "run_test", None)):
+        raise RuntimeError(f"{path.name} não define uma coroutine run_test()")
+    return module, source
+
+
+def discover_tests(filters):
+    paths = sorted(TESTS_DIR.glob("TC[0-9][0-9][0-9]_*.py"))
+    if filters:
+        paths = [p for p in paths if any(p.name.startswith(f) for f in filters)]
+    return paths
+
+
+def load_template():
+    """Indexes the existing TestSprite results by TC id, to keep titles and ids stable."""
+    if not RESULTS_TEMPLATE.exists():
+        return {}
+    with RESULTS_TEMPLATE.open(encoding="utf-8") as fh:
+        entries = json.load(fh)
+    return {entry["title"].split("-", 1)[0]: entry for entry in entries}
+
+
+def _now_iso():
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def build_result(path, source, template, status, error, created, modified):
+    tc_id, _, slug = path.stem.partition("_")
+    base = template.get(tc_id, {})
+    return {
+        "projectId": base.get("projectId", ""),
+        "testId": base.get("testId", str(uuid.uuid4())),
+        "userId": base.get("userId", ""),
+        "title": base.get("title", f"{tc_id}-{slug.replace('_', ' ')}"),
+        "description": base.get("description", ""),
+        "code": source,
+        "testStatus": status,
+        "testError": error,
+        "testType": base.get("testType", "FRONTEND"),
+        "createFrom": "parallel-runner",
+        "testVisualization": None,
+        "created": created,
+        "modified": modified,
+    }
+
+
+async def run_one(path, browser, slots, timeout, template, cubbo_url=None):
+    async with slots:
+        created = _now_iso()
+        started = time.perf_counter()
+        lease = BrowserLease(browser, cubbo_url)
+        source = ""
+        status, error = "PASSED", ""
+        try:
+            module, source = load_test_module(path)
+            module.async_api = AsyncApiProxy(SharedPlaywright(lease))
+            await asyncio.wait_for(module.run_test(), timeout=timeout)
+        except asyncio.TimeoutError:
+            status, error = "FAILED", f"Timeout após {timeout:.0f}s"
+        except Exception as exc:  # noqa: BLE001 - any failure is a test failure
+            status = "FAILED"
+            error = f"{exc}\n{traceback.format_exc(limit=5)}"
+        finally:
+            await lease.close()
+
+        elapsed = time.perf_counter() - started
+        icon = "✅" if status == "PASSED" else "❌"
+        print(f"{icon} {path.stem} ({elapsed:.1f}s)")
+        return build_result(path, source, template, status, error, created, _now_iso())
+
+
+async def run_suite(paths, workers, timeout, headless, cubbo_url=None):
+    template = load_template()
+    slots = asyncio.Semaphore(workers)
+
+    async with async_api.async_playwright() as pw:
+        browser = await pw.chromium.launch(headless=headless, args=BROWSER_ARGS)
+        try:
+            return await asyncio.gather(
+                *(run_one(path, browser, slots, timeout, template, cubbo_url) for path in paths)
+            )
+        finally:
+            await browser.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Executa a suíte testsprite_tests em paralelo.")
+    parser.add_argument("--workers", type=int, default=4, help="contextos de navegador simultâneos (padrão: 4)")
+    parser.add_argument("--timeout", type=float, default=300, help="tempo máximo por teste em segundos (padrão: 300)")
+    parser.add_argument("--filter", action="append", default=[], help="prefixo do teste, ex.: TC004 (repetível)")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="arquivo JSON de resultados")
+    parser.add_argument("--headed", action="store_true", help="mostrar o navegador")
+    parser.add_argument("--fake-cubbo", action="store_true", help="responder o cubbo-auth-proxy com o fake local")
+    parser.add_argument("--cubbo-latency", action="append", default=[], metavar="ROTA=MS[~JITTER]",
+                        help="latência do fake da Cubbo por rota (repetível, implica --fake-cubbo)")
+    parser.add_argument("--cubbo-error-rate", action="append", default=[], metavar="ROTA=FRAÇÃO",
+                        help="fração de falhas do fake da Cubbo por rota (repetível, implica --fake-cubbo)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    paths = discover_tests(args.filter)
+    if not paths:
+        print("Nenhum teste encontrado.")
+        return 1
+
+    fake, cubbo_url = None, None
+    if args.fake_cubbo or args.cubbo_latency or args.cubbo_error_rate:
+        fake = FakeCubbo(
+            latency=parse_route_values(args.cubbo_latency, parse_latency),
+            error_rate=parse_route_values(args.cubbo_error_rate, float),
+        )
+        server, cubbo_url = serve_in_background(fake)
+        print(f"🧪 cubbo-auth-proxy substituído pelo fake em {cubbo_url}")
+
+    print(f"🚀 Executando {len(paths)} teste(s) com {args.workers} worker(s)...")
+    started = time.perf_counter()
+    try:
+        results = asyncio.run(run_suite(paths, max(1, args.workers), args.timeout, not args.headed, cubbo_url))
+    finally:
+        if fake:
+            server.shutdown()
+    elapsed = time.perf_counter() - started
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with args.output.open("w", encoding="utf-8") as fh:
+        json.dump(results, fh, ensure_ascii=False, indent=2)
+
+    SUITE_HISTOGRAM.report("Latência por passo (suíte)", slowest=10)
+    if fake:
+        print(f"\n🧪 Fake da Cubbo: {json.dumps(fake.snapshot()['routes'], ensure_ascii=False)}")
+
+    failed = sum(1 for r in results if r["testStatus"] != "PASSED")
+    print(f"\n{len(results) - failed} passaram, {failed} falharam em {elapsed:.1f}s")
+    print(f"📄 Resultados salvos em {args.output}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
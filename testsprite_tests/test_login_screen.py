@@ -1,11 +1,13 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from waits import StepWaiter
 
 async def run_test():
     pw = None
     browser = None
     context = None
+    steps = None
     
     try:
         # Start a Playwright session
@@ -26,6 +28,7 @@ async def run_test():
         
         # Open page
         page = await context.new_page()
+        steps = StepWaiter(context, name="login_screen")
         
         # Navigate to app
         print("🌐 Navegando para http://localhost:3000...")
@@ -54,8 +57,7 @@ async def run_test():
         
         # Click login button
         print("🖱️ Clicando no botão de login...")
-        await login_button.click()
-        await page.wait_for_timeout(2000)
+        await steps.click(login_button, "Click 'Acessar Portal do Cliente'")
         
         # Check if login form appeared
         try:
@@ -84,7 +86,7 @@ async def run_test():
             await page.screenshot(path="login_test_form_error.png")
             raise
         
-        await asyncio.sleep(2)
+        await steps.settle()
     
     except Exception as e:
         print(f"\n❌❌❌ ERRO NO TESTE: {e}")
@@ -93,6 +95,8 @@ async def run_test():
         raise
     
     finally:
+        if steps:
+            steps.report()
         if context:
             await context.close()
         if browser:
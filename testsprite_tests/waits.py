@@ -0,0 +1,168 @@
+"""Event-driven waits for the TestSprite Playwright suite.
+
+The generated tests used to sleep a fixed ``page.wait_for_timeout(3000)``
+before every click or fill. ``StepWaiter`` replaces those sleeps with real
+conditions:
+
+* the action itself waits for locator actionability (attached, visible,
+  stable, enabled) through Playwright's auto-waiting;
+* after the action it waits until the calls to the Cubbo, Postmark and
+  Gemini proxies have finished and every Firestore write sent over the
+  ``Write/channel`` has been acknowledged by the backend.
+
+Each step's latency is recorded and ``report()`` prints a histogram, so the
+slow UI steps stand out.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+# Upstream calls a step must wait for before the UI can be considered settled.
+TRACKED_URL_PATTERNS = (
+    "cubbo-auth-proxy",
+    "postmark-email-proxy",
+    "firebase-auth-reset-proxy",
+    "generativelanguage.googleapis.com",
+)
+
+# Firestore writes go through a WebChannel POST; the long-lived Listen channel is ignored.
+FIRESTORE_WRITE_CHANNEL = "google.firestore.v1.Firestore/Write/channel"
+
+# Upper bounds (ms) of the histogram buckets; the last bucket is open-ended.
+BUCKETS_MS = (100, 250, 500, 1000, 2500, 5000)
+
+DEFAULT_ACTION_TIMEOUT = 8000
+DEFAULT_SETTLE_TIMEOUT = 15000
+QUIET_WINDOW_MS = 100
+
+
+class LatencyHistogram:
+    """Per-step latencies plus a bucketed histogram."""
+
+    def __init__(self):
+        self.samples = []
+
+    def record(self, label, elapsed_ms):
+        self.samples.append((label, elapsed_ms))
+
+    def buckets(self):
+        counts = [0] * (len(BUCKETS_MS) + 1)
+        for _, elapsed in self.samples:
+            index = next((i for i, bound in enumerate(BUCKETS_MS) if elapsed < bound), len(BUCKETS_MS))
+            counts[index] += 1
+        return counts
+
+    def report(self, title, slowest=5):
+        if not self.samples:
+            return
+        total = sum(elapsed for _, elapsed in self.samples)
+        print(f"\n⏱️  {title}: {len(self.samples)} passo(s), {total / 1000:.1f}s no total")
+
+        counts = self.buckets()
+        widest = max(counts) or 1
+        lower = 0
+        for bound, count in zip(list(BUCKETS_MS) + [None], counts):
+            label = f"{lower:>5}–{bound:<5}ms" if bound else f"{lower:>5}+      ms"
+            print(f"   {label} | {'█' * round(20 * count / widest):<20} {count}")
+            lower = bound
+
+        print("   Passos mais lentos:")
+        for label, elapsed in sorted(self.samples, key=lambda s: s[1], reverse=True)[:slowest]:
+            print(f"   {elapsed:>8.0f}ms  {label[:90]}")
+
+
+# Aggregated over every StepWaiter of the process (used by run_parallel.py).
+SUITE_HISTOGRAM = LatencyHistogram()
+
+
+class NetworkTracker:
+    """Counts in-flight proxy calls and Firestore writes for a browser context."""
+
+    def __init__(self, context, patterns=TRACKED_URL_PATTERNS):
+        self._patterns = patterns
+        self._inflight = set()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        context.on("request", self._on_request)
+        context.on("requestfinished", self._on_done)
+        context.on("requestfailed", self._on_done)
+
+    def _is_tracked(self, request):
+        url = request.url
+        if FIRESTORE_WRITE_CHANNEL in url:
+            return request.method == "POST"
+        return any(pattern in url for pattern in self._patterns)
+
+    def _on_request(self, request):
+        if self._is_tracked(request):
+            self._inflight.add(request)
+            self._idle.clear()
+
+    def _on_done(self, request):
+        self._inflight.discard(request)
+        if not self._inflight:
+            self._idle.set()
+
+    @property
+    def pending(self):
+        return [request.url for request in self._inflight]
+
+    async def wait_idle(self, timeout_ms=DEFAULT_SETTLE_TIMEOUT, quiet_ms=QUIET_WINDOW_MS):
+        """Waits until no tracked request is in flight for ``quiet_ms``. Returns False on timeout."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_ms / 1000
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(self._idle.wait(), remaining)
+            except asyncio.TimeoutError:
+                return False
+            # A click often triggers a chain (token -> orders); give the next call a chance to start.
+            await asyncio.sleep(quiet_ms / 1000)
+            if self._idle.is_set():
+                return True
+
+
+class StepWaiter:
+    """Runs test steps with condition-based waits and records their latency."""
+
+    def __init__(self, context, name="", patterns=TRACKED_URL_PATTERNS):
+        self.name = name
+        self.network = NetworkTracker(context, patterns)
+        self.histogram = LatencyHistogram()
+
+    @asynccontextmanager
+    async def step(self, label):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.histogram.record(label, elapsed_ms)
+            SUITE_HISTOGRAM.record(f"{self.name} · {label}" if self.name else label, elapsed_ms)
+
+    async def settle(self, timeout_ms=DEFAULT_SETTLE_TIMEOUT):
+        """Waits for proxy calls and Firestore writes triggered by the last action."""
+        if not await self.network.wait_idle(timeout_ms):
+            print(f"⚠️  Rede ainda ocupada após {timeout_ms}ms: {self.network.pending[:3]}")
+
+    async def click(self, locator, label="click", timeout=DEFAULT_ACTION_TIMEOUT):
+        async with self.step(label):
+            await locator.click(timeout=timeout)
+            await self.settle()
+
+    async def fill(self, locator, value, label="fill", timeout=DEFAULT_ACTION_TIMEOUT):
+        async with self.step(label):
+            await locator.fill(value, timeout=timeout)
+            await self.settle()
+
+    async def goto(self, page, url, label=None, timeout=10000):
+        async with self.step(label or f"goto {url}"):
+            await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+            await self.settle()
+
+    def report(self):
+        self.histogram.report(self.name or "Passos")
@@ -25,10 +25,46 @@ export type TicketStatus = 'aberto' | 'em_andamento' | 'resolvido' | 'fechado' |
 export type TicketPriority = 'baixa' | 'media' | 'alta';
 
 export interface TicketHistoryItem {
+  id?: string; // id do documento em tickets/{id}/history (ausente no histórico legado)
   timestamp: number;
   content: string;
   author: 'user' | 'admin' | 'system';
   type: 'comment' | 'status_change' | 'creation';
+  transition?: TicketStatusTransition; // só em status_change (entradas antigas têm apenas o texto)
+}
+
+// Mudança de status registrada de forma estruturada no histórico
+export interface TicketStatusTransition {
+  from: TicketStatus;
+  to: TicketStatus;
+  at: number;
+  by: string; // email de quem fez a mudança, ou o papel ('admin', 'user', 'system')
+}
+
+// Resumo do histórico mantido no próprio ticket (as entradas ficam na subcoleção history)
+export interface TicketHistorySummary {
+  lastStatus: TicketStatus;
+  previousStatus: TicketStatus | null; // status antes da última mudança (usado ao reativar arquivados)
+  replyCount: number;
+  entryCount: number;
+  lastEntryAt: number;
+  statusSince?: number; // início do status atual (ausente em tickets anteriores a este campo)
+  statusDurations?: Partial<Record<TicketStatus, number>>; // ms acumulados em cada status já encerrado
+  statusPeriods?: Partial<Record<TicketStatus, number>>; // quantos períodos encerrados somam statusDurations
+  resolvedAt?: number; // primeira vez que o ticket foi resolvido/fechado (base do tempo de resolução)
+}
+
+// Agregados de todos os tickets, mantidos incrementalmente em stats/tickets
+export interface TicketStats {
+  total: number;
+  byStatus: Partial<Record<TicketStatus, number>>;
+  bySubject: Record<string, number>;
+  // Tempo passado em cada status: soma e quantidade de períodos encerrados
+  timeInStatus: Partial<Record<TicketStatus, { totalMs: number; count: number }>>;
+  // Tempo entre a criação e a primeira resolução, com histograma por faixa
+  resolution: { count: number; totalMs: number; histogram: Record<string, number> };
+  updatedAt?: number;
+  backfilledAt?: number;
 }
 
 export interface Ticket {
@@ -45,7 +81,8 @@ export interface Ticket {
   conversationId?: string; // ID da conversa que gerou o ticket
   createdAt: number;
   updatedAt: number;
-  history: TicketHistoryItem[];
+  history?: TicketHistoryItem[]; // legado: tickets novos guardam o histórico em tickets/{id}/history
+  historySummary?: TicketHistorySummary;
 }
 
 export interface KnowledgeBase {
@@ -122,6 +159,12 @@ export interface CubboOrder {
     receipt_image?: string; // Imagem/base64 do comprovante de recebimento (se disponível na API)
 }
 
+// Uma página de pedidos de supportService.streamOrdersByCustomer
+export interface CustomerOrdersPage {
+    page: number;
+    orders: CubboOrder[];
+}
+
 export interface AuthCode {
     id?: string;
     email: string;
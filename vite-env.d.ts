@@ -4,6 +4,7 @@ interface ImportMetaEnv {
   readonly VITE_GEMINI_API_KEY?: string;
   readonly GEMINI_API_KEY?: string;
   readonly VITE_POSTMARK_PROXY_URL?: string;
+  readonly VITE_CUBBO_PROXY_URL?: string;
 }
 
 interface ImportMeta {
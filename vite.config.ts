@@ -18,6 +18,7 @@ export default defineConfig(({ mode }) => {
         'import.meta.env.VITE_GEMINI_API_KEY': JSON.stringify(env.VITE_GEMINI_API_KEY || env.GEMINI_API_KEY || ''),
         'import.meta.env.VITE_POSTMARK_PROXY_URL': JSON.stringify(env.VITE_POSTMARK_PROXY_URL || ''),
         'import.meta.env.VITE_AUTH_RESET_PROXY_URL': JSON.stringify(env.VITE_AUTH_RESET_PROXY_URL || ''),
+        'import.meta.env.VITE_CUBBO_PROXY_URL': JSON.stringify(env.VITE_CUBBO_PROXY_URL || ''),
         'import.meta.env.DEV': JSON.stringify(mode === 'development'),
         'import.meta.env.PROD': JSON.stringify(mode === 'production'),
         'import.meta.env.MODE': JSON.stringify(mode),